@@ -1,23 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import Dict, List, Optional
+from app.database import AsyncReadSessionLocal, SessionLocal, get_async_read_db, get_db, get_read_db
 from app.models.athlete import Athlete, PerformanceRecord
 from app.schemas.athlete import AthleteCreate, AthleteResponse, ClassificationResult
-from app.services.classifier import AthleteClassifier
+from app.services.classifier import AthleteClassifier, get_classifier
+from app.services.athlete_import import IMPORT_BATCH_SIZE, import_athletes
+from app.services.athlete_listing import aiter_athletes, athlete_page, parse_fields
+from app.services.athlete_store import ATHLETE_STORE
+from app.services.classification_cache import CLASSIFICATION_CACHE
+from app.services.performance_history import (
+    EVOLUTION_CACHE,
+    MONITORING_HISTORY_POINTS,
+    downsampled_history,
+    history_page
+)
+from app.services.performance_ingest import (
+    INGEST_BATCH_SIZE,
+    PerformanceIngestor,
+    iter_lines,
+    parse_csv,
+    parse_csv_header,
+    parse_ndjson,
+    validate_row
+)
+from app.services.skill_summary import load_summary, update_summary
+from app.services.skill_queries import skill_column
 from datetime import datetime
+import json
 
 router = APIRouter(prefix="/athletes", tags=["athletes"])
-classifier = AthleteClassifier()
 
-@router.post("/", response_model=AthleteResponse)
-def create_athlete(athlete: AthleteCreate, db: Session = Depends(get_db)):
-    """Cadastra um novo atleta e realiza classificação automática"""
-    # Converte TechnicalSkills para dict
-    technical_skills_dict = athlete.technical_skills.dict()
-    
-    # Prepara dados do atleta para classificação
-    athlete_data = {
+# Acima deste número de atletas a classificação em lote é sempre transmitida em NDJSON
+BATCH_STREAM_THRESHOLD = 500
+
+def _as_json(data):
+    """Forma serializada em JSON (como fica armazenada no banco)"""
+    return json.loads(json.dumps(data))
+
+def _athlete_data_from_payload(athlete: AthleteCreate) -> Dict:
+    """Prepara dados do atleta (payload de cadastro) para classificação"""
+    return {
         "name": athlete.name,
         "age": athlete.age,
         "height": athlete.height,
@@ -25,12 +52,24 @@ def create_athlete(athlete: AthleteCreate, db: Session = Depends(get_db)):
         "body_type": athlete.body_type,
         "dominant_foot": athlete.dominant_foot,
         "primary_position": athlete.primary_position,
-        "technical_skills": technical_skills_dict,
+        "technical_skills": athlete.technical_skills.dict(),
         "deficiencies": athlete.deficiencies
     }
+
+@router.post("/", response_model=AthleteResponse)
+def create_athlete(
+    athlete: AthleteCreate,
+    db: Session = Depends(get_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
+    """Cadastra um novo atleta e realiza classificação automática"""
+    # Prepara dados do atleta para classificação
+    athlete_data = _athlete_data_from_payload(athlete)
+    technical_skills_dict = athlete_data["technical_skills"]
     
-    # Realiza classificação
-    classification = classifier.classify_athlete(athlete_data)
+    # Realiza classificação (resultado e impressão digital da mesma versão dos dados)
+    reference = classifier.reference
+    classification = classifier.classify_athlete(athlete_data, reference)
     
     # Cria registro do atleta
     db_athlete = Athlete(
@@ -45,7 +84,8 @@ def create_athlete(athlete: AthleteCreate, db: Session = Depends(get_db)):
         secondary_position=athlete.secondary_position,
         technical_skills=technical_skills_dict,
         deficiencies=athlete.deficiencies,
-        classification_data=classification
+        classification_data=classification,
+        classification_fingerprint=classifier.classification_key(athlete_data, reference)
     )
     
     db.add(db_athlete)
@@ -59,26 +99,143 @@ def create_athlete(athlete: AthleteCreate, db: Session = Depends(get_db)):
         physical_metrics={}
     )
     db.add(initial_record)
+    update_summary(db, initial_record)
     db.commit()
     
+    ATHLETE_STORE.upsert(db_athlete)
+    
     return db_athlete
 
+@router.post("/classify/batch", response_model=List[ClassificationResult])
+def classify_batch(
+    athletes: List[AthleteCreate],
+    stream: bool = False,
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
+    """Classifica vários atletas de uma vez (sem cadastrá-los), na ordem de entrada"""
+    athletes_data = [_athlete_data_from_payload(athlete) for athlete in athletes]
+    
+    # Lotes grandes são transmitidos em NDJSON, uma classificação por linha
+    if stream or len(athletes_data) > BATCH_STREAM_THRESHOLD:
+        lines = (
+            json.dumps(classification, ensure_ascii=False) + "\n"
+            for classification in classifier.iter_classify_many(athletes_data)
+        )
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    
+    return classifier.classify_many(athletes_data)
+
+@router.post("/bulk")
+def import_athletes_bulk(
+    athletes: List[AthleteCreate],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
+    """Cadastra vários atletas em lotes; transmite em NDJSON o id de cada um, na ordem de entrada"""
+    athletes_data = [_athlete_data_from_payload(athlete) for athlete in athletes]
+    
+    def lines():
+        # O corpo é gerado depois que o endpoint retorna: a sessão pertence ao gerador
+        # (fechada ao fim da importação ou se o cliente desconectar)
+        with SessionLocal() as db:
+            for result in import_athletes(db, classifier, athletes, athletes_data, batch_size=max(1, batch_size)):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/", response_model=List[AthleteResponse])
-def get_athletes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os atletas cadastrados"""
-    athletes = db.query(Athlete).offset(skip).limit(limit).all()
+async def get_athletes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[int] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Lista os atletas cadastrados (por offset ou cursor, com projeção opcional de campos)"""
+    # Cursor (keyset): atletas com id maior que o último da página anterior, sem offset.
+    # Com projeção, só as colunas pedidas são lidas e as linhas não passam pelo AthleteResponse
+    if cursor is not None or fields:
+        try:
+            selected = parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows, next_cursor = await db.run_sync(
+            athlete_page, selected, cursor, limit, 0 if cursor is not None else skip
+        )
+        headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+        return JSONResponse(content=rows, headers=headers)
+    
+    result = await db.execute(select(Athlete).order_by(Athlete.id).offset(skip).limit(limit))
+    athletes = result.scalars().all()
+    if athletes and len(athletes) == limit:
+        response.headers["X-Next-Cursor"] = str(athletes[-1].id)
     return athletes
 
+@router.get("/export")
+async def export_athletes(fields: Optional[str] = None):
+    """Exporta todos os atletas em NDJSON, serializando cada lote à medida que é lido"""
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def lines():
+        # O corpo é gerado depois que o endpoint retorna: a sessão pertence ao gerador
+        async with AsyncReadSessionLocal() as db:
+            async for row in aiter_athletes(db, selected):
+                yield json.dumps(row, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/ranking/{skill}")
+def rank_athletes_by_skill(
+    skill: str,
+    position: Optional[str] = None,
+    min_value: Optional[float] = None,
+    limit: int = 20,
+    db: Session = Depends(get_read_db)
+):
+    """Ranqueia atletas por uma habilidade técnica (filtro e ordenação feitos no banco)"""
+    column = skill_column(Athlete, skill)
+    if column is None:
+        raise HTTPException(status_code=404, detail="Habilidade não encontrada")
+    
+    query = db.query(Athlete.id, Athlete.name, Athlete.primary_position, column).filter(
+        column.isnot(None)
+    )
+    if position:
+        query = query.filter(
+            (Athlete.primary_position == position) |
+            (Athlete.secondary_position == position)
+        )
+    if min_value is not None:
+        query = query.filter(column >= min_value)
+    
+    rows = query.order_by(column.desc(), Athlete.id).limit(limit).all()
+    
+    return {
+        "skill": skill,
+        "athletes": [
+            {"athlete_id": row[0], "name": row[1], "position": row[2], "value": row[3]}
+            for row in rows
+        ]
+    }
+
 @router.get("/{athlete_id}", response_model=AthleteResponse)
-def get_athlete(athlete_id: int, db: Session = Depends(get_db)):
+async def get_athlete(athlete_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Obtém detalhes de um atleta específico"""
-    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    athlete = await db.get(Athlete, athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     return athlete
 
 @router.get("/{athlete_id}/classification", response_model=ClassificationResult)
-def get_classification(athlete_id: int, db: Session = Depends(get_db)):
+def get_classification(
+    athlete_id: int,
+    db: Session = Depends(get_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
     """Obtém classificação atualizada do atleta"""
     athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
     if not athlete:
@@ -97,15 +254,65 @@ def get_classification(athlete_id: int, db: Session = Depends(get_db)):
         "deficiencies": athlete.deficiencies or []
     }
     
-    # Realiza classificação
-    classification = classifier.classify_athlete(athlete_data)
+    # Classificação armazenada ainda vale: responde sem escrever no banco
+    reference = classifier.reference
+    fingerprint = classifier.classification_key(athlete_data, reference)
+    if athlete.classification_data and athlete.classification_fingerprint == fingerprint:
+        return athlete.classification_data
     
-    # Atualiza dados de classificação no banco
-    athlete.classification_data = classification
+    # Entradas ou dados de referência mudaram: reclassifica (com cache)
+    classification = classifier.classify_athlete_cached(athlete_data, athlete_id, reference)
+    
+    # Grava apenas o que mudou
+    if _as_json(classification) != athlete.classification_data:
+        athlete.classification_data = classification
+    athlete.classification_fingerprint = fingerprint
     db.commit()
     
     return classification
 
+@router.post("/performance/bulk")
+async def ingest_performance(
+    request: Request,
+    format: Optional[str] = None,
+    batch_size: int = INGEST_BATCH_SIZE
+):
+    """Importa registros de desempenho em massa (NDJSON ou CSV, transmitidos linha a linha)"""
+    content_type = request.headers.get("content-type", "")
+    data_format = format or ("csv" if "csv" in content_type else "ndjson")
+    if data_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Formato inválido. Use: ndjson, csv")
+    
+    # Sem sessão injetada: cada lote abre a sua na thread que o grava
+    ingestor = PerformanceIngestor(batch_size=max(1, batch_size))
+    header = None
+    line_number = 0
+    async for line in iter_lines(request.stream()):
+        line_number += 1
+        if not line.strip():
+            continue
+        if data_format == "csv" and header is None:
+            header = parse_csv_header(line)
+            continue
+        try:
+            data = parse_csv(header, line) if data_format == "csv" else parse_ndjson(line)
+            row = validate_row(line_number, data)
+        except ValueError as e:  # JSONDecodeError também é ValueError
+            ingestor.error(line_number, str(e))
+            continue
+        if ingestor.add(row):
+            # Gravação síncrona fora do loop de eventos
+            await run_in_threadpool(ingestor.write_batch)
+    await run_in_threadpool(ingestor.write_batch)
+    
+    # Caches e matriz em memória dos atletas afetados
+    for athlete_id in ingestor.touched_athletes:
+        CLASSIFICATION_CACHE.invalidate_athlete(athlete_id)
+        EVOLUTION_CACHE.invalidate_athlete(athlete_id)
+    await run_in_threadpool(ATHLETE_STORE.upsert_many, list(ingestor.updated_athletes.values()))
+    
+    return ingestor.result()
+
 @router.post("/{athlete_id}/performance")
 def record_performance(
     athlete_id: int,
@@ -127,23 +334,47 @@ def record_performance(
     
     db.add(record)
     
-    # Atualiza habilidades do atleta
+    # Atualiza habilidades do atleta e os agregados de evolução (mesma transação)
     athlete.technical_skills = technical_skills
+    update_summary(db, record)
     db.commit()
     db.refresh(record)
     
+    # Classificações anteriores do atleta deixam de valer
+    CLASSIFICATION_CACHE.invalidate_athlete(athlete_id)
+    EVOLUTION_CACHE.invalidate_athlete(athlete_id)
+    ATHLETE_STORE.upsert(athlete)
+    
     return {"message": "Desempenho registrado com sucesso", "record_id": record.id}
 
 @router.get("/{athlete_id}/performance")
-def get_performance_history(athlete_id: int, db: Session = Depends(get_db)):
-    """Obtém histórico de desempenho do atleta"""
-    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+async def get_performance_history(
+    athlete_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    max_points: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Obtém histórico de desempenho do atleta, do mais recente para o mais antigo
+
+    Paginado por skip/limit (padrão: 100 registros por página). Com max_points,
+    retorna uma série cronológica reduzida cujas médias cobrem só as
+    habilidades do schema
+    """
+    athlete = await db.get(Athlete, athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
-    records = db.query(PerformanceRecord).filter(
-        PerformanceRecord.athlete_id == athlete_id
-    ).order_by(PerformanceRecord.record_date.desc()).all()
+    # Série cronológica reduzida, com médias calculadas no banco
+    if max_points:
+        series, _ = await db.run_sync(downsampled_history, athlete_id, max_points)
+        return [
+            {"date": point["date"], "technical_skills": point["skills"]}
+            for point in series
+        ]
+    
+    records = await db.run_sync(history_page, athlete_id, skip, limit)
     
     return [
         {
@@ -156,25 +387,21 @@ def get_performance_history(athlete_id: int, db: Session = Depends(get_db)):
     ]
 
 @router.get("/{athlete_id}/monitoring")
-def get_monitoring_dashboard(athlete_id: int, db: Session = Depends(get_db)):
+async def get_monitoring_dashboard(athlete_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Obtém dados para dashboard de monitoramento"""
-    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    athlete = await db.get(Athlete, athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
-    # Obtém histórico de desempenho
-    records = db.query(PerformanceRecord).filter(
-        PerformanceRecord.athlete_id == athlete_id
-    ).order_by(PerformanceRecord.record_date.asc()).all()
+    # Agregados mantidos a cada registro: primeiro, último e registros recentes
+    summary = await db.run_sync(load_summary, athlete_id)
+    record_count = summary.record_count
     
     # Calcula evolução
     evolution_data = []
-    if len(records) >= 2:
-        first_record = records[0]
-        last_record = records[-1]
-        
-        first_skills = first_record.technical_skills or {}
-        last_skills = last_record.technical_skills or {}
+    if record_count >= 2:
+        first_skills = summary.first_skills or {}
+        last_skills = summary.latest_skills or {}
         
         evolution = {}
         for skill in set(list(first_skills.keys()) + list(last_skills.keys())):
@@ -194,10 +421,10 @@ def get_monitoring_dashboard(athlete_id: int, db: Session = Depends(get_db)):
     current_skills = athlete.technical_skills or {}
     
     # Alerta de estagnação
-    if len(records) >= 3:
-        recent_records = records[-3:]
+    if record_count >= 3:
+        recent_records = summary.recent_records[-3:]
         for skill in current_skills.keys():
-            values = [r.technical_skills.get(skill, 5) for r in recent_records if r.technical_skills]
+            values = [r["skills"].get(skill, 5) for r in recent_records if r["skills"]]
             if len(values) == 3 and len(set(values)) == 1:
                 alerts.append({
                     "type": "stagnation",
@@ -218,6 +445,11 @@ def get_monitoring_dashboard(athlete_id: int, db: Session = Depends(get_db)):
             "message": "Desequilíbrio entre habilidades físicas e técnicas detectado"
         })
     
+    # Série limitada; o histórico completo fica em /performance (paginado)
+    performance_history, _ = await db.run_sync(
+        downsampled_history, athlete_id, MONITORING_HISTORY_POINTS, record_count
+    )
+    
     return {
         "athlete": {
             "id": athlete.id,
@@ -228,12 +460,7 @@ def get_monitoring_dashboard(athlete_id: int, db: Session = Depends(get_db)):
         "classification": athlete.classification_data,
         "evolution": evolution_data,
         "alerts": alerts,
-        "performance_history": [
-            {
-                "date": r.record_date.isoformat(),
-                "skills": r.technical_skills
-            }
-            for r in records
-        ]
+        "performance_history": performance_history,
+        "performance_history_total": record_count
     }
 
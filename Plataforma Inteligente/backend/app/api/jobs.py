@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from app.services.jobs import DONE, FAILED, JOB_QUEUE
+from app.services.reclassification import submit_reclassification
+from typing import List, Optional
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.get("/")
+def get_jobs_stats():
+    """Situação da fila de tarefas em segundo plano"""
+    return JOB_QUEUE.stats()
+
+@router.post("/reclassify", status_code=202)
+def reclassify(athlete_ids: Optional[List[int]] = None):
+    """Agenda a reclassificação dos atletas (todos ou os informados) em segundo plano"""
+    job = submit_reclassification(athlete_ids)
+    return {"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    """Obtém o estado de uma tarefa"""
+    job = JOB_QUEUE.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    return job.info()
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str):
+    """Obtém o resultado de uma tarefa concluída (202 enquanto ainda não terminou)"""
+    job = JOB_QUEUE.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"A tarefa falhou: {job.error}")
+    if job.status != DONE:
+        return JSONResponse(status_code=202, content=job.info())
+    if job.result is None:
+        raise HTTPException(status_code=404, detail="Resultado não encontrado")
+    return job.result
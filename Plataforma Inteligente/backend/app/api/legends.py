@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db, get_read_db
+from app.models.legend import Legend
+from app.schemas.legend import LegendCreate, LegendResponse, LegendUpdate
+from typing import List, Optional
+
+router = APIRouter(prefix="/legends", tags=["legends"])
+
+# Gravações na tabela disparam (após o commit) a recarga incremental das lendas
+# usadas pelo classificador; ver app/services/legend_events.py
+
+def _name_taken(db: Session, name: str, exclude_id: Optional[int] = None) -> bool:
+    query = db.query(Legend.id).filter(Legend.name == name)
+    if exclude_id is not None:
+        query = query.filter(Legend.id != exclude_id)
+    return query.first() is not None
+
+@router.get("/", response_model=List[LegendResponse])
+def get_legends(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
+    """Lista os jogadores históricos de referência"""
+    return db.query(Legend).order_by(Legend.id).offset(skip).limit(limit).all()
+
+@router.get("/{legend_id}", response_model=LegendResponse)
+def get_legend(legend_id: int, db: Session = Depends(get_read_db)):
+    """Obtém um jogador histórico"""
+    legend = db.get(Legend, legend_id)
+    if not legend:
+        raise HTTPException(status_code=404, detail="Lenda não encontrada")
+    return legend
+
+@router.post("/", response_model=LegendResponse, status_code=201)
+def create_legend(legend: LegendCreate, db: Session = Depends(get_db)):
+    """Cadastra um jogador histórico (passa a ser usado na classificação)"""
+    if _name_taken(db, legend.name):
+        raise HTTPException(status_code=409, detail="Já existe uma lenda com este nome")
+    
+    db_legend = Legend(**legend.dict())
+    db.add(db_legend)
+    db.commit()
+    db.refresh(db_legend)
+    return db_legend
+
+@router.put("/{legend_id}", response_model=LegendResponse)
+def update_legend(legend_id: int, legend: LegendUpdate, db: Session = Depends(get_db)):
+    """Atualiza os campos enviados de um jogador histórico"""
+    db_legend = db.get(Legend, legend_id)
+    if not db_legend:
+        raise HTTPException(status_code=404, detail="Lenda não encontrada")
+    
+    changes = legend.dict(exclude_unset=True)
+    if "name" in changes and _name_taken(db, changes["name"], exclude_id=legend_id):
+        raise HTTPException(status_code=409, detail="Já existe uma lenda com este nome")
+    
+    for field, value in changes.items():
+        setattr(db_legend, field, value)
+    db.commit()
+    db.refresh(db_legend)
+    return db_legend
+
+@router.delete("/{legend_id}")
+def delete_legend(legend_id: int, db: Session = Depends(get_db)):
+    """Remove um jogador histórico"""
+    db_legend = db.get(Legend, legend_id)
+    if not db_legend:
+        raise HTTPException(status_code=404, detail="Lenda não encontrada")
+    
+    db.delete(db_legend)
+    db.commit()
+    return {"message": "Lenda removida com sucesso", "legend_id": legend_id}
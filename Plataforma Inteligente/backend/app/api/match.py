@@ -1,68 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.athlete import Athlete
-from app.services.classifier import AthleteClassifier
+from app.services.athlete_store import ATHLETE_STORE
+from app.schemas.athlete import LineupRequest
+from app.services.classifier import AthleteClassifier, get_classifier
+from app.services.complementarity import complementarity_scores
+from app.services.lineup import best_lineups, formation_slots
+from app.services.skill_queries import SKILL_COLUMN_INDEX
+from app.services.skill_vectors import skills_to_vector
+from app.services.team_styles import STYLE_MATRIX, TEAM_STYLES
 from typing import List, Dict
 import numpy as np
 
 router = APIRouter(prefix="/match", tags=["match"])
-classifier = AthleteClassifier()
+
+TEAMMATES_LIMIT = 10
+
+def _athlete_data(athlete: Athlete) -> Dict:
+    """Dados do atleta no formato esperado pelo classificador"""
+    return {
+        "name": athlete.name,
+        "age": athlete.age,
+        "height": athlete.height,
+        "weight": athlete.weight,
+        "body_type": athlete.body_type,
+        "dominant_foot": athlete.dominant_foot,
+        "primary_position": athlete.primary_position,
+        "technical_skills": athlete.technical_skills or {},
+        "deficiencies": athlete.deficiencies or []
+    }
 
 @router.get("/{athlete_id}/teams")
 def match_with_teams(
     athlete_id: int,
     team_style: str = None,
     system: str = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Analisa compatibilidade do atleta com diferentes estilos de time"""
     athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
-    # Estilos de jogo e suas características
-    team_styles = {
-        "posse_bola": {
-            "required_skills": ["passe", "visao_de_jogo", "disciplina_tatica", "resistencia"],
-            "description": "Time que prioriza posse de bola e construção de jogadas"
-        },
-        "contra_ataque": {
-            "required_skills": ["velocidade", "finalizacao", "drible", "agilidade"],
-            "description": "Time que joga em transições rápidas"
-        },
-        "pressionamento_alto": {
-            "required_skills": ["resistencia", "velocidade", "marcacao", "disciplina_tatica"],
-            "description": "Time que pressiona alto e busca recuperação rápida"
-        },
-        "defensivo": {
-            "required_skills": ["marcacao", "posicionamento", "disciplina_tatica", "interceptacao"],
-            "description": "Time que prioriza organização defensiva"
-        },
-        "ofensivo": {
-            "required_skills": ["finalizacao", "drible", "velocidade", "jogo_aereo"],
-            "description": "Time que prioriza criação de chances e finalização"
+    # Compatibilidade com todos os estilos em um único produto matricial
+    values, mask = skills_to_vector(athlete.technical_skills or {}, SKILL_COLUMN_INDEX)
+    scores = STYLE_MATRIX.score_many(values[None, :], mask[None, :])[0]
+    compatibility_scores = {
+        style_name: {
+            "score": round(float(score) * 100, 2),
+            "description": TEAM_STYLES[style_name]["description"],
+            "required_skills": TEAM_STYLES[style_name]["required_skills"]
         }
+        for style_name, score in zip(STYLE_MATRIX.styles, scores)
     }
     
-    athlete_skills = athlete.technical_skills or {}
-    compatibility_scores = {}
-    
-    for style_name, style_data in team_styles.items():
-        required_skills = style_data["required_skills"]
-        scores = []
-        
-        for skill in required_skills:
-            skill_value = athlete_skills.get(skill, 5)
-            scores.append(skill_value / 10.0)
-        
-        avg_score = np.mean(scores) if scores else 0
-        compatibility_scores[style_name] = {
-            "score": round(avg_score * 100, 2),
-            "description": style_data["description"],
-            "required_skills": required_skills
-        }
-    
     # Ordena por compatibilidade
     sorted_compatibility = sorted(
         compatibility_scores.items(),
@@ -78,28 +70,72 @@ def match_with_teams(
         "recommended_style": sorted_compatibility[0][0] if sorted_compatibility else None
     }
 
+@router.get("/styles/{style}/athletes")
+def rank_athletes_by_style(
+    style: str,
+    position: str = None,
+    skip: int = 0,
+    limit: int = 20,
+    db: Session = Depends(get_read_db)
+):
+    """Ranqueia os atletas cadastrados pela compatibilidade com um estilo de jogo"""
+    if style not in STYLE_MATRIX.style_index:
+        raise HTTPException(status_code=404, detail="Estilo de jogo não encontrado")
+    
+    # Um produto matricial sobre todos os candidatos da matriz em memória
+    snapshot = ATHLETE_STORE.read(db)
+    rows = snapshot.candidates(position=position)
+    scores = STYLE_MATRIX.score_style(style, snapshot.values[rows], snapshot.mask[rows])
+    
+    # Ordena por score arredondado (empates pela ordem de id) e pagina
+    ids = snapshot.ids[rows]
+    rounded = np.round(scores * 100, 2)
+    page = np.lexsort((ids, -rounded))[skip:skip + limit]
+    
+    # Só a página é carregada do banco
+    page_ids = ids[page].tolist()
+    page_athletes = {
+        athlete.id: athlete
+        for athlete in db.query(Athlete).filter(Athlete.id.in_(page_ids)).all()
+    }
+    
+    return {
+        "style": style,
+        "description": TEAM_STYLES[style]["description"],
+        "position": position,
+        "total": len(rows),
+        "skip": skip,
+        "limit": limit,
+        "athletes": [
+            {
+                "athlete_id": athlete_id,
+                "name": page_athletes[athlete_id].name,
+                "position": page_athletes[athlete_id].primary_position,
+                "score": round(float(score) * 100, 2)
+            }
+            for athlete_id, score in zip(page_ids, scores[page])
+            if athlete_id in page_athletes
+        ]
+    }
+
 @router.get("/{athlete_id}/positions")
-def match_with_positions(athlete_id: int, db: Session = Depends(get_db)):
+def match_with_positions(
+    athlete_id: int,
+    explain: bool = False,
+    db: Session = Depends(get_read_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
     """Analisa compatibilidade do atleta com diferentes posições"""
     athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
     # Prepara dados para classificação
-    athlete_data = {
-        "name": athlete.name,
-        "age": athlete.age,
-        "height": athlete.height,
-        "weight": athlete.weight,
-        "body_type": athlete.body_type,
-        "dominant_foot": athlete.dominant_foot,
-        "primary_position": athlete.primary_position,
-        "technical_skills": athlete.technical_skills or {},
-        "deficiencies": athlete.deficiencies or []
-    }
+    athlete_data = _athlete_data(athlete)
     
-    # Calcula adequação para cada posição
-    position_scores = classifier.calculate_position_suitability(athlete_data)
+    # Calcula adequação para cada posição (fatores com a mesma versão dos templates)
+    reference = classifier.reference
+    position_scores = classifier.calculate_position_suitability(athlete_data, reference)
     
     # Ordena posições por score
     sorted_positions = sorted(
@@ -108,7 +144,7 @@ def match_with_positions(athlete_id: int, db: Session = Depends(get_db)):
         reverse=True
     )
     
-    return {
+    result = {
         "athlete_id": athlete_id,
         "athlete_name": athlete.name,
         "current_position": athlete.primary_position,
@@ -122,68 +158,135 @@ def match_with_positions(athlete_id: int, db: Session = Depends(get_db)):
             for pos, score in sorted_positions[1:4]
         ]
     }
+    
+    # Fatores de cada posição apenas quando solicitados
+    if explain:
+        result["factors"] = reference.position_matrix.explain(athlete_data)
+    
+    return result
 
 @router.get("/{athlete_id}/teammates")
 def match_with_teammates(
     athlete_id: int,
     position: str = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Analisa compatibilidade com outros atletas (para formação de equipes)"""
     athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
-    # Busca outros atletas
-    query = db.query(Athlete).filter(Athlete.id != athlete_id)
-    if position:
-        query = query.filter(
-            (Athlete.primary_position == position) |
-            (Athlete.secondary_position == position)
-        )
+    # Candidatos a partir da matriz em memória (filtro de posição vetorizado)
+    snapshot = ATHLETE_STORE.read(db)
+    rows = snapshot.candidates(position=position, exclude=athlete_id)
+    target_row = snapshot.row_of(athlete_id)
+    if target_row is not None:
+        target_values, target_mask = snapshot.values[target_row], snapshot.mask[target_row]
+    else:
+        target_values, target_mask = skills_to_vector(athlete.technical_skills or {}, SKILL_COLUMN_INDEX)
+    
+    # Complementaridade de todos os candidatos em uma única operação
+    scores, valid = complementarity_scores(
+        target_values, target_mask, snapshot.values[rows], snapshot.mask[rows]
+    )
+    rows, scores = rows[valid], scores[valid]
+    
+    # Top 10 por score arredondado (empates mantêm a ordem por id)
+    ids = snapshot.ids[rows]
+    rounded = np.round(scores * 100, 2)
+    top = np.lexsort((ids, -rounded))[:TEAMMATES_LIMIT]
     
-    other_athletes = query.all()
-    
-    athlete_skills = athlete.technical_skills or {}
-    compatibility_list = []
-    
-    for other in other_athletes:
-        other_skills = other.technical_skills or {}
-        
-        # Calcula complementaridade (atletas com habilidades diferentes se complementam)
-        common_skills = set(athlete_skills.keys()) & set(other_skills.keys())
-        if not common_skills:
-            continue
-        
-        # Score de complementaridade (diferentes mas não opostos)
-        complementarity = 0
-        for skill in common_skills:
-            diff = abs(athlete_skills[skill] - other_skills[skill])
-            # Ideal: diferença moderada (2-4 pontos)
-            if 2 <= diff <= 4:
-                complementarity += 1
-            elif diff < 2:
-                complementarity += 0.5  # Muito similares
-            else:
-                complementarity += 0.2  # Muito diferentes
-        
-        complementarity_score = complementarity / len(common_skills) if common_skills else 0
-        
-        compatibility_list.append({
-            "athlete_id": other.id,
-            "name": other.name,
-            "position": other.primary_position,
-            "complementarity_score": round(complementarity_score * 100, 2),
-            "skills": other_skills
-        })
-    
-    # Ordena por complementaridade
-    compatibility_list.sort(key=lambda x: x["complementarity_score"], reverse=True)
+    # Só os selecionados são carregados e serializados
+    top_ids = ids[top].tolist()
+    teammates = {
+        other.id: other
+        for other in db.query(Athlete).filter(Athlete.id.in_(top_ids)).all()
+    }
+    compatibility_list = [
+        {
+            "athlete_id": other_id,
+            "name": teammates[other_id].name,
+            "position": teammates[other_id].primary_position,
+            "complementarity_score": round(float(score) * 100, 2),
+            "skills": teammates[other_id].technical_skills or {}
+        }
+        for other_id, score in zip(top_ids, scores[top])
+        if other_id in teammates  # Removido do banco após a carga da matriz
+    ]
     
     return {
         "athlete_id": athlete_id,
         "athlete_name": athlete.name,
-        "compatible_teammates": compatibility_list[:10]  # Top 10
+        "compatible_teammates": compatibility_list
     }
 
-
+@router.post("/lineup")
+def match_lineup(
+    request: LineupRequest,
+    db: Session = Depends(get_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
+    """Distribui um elenco nas vagas de uma formação maximizando a adequação total"""
+    position_matrix = classifier.position_matrix
+    positions = list(position_matrix.positions)
+    try:
+        slots = formation_slots(request.formation, positions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    athlete_ids = list(dict.fromkeys(request.athlete_ids))
+    athletes = {
+        athlete.id: athlete
+        for athlete in db.query(Athlete).filter(Athlete.id.in_(athlete_ids)).all()
+    }
+    missing = [athlete_id for athlete_id in athlete_ids if athlete_id not in athletes]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Atletas não encontrados: {missing}")
+    
+    slot_positions = list(slots)
+    if len(athlete_ids) < sum(slots.values()):
+        raise HTTPException(
+            status_code=400,
+            detail=f"A formação tem {sum(slots.values())} vagas e o elenco {len(athlete_ids)} atletas"
+        )
+    
+    # Matriz atletas x posições calculada em lote
+    squad = [athletes[athlete_id] for athlete_id in athlete_ids]
+    scores = position_matrix.score_many([_athlete_data(athlete) for athlete in squad])
+    columns = [positions.index(position) for position in slot_positions]
+    suitability = scores[:, columns]
+    
+    lineups = best_lineups(
+        suitability,
+        [slots[position] for position in slot_positions],
+        count=1 + request.alternatives
+    )
+    
+    def serialize(lineup):
+        selected = sorted(lineup.assignment, key=lambda pair: (pair[1], -suitability[pair]))
+        starters = {athlete for athlete, _ in selected}
+        return {
+            "total_score": round(lineup.total * 100, 2),
+            "average_score": round(lineup.total * 100 / len(selected), 2),
+            "lineup": [
+                {
+                    "athlete_id": squad[athlete].id,
+                    "name": squad[athlete].name,
+                    "position": slot_positions[position],
+                    "score": round(float(suitability[athlete, position]) * 100, 2)
+                }
+                for athlete, position in selected
+            ],
+            "bench": [
+                squad[athlete].id
+                for athlete in range(len(squad))
+                if athlete not in starters
+            ]
+        }
+    
+    return {
+        "formation": request.formation,
+        "slots": slots,
+        "best": serialize(lineups[0]),
+        "alternatives": [serialize(lineup) for lineup in lineups[1:]]
+    }
@@ -1,38 +1,45 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.athlete import Athlete, PerformanceRecord
-from app.services.classifier import AthleteClassifier
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal, get_async_read_db
+from app.models.athlete import Athlete
+from app.services.classifier import AthleteClassifier, get_classifier
+from app.services.jobs import JOB_QUEUE
+from app.services.performance_history import PERIOD_DAYS, evolution_series
+from app.services.skill_summary import load_summary
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 
 router = APIRouter(prefix="/reports", tags=["reports"])
-classifier = AthleteClassifier()
 
 @router.get("/{athlete_id}/evolution")
-def get_evolution_report(athlete_id: int, period: str = "monthly", db: Session = Depends(get_db)):
+async def get_evolution_report(
+    athlete_id: int, period: str = "monthly", db: AsyncSession = Depends(get_async_read_db)
+):
     """Gera relatório de evolução do atleta"""
-    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    athlete = await db.get(Athlete, athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
-    # Obtém registros de desempenho
-    records = db.query(PerformanceRecord).filter(
-        PerformanceRecord.athlete_id == athlete_id
-    ).order_by(PerformanceRecord.record_date.asc()).all()
+    if period not in PERIOD_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Período inválido. Use: {', '.join(PERIOD_DAYS)}"
+        )
     
-    if len(records) < 2:
+    # Agregados mantidos a cada registro (sem percorrer o histórico)
+    summary = await db.run_sync(load_summary, athlete_id)
+    
+    if summary.record_count < 2:
         return {
             "message": "Dados insuficientes para análise de evolução",
-            "records_count": len(records)
+            "records_count": summary.record_count
         }
     
     # Calcula evolução por habilidade
-    first_record = records[0]
-    last_record = records[-1]
-    
-    first_skills = first_record.technical_skills or {}
-    last_skills = last_record.technical_skills or {}
+    first_skills = summary.first_skills or {}
+    last_skills = summary.latest_skills or {}
     
     evolution = {}
     for skill in set(list(first_skills.keys()) + list(last_skills.keys())):
@@ -61,14 +68,20 @@ def get_evolution_report(athlete_id: int, period: str = "monthly", db: Session =
         key=lambda x: x[1]["change"]
     )[:3]
     
+    # Série por período com média/mínimo/máximo e tendência (regressão linear)
+    series = await db.run_sync(
+        evolution_series, athlete_id, period,
+        (summary.record_count, summary.last_record_date.isoformat())
+    )
+    
     return {
         "athlete_id": athlete_id,
         "athlete_name": athlete.name,
         "period": period,
         "analysis_period": {
-            "start": first_record.record_date.isoformat(),
-            "end": last_record.record_date.isoformat(),
-            "days": (last_record.record_date - first_record.record_date).days
+            "start": summary.first_record_date.isoformat(),
+            "end": summary.last_record_date.isoformat(),
+            "days": (summary.last_record_date - summary.first_record_date).days
         },
         "evolution": evolution,
         "top_improvements": [
@@ -79,16 +92,54 @@ def get_evolution_report(athlete_id: int, period: str = "monthly", db: Session =
             {"skill": k, "change": v["change"], "percentage": v["percentage"]}
             for k, v in regressions
         ],
-        "overall_trend": "positive" if len(improvements) > len(regressions) else "negative"
+        "overall_trend": "positive" if len(improvements) > len(regressions) else "negative",
+        **series
     }
 
+def _job_accepted(job) -> JSONResponse:
+    """Resposta de uma tarefa enviada para a fila em segundo plano"""
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
+    )
+
+def _load_athlete_job(athlete_id: int, build) -> Optional[Dict]:
+    """Executa um relatório fora da requisição (processo do pool), com sessão própria"""
+    db = SessionLocal()
+    try:
+        athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+        return build(athlete, get_classifier()) if athlete else None
+    finally:
+        db.close()
+
+def comparative_report_job(athlete_id: int) -> Optional[Dict]:
+    return _load_athlete_job(athlete_id, _comparative_report)
+
+def development_plan_job(athlete_id: int) -> Optional[Dict]:
+    return _load_athlete_job(athlete_id, _development_plan)
+
 @router.get("/{athlete_id}/comparative")
-def get_comparative_report(athlete_id: int, db: Session = Depends(get_db)):
+async def get_comparative_report(
+    athlete_id: int,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
     """Gera relatório comparativo com jogadores históricos"""
-    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    athlete = await db.get(Athlete, athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
+    # Em segundo plano: responde na hora com o id da tarefa (resultado em /jobs/{id}/result)
+    if background:
+        return _job_accepted(JOB_QUEUE.submit(comparative_report_job, lane="interactive", athlete_id=athlete_id))
+    
+    # Busca de lendas é CPU: roda em thread para não bloquear o loop de eventos
+    return await run_in_threadpool(_comparative_report, athlete, classifier)
+
+def _comparative_report(athlete: Athlete, classifier: AthleteClassifier) -> Dict:
+    athlete_id = athlete.id
+    
     # Prepara dados do atleta
     athlete_data = {
         "name": athlete.name,
@@ -102,8 +153,9 @@ def get_comparative_report(athlete_id: int, db: Session = Depends(get_db)):
         "deficiencies": athlete.deficiencies or []
     }
     
-    # Encontra jogadores similares
-    similar_legends = classifier.find_closest_legends(athlete_data)
+    # Encontra jogadores similares (detalhes buscados na mesma versão das lendas)
+    reference = classifier.reference
+    similar_legends = classifier.find_closest_legends(athlete_data, top_k=5, reference=reference)
     
     # Comparação detalhada com top 3
     detailed_comparison = []
@@ -111,8 +163,7 @@ def get_comparative_report(athlete_id: int, db: Session = Depends(get_db)):
     
     for legend_data in similar_legends[:3]:
         # Busca dados completos da lenda
-        from app.services.legend_database import LEGEND_DATABASE
-        legend = next((l for l in LEGEND_DATABASE if l["name"] == legend_data["name"]), None)
+        legend = reference.legends_by_name.get(legend_data["name"])
         
         if legend:
             legend_skills = legend["technical_profile"]
@@ -148,12 +199,25 @@ def get_comparative_report(athlete_id: int, db: Session = Depends(get_db)):
     }
 
 @router.get("/{athlete_id}/development-plan")
-def get_development_plan(athlete_id: int, db: Session = Depends(get_db)):
+async def get_development_plan(
+    athlete_id: int,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
     """Gera plano de desenvolvimento personalizado"""
-    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    athlete = await db.get(Athlete, athlete_id)
     if not athlete:
         raise HTTPException(status_code=404, detail="Atleta não encontrado")
     
+    if background:
+        return _job_accepted(JOB_QUEUE.submit(development_plan_job, lane="interactive", athlete_id=athlete_id))
+    
+    return await run_in_threadpool(_development_plan, athlete, classifier)
+
+def _development_plan(athlete: Athlete, classifier: AthleteClassifier) -> Dict:
+    athlete_id = athlete.id
+    
     # Prepara dados do atleta
     athlete_data = {
         "name": athlete.name,
@@ -167,17 +231,11 @@ def get_development_plan(athlete_id: int, db: Session = Depends(get_db)):
         "deficiencies": athlete.deficiencies or []
     }
     
-    # Obtém classificação
-    classification = classifier.classify_athlete(athlete_data)
-    
-    # Identifica áreas de desenvolvimento
-    development_areas = classifier.identify_development_areas(athlete_data)
-    strengths = classifier.identify_strengths(athlete_data)
-    
-    # Gera recomendações
-    training_recommendations = classifier.generate_training_recommendations(
-        athlete_data, development_areas
-    )
+    # Obtém classificação (já inclui forças, áreas de desenvolvimento e recomendações)
+    classification = classifier.classify_athlete_cached(athlete_data, athlete_id)
+    development_areas = classification["development_areas"]
+    strengths = classification["strengths"]
+    training_recommendations = classification["training_recommendations"]
     
     # Projeção de potencial
     current_avg = sum(athlete_data["technical_skills"].values()) / len(athlete_data["technical_skills"]) if athlete_data["technical_skills"] else 5
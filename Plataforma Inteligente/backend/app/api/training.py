@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.athlete import Athlete, TrainingRecommendation
-from app.services.classifier import AthleteClassifier
+from app.services.classifier import AthleteClassifier, get_classifier
 from typing import List, Dict
 
 router = APIRouter(prefix="/training", tags=["training"])
-classifier = AthleteClassifier()
 
 @router.get("/{athlete_id}/recommendations")
-def get_training_recommendations(athlete_id: int, db: Session = Depends(get_db)):
+def get_training_recommendations(
+    athlete_id: int,
+    db: Session = Depends(get_read_db),
+    classifier: AthleteClassifier = Depends(get_classifier)
+):
     """Obtém recomendações de treinamento para o atleta"""
     athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
     if not athlete:
@@ -28,18 +31,13 @@ def get_training_recommendations(athlete_id: int, db: Session = Depends(get_db))
         "deficiencies": athlete.deficiencies or []
     }
     
-    # Identifica áreas de desenvolvimento
-    development_areas = classifier.identify_development_areas(athlete_data)
-    
-    # Gera recomendações
-    recommendations = classifier.generate_training_recommendations(
-        athlete_data, development_areas
-    )
+    # Áreas de desenvolvimento e recomendações vêm da classificação (com cache)
+    classification = classifier.classify_athlete_cached(athlete_data, athlete_id)
     
     return {
         "athlete_id": athlete_id,
-        "development_areas": development_areas,
-        "recommendations": recommendations
+        "development_areas": classification["development_areas"],
+        "recommendations": classification["training_recommendations"]
     }
 
 @router.post("/{athlete_id}/recommendations/{deficiency}")
@@ -69,7 +67,7 @@ def create_training_plan(
     return training_plan
 
 @router.get("/{athlete_id}/plans")
-def get_training_plans(athlete_id: int, db: Session = Depends(get_db)):
+def get_training_plans(athlete_id: int, db: Session = Depends(get_read_db)):
     """Obtém todos os planos de treinamento do atleta"""
     athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
     if not athlete:
@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from typing import Dict
 import os
 from dotenv import load_dotenv
 
@@ -8,12 +11,90 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./athlete_platform.db")
 
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+# Réplica somente leitura opcional: endpoints GET leem dela (sem ela, leem do banco principal)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+# Pragmas aplicados a cada conexão SQLite (WAL evita "database is locked" com escritas concorrentes)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),  # ms esperando o lock de escrita
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),  # Seguro com WAL, bem mais rápido que FULL
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # Negativo = KiB (64 MiB)
+}
+
+# Pool de conexões para bancos servidor (PostgreSQL, MySQL)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # s; antes do timeout de conexões ociosas
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+def engine_options(url: str) -> Dict:
+    """Argumentos de create_engine/create_async_engine conforme o tipo de banco"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING
+    }
+
+def configure_engine(engine: Engine) -> Engine:
+    """Aplica os pragmas do SQLite em cada nova conexão do engine (síncrono ou .sync_engine)"""
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            cursor.close()
+    return engine
+
+def create_configured_engine(url: str) -> Engine:
+    return configure_engine(create_engine(url, **engine_options(url)))
+
+engine = create_configured_engine(DATABASE_URL)
+read_engine = create_configured_engine(READ_DATABASE_URL) if READ_DATABASE_URL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Drivers assíncronos equivalentes aos drivers síncronos do DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql"
+}
+
+def async_database_url(url: str) -> str:
+    """URL do mesmo banco com o driver assíncrono (ASYNC_DATABASE_URL tem precedência)"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.drivername in ASYNC_DRIVERS.values():
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def create_configured_async_engine(url: str):
+    async_engine = create_async_engine(url, **engine_options(url))
+    configure_engine(async_engine.sync_engine)
+    return async_engine
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+ASYNC_READ_DATABASE_URL = os.getenv("ASYNC_READ_DATABASE_URL") or (
+    async_database_url(READ_DATABASE_URL) if READ_DATABASE_URL else None
+)
+
+# Engine assíncrono para os endpoints de leitura (não ocupa threads durante o I/O do banco)
+async_engine = create_configured_async_engine(ASYNC_DATABASE_URL)
+async_read_engine = (
+    create_configured_async_engine(ASYNC_READ_DATABASE_URL) if ASYNC_READ_DATABASE_URL else async_engine
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -24,3 +105,19 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """Sessão de leitura (réplica, se configurada); não usar para escrita"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """Sessão assíncrona de leitura (réplica, se configurada); não usar para escrita"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
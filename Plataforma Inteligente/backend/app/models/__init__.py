@@ -1,4 +1,4 @@
-from app.models.athlete import Athlete, PerformanceRecord, TrainingRecommendation
+from app.models.athlete import Athlete, AthleteSkillSummary, PerformanceRecord, TrainingRecommendation
 from app.models.legend import Legend
 
-__all__ = ["Athlete", "PerformanceRecord", "TrainingRecommendation", "Legend"]
+__all__ = ["Athlete", "AthleteSkillSummary", "PerformanceRecord", "TrainingRecommendation", "Legend"]
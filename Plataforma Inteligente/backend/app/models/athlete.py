@@ -1,9 +1,49 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base
 
-class Athlete(Base):
+class TechnicalSkillColumns:
+    """Uma coluna numérica por habilidade técnica (1-10), espelhando o JSON technical_skills
+    
+    Permite filtrar/ordenar por habilidade em SQL e carregar matrizes de habilidades
+    sem desserializar JSON. O JSON continua sendo gravado (e lido como fallback).
+    """
+    skill_velocidade = Column(Float)
+    skill_resistencia = Column(Float)
+    skill_forca = Column(Float)
+    skill_agilidade = Column(Float)
+    skill_passe = Column(Float)
+    skill_drible = Column(Float)
+    skill_finalizacao = Column(Float)
+    skill_chute = Column(Float)
+    skill_jogo_aereo = Column(Float)
+    skill_visao_de_jogo = Column(Float)
+    skill_posicionamento = Column(Float)
+    skill_marcacao = Column(Float)
+    skill_interceptacao = Column(Float)
+    skill_reflexos = Column(Float)
+    skill_jogo_com_os_pes = Column(Float)
+    skill_disciplina_tatica = Column(Float)
+    
+    @validates("technical_skills")
+    def _sync_skill_columns(self, key, technical_skills):
+        # Mantém as colunas em sincronia sempre que o JSON é atribuído; None continua
+        # None (colunas NULL), sem virar um dicionário vazio
+        skills = technical_skills or {}
+        for skill, column in SKILL_COLUMNS.items():
+            value = skills.get(skill)
+            setattr(self, column, float(value) if isinstance(value, (int, float)) else None)
+        return technical_skills
+
+# Habilidade -> nome da coluna, na ordem do schema TechnicalSkills
+SKILL_COLUMNS = {
+    name[len("skill_"):]: name
+    for name in vars(TechnicalSkillColumns)
+    if name.startswith("skill_")
+}
+
+class Athlete(TechnicalSkillColumns, Base):
     __tablename__ = "athletes"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -25,6 +65,7 @@ class Athlete(Base):
     
     # Classificação e recomendações
     classification_data = Column(JSON)  # Resultado da classificação
+    classification_fingerprint = Column(String)  # Entradas usadas na classificação armazenada
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -33,7 +74,7 @@ class Athlete(Base):
     performance_records = relationship("PerformanceRecord", back_populates="athlete")
     training_recommendations = relationship("TrainingRecommendation", back_populates="athlete")
 
-class PerformanceRecord(Base):
+class PerformanceRecord(TechnicalSkillColumns, Base):
     __tablename__ = "performance_records"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -45,6 +86,41 @@ class PerformanceRecord(Base):
     physical_metrics = Column(JSON)  # VO2 máx, força, etc.
     
     athlete = relationship("Athlete", back_populates="performance_records")
+    
+    # Histórico por atleta em ordem cronológica (primeiro/último/recentes)
+    __table_args__ = (
+        Index("ix_performance_records_athlete_date", "athlete_id", "record_date"),
+    )
+
+class AthleteSkillSummary(Base):
+    """Agregados da evolução do atleta, atualizados a cada registro de desempenho
+    
+    Evita percorrer PerformanceRecord para evolução (primeiro x último) e
+    estagnação (últimos registros). Reconstruível pelo histórico com
+    `python rebuild_summaries.py`.
+    """
+    __tablename__ = "athlete_skill_summaries"
+    
+    athlete_id = Column(Integer, ForeignKey("athletes.id"), primary_key=True)
+    record_count = Column(Integer, nullable=False, default=0)
+    first_record_date = Column(DateTime(timezone=True))
+    last_record_date = Column(DateTime(timezone=True))
+    
+    # Habilidades do primeiro e do último registro
+    first_skills = Column(JSON)
+    latest_skills = Column(JSON)
+    
+    # Estatísticas acumuladas por habilidade: {habilidade: valor}
+    skill_min = Column(JSON)
+    skill_max = Column(JSON)
+    skill_mean = Column(JSON)
+    skill_count = Column(JSON)
+    skill_changed_at = Column(JSON)  # Data (ISO) da última mudança de valor
+    
+    # Últimos registros (mais antigo primeiro): [{"date": ..., "skills": {...}}]
+    recent_records = Column(JSON)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 class TrainingRecommendation(Base):
     __tablename__ = "training_recommendations"
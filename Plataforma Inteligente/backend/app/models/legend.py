@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, JSON
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime
 from app.database import Base
 
 class Legend(Base):
@@ -23,4 +24,8 @@ class Legend(Base):
     
     # Metadados
     description = Column(String)
+    
+    # Alterado a cada gravação pelo ORM; a recarga incremental das lendas em memória
+    # compara este carimbo. Relógio da aplicação: precisão de microssegundos
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
 class TechnicalSkills(BaseModel):
@@ -61,3 +61,7 @@ class ClassificationResult(BaseModel):
     training_recommendations: List[Dict]
     compatibility_score: float
 
+class LineupRequest(BaseModel):
+    athlete_ids: List[int]
+    formation: Union[str, Dict[str, int]] = "4-3-3"  # Nome (ex.: "4-3-3") ou vagas por posição
+    alternatives: int = Field(ge=0, le=10, default=0)  # Escalações alternativas além da melhor
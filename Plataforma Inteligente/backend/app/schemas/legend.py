@@ -0,0 +1,60 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Dict, List, Optional
+
+# Habilidades do perfil técnico (1-10); nomes fora do schema de atletas são aceitos
+SkillValue = Annotated[float, Field(ge=1, le=10)]
+
+class LegendCreate(BaseModel):
+    name: str = Field(min_length=1)
+    nationality: Optional[str] = None
+    position: Optional[str] = None
+    height: Optional[float] = Field(None, ge=140, le=220)
+    weight: Optional[float] = Field(None, ge=40, le=120)
+    body_type: Optional[str] = Field(None, pattern="^(Ectomorfo|Mesomorfo|Endomorfo)$")
+    dominant_foot: Optional[str] = Field(None, pattern="^(Destro|Canhoto|Ambidestro)$")
+    technical_profile: Dict[str, SkillValue] = Field(min_length=1)
+    distinctive_traits: List[str] = []
+    playing_style: Optional[str] = None
+    era: Optional[str] = None
+    description: Optional[str] = ""
+
+class LegendUpdate(BaseModel):
+    # Apenas os campos enviados são alterados
+    name: Optional[str] = Field(None, min_length=1)
+    nationality: Optional[str] = None
+    position: Optional[str] = None
+    height: Optional[float] = Field(None, ge=140, le=220)
+    weight: Optional[float] = Field(None, ge=40, le=120)
+    body_type: Optional[str] = Field(None, pattern="^(Ectomorfo|Mesomorfo|Endomorfo)$")
+    dominant_foot: Optional[str] = Field(None, pattern="^(Destro|Canhoto|Ambidestro)$")
+    technical_profile: Optional[Dict[str, SkillValue]] = Field(None, min_length=1)
+    distinctive_traits: Optional[List[str]] = None
+    playing_style: Optional[str] = None
+    era: Optional[str] = None
+    description: Optional[str] = None
+    
+    @field_validator("name", "technical_profile")
+    @classmethod
+    def _not_null(cls, value, info):
+        # Omitir mantém o valor atual; null apagaria um campo obrigatório da lenda
+        if value is None:
+            raise ValueError(f"{info.field_name} não pode ser nulo")
+        return value
+
+class LegendResponse(BaseModel):
+    id: int
+    name: str
+    nationality: Optional[str]
+    position: Optional[str]
+    height: Optional[float]
+    weight: Optional[float]
+    body_type: Optional[str]
+    dominant_foot: Optional[str]
+    technical_profile: Optional[Dict]
+    distinctive_traits: Optional[List[str]]
+    playing_style: Optional[str]
+    era: Optional[str]
+    description: Optional[str]
+    
+    class Config:
+        from_attributes = True
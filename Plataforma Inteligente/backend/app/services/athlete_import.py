@@ -0,0 +1,87 @@
+"""
+Cadastro em massa de atletas (academias inteiras de uma vez)
+Classificação vetorizada por lote, inserções em lote e um commit por lote
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models.athlete import Athlete, PerformanceRecord
+from app.schemas.athlete import AthleteCreate
+from app.services.athlete_store import ATHLETE_STORE, athlete_entry
+from app.services.classifier import AthleteClassifier
+from app.services.performance_ingest import record_values
+from app.services.skill_summary import new_summary
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+
+def import_athletes(
+    db: Session,
+    classifier: AthleteClassifier,
+    athletes: List[AthleteCreate],
+    athletes_data: List[Dict],
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> Iterator[Dict]:
+    """
+    Cadastra os atletas em lotes; gera {"index", "id"} (ou {"index", "error"}) por
+    atleta, na ordem de entrada, assim que o lote correspondente é gravado
+
+    athletes_data: dados de classificação de cada atleta (mesma ordem de athletes)
+    """
+    for start in range(0, len(athletes), batch_size):
+        batch = athletes[start:start + batch_size]
+        batch_data = athletes_data[start:start + batch_size]
+
+        # Classificação do lote inteiro com operações vetorizadas
+        reference = classifier.reference
+        classifications = list(classifier.iter_classify_many(batch_data, reference=reference))
+
+        try:
+            db_athletes = [
+                Athlete(
+                    name=athlete.name,
+                    age=athlete.age,
+                    nationality=athlete.nationality,
+                    height=athlete.height,
+                    weight=athlete.weight,
+                    body_type=athlete.body_type,
+                    dominant_foot=athlete.dominant_foot,
+                    primary_position=athlete.primary_position,
+                    secondary_position=athlete.secondary_position,
+                    technical_skills=athlete_data["technical_skills"],
+                    deficiencies=athlete.deficiencies,
+                    classification_data=classification,
+                    classification_fingerprint=classifier.classification_key(athlete_data, reference)
+                )
+                for athlete, athlete_data, classification in zip(batch, batch_data, classifications)
+            ]
+            db.add_all(db_athletes)
+            db.flush()  # INSERT em lote; os ids voltam via RETURNING
+
+            # Registros iniciais de desempenho e agregados de evolução do lote
+            now = datetime.utcnow()
+            db.execute(insert(PerformanceRecord), [
+                record_values(athlete.id, now, athlete.technical_skills, {})
+                for athlete in db_athletes
+            ])
+            db.add_all([
+                new_summary(athlete.id, now, athlete.technical_skills) for athlete in db_athletes
+            ])
+
+            # Capturado antes do commit, que expira os atributos carregados
+            entries = [athlete_entry(athlete) for athlete in db_athletes]
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            for index in range(start, start + len(batch)):
+                yield {"index": index, "error": f"Falha ao gravar o lote: {e.__class__.__name__}"}
+            continue
+
+        db.expunge_all()  # Não acumula os objetos dos lotes anteriores na sessão
+        ATHLETE_STORE.upsert_many(entries)
+        for index, entry in enumerate(entries, start=start):
+            yield {"index": index, "id": entry.id}
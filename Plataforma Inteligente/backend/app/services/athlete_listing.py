@@ -0,0 +1,67 @@
+"""
+Listagem de atletas por cursor (keyset) com projeção de campos
+Consulta apenas as colunas pedidas e serializa as linhas sem o modelo de resposta
+"""
+
+import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.athlete import Athlete
+from app.schemas.athlete import AthleteResponse
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Campos disponíveis na projeção (os mesmos de AthleteResponse)
+ATHLETE_FIELDS = tuple(AthleteResponse.model_fields)
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    "id,name,age" -> campos validados (id sempre incluído); ValueError se houver desconhecidos
+    """
+    if not fields:
+        return ATHLETE_FIELDS
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in ATHLETE_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}. Disponíveis: {', '.join(ATHLETE_FIELDS)}")
+    return tuple(field for field in ATHLETE_FIELDS if field == "id" or field in requested)
+
+
+def _serialize(fields: Sequence[str], row) -> Dict:
+    return {
+        field: value.isoformat() if isinstance(value, datetime) else value
+        for field, value in zip(fields, row)
+    }
+
+
+def athlete_page(
+    db: Session, fields: Sequence[str], cursor: Optional[int], limit: int, skip: int = 0
+) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Atletas com id > cursor, em ordem de id; retorna (linhas, próximo cursor ou None)
+    """
+    query = db.query(*[getattr(Athlete, field) for field in fields])
+    if cursor is not None:
+        query = query.filter(Athlete.id > cursor)
+    rows = query.order_by(Athlete.id).offset(skip).limit(limit).all()
+    id_position = fields.index("id")
+    next_cursor = rows[-1][id_position] if rows and len(rows) == limit else None
+    return [_serialize(fields, row) for row in rows], next_cursor
+
+
+async def aiter_athletes(
+    db: AsyncSession, fields: Sequence[str], batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[Dict]:
+    """
+    Todos os atletas, buscados em lotes por cursor e gerados à medida que chegam
+    """
+    cursor = None
+    while True:
+        rows, cursor = await db.run_sync(athlete_page, fields, cursor, batch_size)
+        for row in rows:
+            yield row
+        if cursor is None:
+            return
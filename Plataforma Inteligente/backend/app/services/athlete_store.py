@@ -0,0 +1,371 @@
+"""
+Matriz de habilidades de todos os atletas mantida em memória
+Carregada uma vez e atualizada incrementalmente; leituras usam snapshots imutáveis, sem lock
+"""
+
+import os
+import threading
+import time
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+from app.models.athlete import Athlete
+from app.services.skill_queries import SKILL_COLUMN_INDEX, load_skill_matrix
+from app.services.skill_vectors import skills_to_vector
+
+# Compacta quando as linhas mortas passam desta fração (e do mínimo abaixo)
+ATHLETE_STORE_COMPACT_RATIO = float(os.getenv("ATHLETE_STORE_COMPACT_RATIO", "0.25"))
+ATHLETE_STORE_COMPACT_MIN = int(os.getenv("ATHLETE_STORE_COMPACT_MIN", "256"))
+# Intervalo (s) entre verificações de alterações feitas por outros processos; 0 desativa
+ATHLETE_STORE_REFRESH_SECONDS = float(os.getenv("ATHLETE_STORE_REFRESH_SECONDS", "10"))
+INITIAL_CAPACITY = 1024
+REFRESH_CHUNK_SIZE = 500  # Ids por consulta ao reler atletas alterados
+
+# Carimbo de linhas gravadas por este processo: relidas na próxima verificação
+_UNKNOWN_STAMP = object()
+
+
+class AthleteEntry(NamedTuple):
+    """
+    Dados do atleta usados pelo armazenamento (independentes da sessão do banco)
+    """
+    id: int
+    primary_position: Optional[str]
+    secondary_position: Optional[str]
+    technical_skills: Optional[Dict]
+
+
+def athlete_entry(athlete: Athlete) -> AthleteEntry:
+    return AthleteEntry(
+        athlete.id, athlete.primary_position, athlete.secondary_position, athlete.technical_skills
+    )
+
+
+class AthleteSkillSnapshot(NamedTuple):
+    """
+    Visão imutável do armazenamento; linhas com alive=False são lápides
+    """
+    ids: np.ndarray
+    primary_positions: np.ndarray
+    secondary_positions: np.ndarray
+    values: np.ndarray
+    mask: np.ndarray
+    alive: np.ndarray
+    rows: Dict[int, int]
+    version: int
+
+    def row_of(self, athlete_id: int) -> Optional[int]:
+        return self.rows.get(athlete_id)
+
+    def candidates(self, position: Optional[str] = None, exclude: Optional[int] = None) -> np.ndarray:
+        """
+        Linhas vivas, opcionalmente filtradas por posição (primária ou secundária)
+        """
+        selected = self.alive.copy()
+        if position:
+            selected &= (self.primary_positions == position) | (self.secondary_positions == position)
+        row = self.rows.get(exclude) if exclude is not None else None
+        if row is not None:
+            selected[row] = False
+        return np.flatnonzero(selected)
+
+
+def _fetch_rows(db: Session, *criteria) -> Tuple[List[Tuple], Dict]:
+    """
+    Linhas (id, posição primária, secundária, valores, máscara) e carimbos
+    updated_at dos atletas que atendem aos critérios, em ordem de id
+    """
+    ids, values, mask = load_skill_matrix(db, Athlete, *criteria)
+    details = {
+        row[0]: row[1:]
+        for row in db.query(
+            Athlete.id, Athlete.primary_position, Athlete.secondary_position, Athlete.updated_at
+        ).filter(*criteria).all()
+    }
+    rows = []
+    stamps = {}
+    for row, athlete_id in enumerate(ids.tolist()):
+        # Sem detalhes: inserido entre as duas consultas, relido na próxima verificação
+        primary, secondary, stamp = details.get(athlete_id, (None, None, _UNKNOWN_STAMP))
+        rows.append((athlete_id, primary, secondary, values[row], mask[row]))
+        stamps[athlete_id] = stamp
+    return rows, stamps
+
+
+class AthleteSkillStore:
+    """
+    Buffers com capacidade dobrada a cada crescimento; novas versões de linhas são
+    acrescentadas ao final, de modo que snapshots já publicados nunca mudam
+
+    Gravações deste processo são aplicadas de imediato; as de outros processos
+    (workers da API, fila de tarefas, scripts) a cada refresh_seconds, comparando
+    (id, updated_at) de todos os atletas como em LegendStore
+    """
+
+    def __init__(
+        self,
+        compact_ratio: float = ATHLETE_STORE_COMPACT_RATIO,
+        compact_min: int = ATHLETE_STORE_COMPACT_MIN,
+        refresh_seconds: float = ATHLETE_STORE_REFRESH_SECONDS
+    ):
+        self.compact_ratio = compact_ratio
+        self.compact_min = compact_min
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[AthleteSkillSnapshot] = None
+        self._size = 0
+        self._version = 0
+        self._stamps: Dict[int, object] = {}
+        self._latest_stamp = None
+        self._checked_at = 0.0
+
+    @property
+    def snapshot(self) -> Optional[AthleteSkillSnapshot]:
+        return self._snapshot
+
+    def read(self, db: Session) -> AthleteSkillSnapshot:
+        """
+        Snapshot atual, carregando do banco na primeira leitura e verificando
+        alterações de outros processos quando o intervalo configurado já passou
+        """
+        if self._snapshot is None:
+            self.load(db)
+        else:
+            self.refresh_due(db)
+        return self._snapshot
+
+    def load(self, db: Session) -> None:
+        """
+        (Re)carrega todos os atletas do banco
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            rows, stamps = _fetch_rows(db)
+            self._stamps = stamps
+            self._latest_stamp = self._max_stamp(stamps.values())
+            self._replace(
+                np.array([row[0] for row in rows], dtype=np.int64),
+                np.array([row[1] for row in rows], dtype=object),
+                np.array([row[2] for row in rows], dtype=object),
+                np.array([row[3] for row in rows], dtype=float).reshape(len(rows), len(SKILL_COLUMN_INDEX)),
+                np.array([row[4] for row in rows], dtype=bool).reshape(len(rows), len(SKILL_COLUMN_INDEX))
+            )
+
+    def refresh(self, db: Session) -> bool:
+        """
+        Aplica as alterações da tabela desde a última leitura; retorna True se houve alguma
+
+        Compara (id, updated_at) de todas as linhas e relê por completo apenas as
+        novas ou alteradas; ids ausentes viram lápides. Linhas com o carimbo mais
+        recente já visto são sempre relidas (o carimbo pode ter resolução de segundos)
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if self._snapshot is None:
+                return False  # Ainda não carregado; a carga lerá o estado do banco
+            stamps = dict(db.query(Athlete.id, Athlete.updated_at).all())
+            latest = self._latest_stamp
+            changed = [
+                athlete_id for athlete_id, stamp in stamps.items()
+                if self._stamps.get(athlete_id, _UNKNOWN_STAMP) != stamp
+                or (stamp is not None and latest is not None and stamp >= latest)
+            ]
+            removed = [athlete_id for athlete_id in self._stamps if athlete_id not in stamps]
+            self._latest_stamp = self._max_stamp(stamps.values())
+            if not changed and not removed:
+                return False
+
+            updates = []
+            for start in range(0, len(changed), REFRESH_CHUNK_SIZE):
+                rows, fetched = _fetch_rows(db, Athlete.id.in_(changed[start:start + REFRESH_CHUNK_SIZE]))
+                updates.extend(rows)
+                self._stamps.update(fetched)
+            for athlete_id in removed:
+                del self._stamps[athlete_id]
+            # Linhas relidas sem alteração (gravadas por este processo ou só reconferidas)
+            # não geram nova versão
+            snapshot = self._snapshot
+            updates = [update for update in updates if not self._same_row(snapshot, update)]
+            if not updates and not removed:
+                return False
+            self._apply(updates, removed)
+            return True
+
+    def refresh_due(self, db: Session) -> bool:
+        """
+        Verifica alterações se o intervalo configurado já passou (sem esperar por outra verificação)
+        """
+        if not self.refresh_seconds or self._snapshot is None:
+            return False
+        if time.monotonic() - self._checked_at < self.refresh_seconds or self._lock.locked():
+            return False
+        return self.refresh(db)
+
+    def upsert(self, athlete: Athlete) -> None:
+        """
+        Insere ou atualiza um atleta (a versão anterior vira lápide)
+        """
+        self.upsert_many([athlete_entry(athlete)])
+
+    def upsert_many(self, entries: Sequence[AthleteEntry]) -> None:
+        """
+        Insere ou atualiza vários atletas publicando um único snapshot
+        """
+        if not entries:
+            return
+        updates = [
+            (entry.id, entry.primary_position, entry.secondary_position,
+             *skills_to_vector(entry.technical_skills or {}, SKILL_COLUMN_INDEX))
+            for entry in entries
+        ]
+        with self._lock:
+            if self._snapshot is None:
+                return  # Ainda não carregado; a carga lerá o estado do banco
+            for entry in entries:
+                # O updated_at gravado não é conhecido aqui: a próxima verificação relê a linha
+                self._stamps[entry.id] = _UNKNOWN_STAMP
+            self._apply(updates)
+
+    def remove(self, athlete_id: int) -> None:
+        """
+        Marca o atleta como removido (lápide); o espaço é recuperado na compactação
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or athlete_id not in snapshot.rows:
+                return
+            self._stamps.pop(athlete_id, None)
+            self._apply([], [athlete_id])
+
+    def compact(self) -> None:
+        with self._lock:
+            if self._snapshot is not None:
+                self._compact()
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "athletes": len(snapshot.rows),
+            "rows": len(snapshot.ids),
+            "tombstones": len(snapshot.ids) - len(snapshot.rows),
+            "capacity": len(self._ids),
+            "version": snapshot.version
+        }
+
+    @staticmethod
+    def _same_row(snapshot: AthleteSkillSnapshot, update: Tuple) -> bool:
+        athlete_id, primary, secondary, values, mask = update
+        row = snapshot.rows.get(athlete_id)
+        return (
+            row is not None
+            and snapshot.primary_positions[row] == primary
+            and snapshot.secondary_positions[row] == secondary
+            and np.array_equal(snapshot.values[row], values)
+            and np.array_equal(snapshot.mask[row], mask)
+        )
+
+    @staticmethod
+    def _max_stamp(stamps):
+        known = [stamp for stamp in stamps if stamp is not None and stamp is not _UNKNOWN_STAMP]
+        return max(known) if known else None
+
+    def _apply(self, updates: Sequence[Tuple], removed: Sequence[int] = ()) -> None:
+        # Chamado com o lock adquirido: acrescenta as novas versões e publica um único snapshot
+        snapshot = self._snapshot
+        self._ensure_capacity(self._size + len(updates))
+        alive = np.append(snapshot.alive, np.ones(len(updates), dtype=bool))
+        rows = dict(snapshot.rows)
+        for athlete_id in removed:
+            previous = rows.pop(athlete_id, None)
+            if previous is not None:
+                alive[previous] = False
+        for athlete_id, primary, secondary, values, mask in updates:
+            row = self._size
+            self._ids[row] = athlete_id
+            self._primary[row] = primary
+            self._secondary[row] = secondary
+            self._values[row] = values
+            self._mask[row] = mask
+            self._size += 1
+
+            previous = rows.get(athlete_id)
+            if previous is not None:
+                alive[previous] = False
+            rows[athlete_id] = row
+        self._publish(alive, rows)
+        self._maybe_compact()
+
+    def _allocate(self, capacity: int) -> None:
+        # Novos buffers: snapshots antigos continuam apontando para os anteriores
+        size = self._size
+        buffers = (
+            np.zeros(capacity, dtype=np.int64),
+            np.empty(capacity, dtype=object),
+            np.empty(capacity, dtype=object),
+            # float64, como no cálculo a partir do banco: as faixas de diferença da
+            # complementaridade (ex.: 3.1 - 1.1 = 2) não podem depender da precisão
+            np.zeros((capacity, len(SKILL_COLUMN_INDEX)), dtype=float),
+            np.zeros((capacity, len(SKILL_COLUMN_INDEX)), dtype=bool)
+        )
+        if size:
+            current = (self._ids, self._primary, self._secondary, self._values, self._mask)
+            for new_buffer, buffer in zip(buffers, current):
+                new_buffer[:size] = buffer[:size]
+        self._ids, self._primary, self._secondary, self._values, self._mask = buffers
+
+    def _replace(self, ids, primary, secondary, values, mask) -> None:
+        size = len(ids)
+        self._size = 0
+        self._allocate(max(INITIAL_CAPACITY, 2 * size))
+        self._ids[:size] = ids
+        self._primary[:size] = primary
+        self._secondary[:size] = secondary
+        self._values[:size] = values
+        self._mask[:size] = mask
+        self._size = size
+        rows = {athlete_id: row for row, athlete_id in enumerate(ids.tolist())}
+        self._publish(np.ones(size, dtype=bool), rows)
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size > len(self._ids):
+            self._allocate(max(2 * len(self._ids), size))
+
+    def _publish(self, alive: np.ndarray, rows: Dict[int, int]) -> None:
+        size = self._size
+        self._version += 1
+        self._snapshot = AthleteSkillSnapshot(
+            ids=self._ids[:size],
+            primary_positions=self._primary[:size],
+            secondary_positions=self._secondary[:size],
+            values=self._values[:size],
+            mask=self._mask[:size],
+            alive=alive,
+            rows=rows,
+            version=self._version
+        )
+
+    def _maybe_compact(self) -> None:
+        snapshot = self._snapshot
+        dead = len(snapshot.ids) - len(snapshot.rows)
+        if dead >= self.compact_min and dead > self.compact_ratio * len(snapshot.ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        # Mantém apenas linhas vivas, em ordem de id
+        snapshot = self._snapshot
+        live = np.flatnonzero(snapshot.alive)
+        live = live[np.argsort(snapshot.ids[live], kind="stable")]
+        self._replace(
+            snapshot.ids[live],
+            snapshot.primary_positions[live],
+            snapshot.secondary_positions[live],
+            snapshot.values[live],
+            snapshot.mask[live]
+        )
+
+
+# Armazenamento compartilhado por todo o processo
+ATHLETE_STORE = AthleteSkillStore()
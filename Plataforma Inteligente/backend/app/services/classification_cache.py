@@ -0,0 +1,117 @@
+"""
+Cache de classificações endereçado pelo conteúdo das entradas do classificador
+Evita reclassificar atletas cujas habilidades e dados de referência não mudaram
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+from app.services.legend_events import on_legends_changed
+
+CLASSIFICATION_CACHE_SIZE = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "2048"))
+CLASSIFICATION_CACHE_TTL = float(os.getenv("CLASSIFICATION_CACHE_TTL", "600"))  # segundos
+
+# Campos do atleta que influenciam o resultado da classificação
+FINGERPRINT_FIELDS = ("technical_skills", "height", "body_type", "primary_position", "deficiencies")
+
+
+def stable_hash(data) -> str:
+    """
+    Hash estável (entre processos) de uma estrutura serializável em JSON
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def athlete_fingerprint(athlete_data: Dict) -> str:
+    """
+    Impressão digital das entradas do classificador para um atleta
+    """
+    return stable_hash({field: athlete_data.get(field) for field in FINGERPRINT_FIELDS})
+
+
+class ClassificationCache:
+    """
+    Cache LRU com expiração (TTL); os valores são compartilhados e não devem ser alterados
+    """
+
+    def __init__(self, maxsize: int = CLASSIFICATION_CACHE_SIZE, ttl: float = CLASSIFICATION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._by_athlete: Dict[int, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, athlete_id = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Dict, athlete_id: Optional[int] = None) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, athlete_id)
+            if athlete_id is not None:
+                self._by_athlete.setdefault(athlete_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, athlete_id = self._entries.pop(key)
+        keys = self._by_athlete.get(athlete_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_athlete[athlete_id]
+
+    def invalidate_athlete(self, athlete_id: int) -> None:
+        """
+        Remove as classificações associadas a um atleta (ex.: novo desempenho registrado)
+        """
+        with self._lock:
+            for key in list(self._by_athlete.get(athlete_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_athlete.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Cache compartilhado por todo o processo
+CLASSIFICATION_CACHE = ClassificationCache()
+
+# Alterações nas lendas mudam a versão dos dados; descarta tudo de imediato
+on_legends_changed(CLASSIFICATION_CACHE.clear)
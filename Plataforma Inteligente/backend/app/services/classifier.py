@@ -3,149 +3,327 @@ Sistema de Classificação Inteligente de Atletas
 Compara características com jogadores históricos e sugere posições ideais
 """
 
+import threading
 import numpy as np
-from typing import Dict, List, Tuple
-from app.services.legend_database import LEGEND_DATABASE, POSITION_TEMPLATES
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence
+from app.services.classification_cache import CLASSIFICATION_CACHE, athlete_fingerprint, stable_hash
+from app.services.legend_database import POSITION_TEMPLATES
+from app.services.legend_events import on_legends_changed
+from app.services.legend_index import build_legend_index
+from app.services.legend_matrix import LegendMatrix
+from app.services.legend_store import LEGEND_STORE
+from app.services.position_matrix import PositionMatrix
+from app.services.training_catalog import TRAINING_CATALOG, TrainingCatalog
+
+# Quantidade de atletas avaliados por bloco na classificação em lote
+BATCH_CHUNK_SIZE = 256
+
+# Número de lendas similares incluídas na classificação
+SIMILAR_LEGENDS_LIMIT = 5
+
+class ReferenceData:
+    """
+    Dados de referência compilados: lendas (matriz e índice), templates de posição
+    e catálogo de treinos. Imutável; uma atualização cria uma instância nova
+    """
+    
+    def __init__(
+        self,
+        legends: Sequence[Dict],
+        position_templates: Mapping[str, Dict],
+        training_catalog: TrainingCatalog,
+        legend_index: Optional[str] = None,
+        position_matrix: Optional[PositionMatrix] = None
+    ):
+        self.legends = list(legends)
+        self.position_templates = position_templates
+        self.training_catalog = training_catalog
+        self.legend_index_kind = legend_index
+        self.legend_matrix = LegendMatrix(self.legends)
+        self.legend_index = build_legend_index(self.legend_matrix, legend_index)
+        self.position_matrix = position_matrix or PositionMatrix(position_templates)
+        
+        # Busca por nome (relatórios); em nomes repetidos vale a primeira lenda
+        self.legends_by_name: Dict[str, Dict] = {}
+        for legend in self.legends:
+            self.legends_by_name.setdefault(legend["name"], legend)
+        
+        # Versão dos dados; estável entre processos, faz parte da chave do cache de classificações
+        self.version = stable_hash([
+            self.legends, self.position_templates, self.training_catalog.entries
+        ])
+    
+    def replace(
+        self,
+        legends: Optional[Sequence[Dict]] = None,
+        position_templates: Optional[Mapping[str, Dict]] = None,
+        training_catalog: Optional[TrainingCatalog] = None
+    ) -> "ReferenceData":
+        """
+        Nova versão com as partes informadas substituídas; as demais são reaproveitadas
+        """
+        return ReferenceData(
+            self.legends if legends is None else legends,
+            position_templates or self.position_templates,
+            training_catalog or self.training_catalog,
+            self.legend_index_kind,
+            self.position_matrix if position_templates is None else None
+        )
+    
+    def info(self) -> Dict:
+        return {
+            "version": self.version,
+            "legends": len(self.legends),
+            "positions": len(self.position_matrix.positions),
+            "training_entries": len(self.training_catalog.entries),
+            "legend_index": self.legend_index.name
+        }
 
 class AthleteClassifier:
-    def __init__(self):
-        self.legend_database = LEGEND_DATABASE
-        self.position_templates = POSITION_TEMPLATES
+    def __init__(self, legend_index: Optional[str] = None, reference: Optional[ReferenceData] = None):
+        # Versão do snapshot de lendas (tabela Legend) compilada em self.reference
+        self.legends_version: Optional[int] = None
+        if reference is None:
+            snapshot = LEGEND_STORE.read()
+            reference = ReferenceData(snapshot.legends, POSITION_TEMPLATES, TRAINING_CATALOG, legend_index)
+            self.legends_version = snapshot.version
+        self.reference = reference
+        self.cache = CLASSIFICATION_CACHE
+        self._swap_lock = threading.Lock()
+    
+    @property
+    def data_version(self) -> str:
+        return self.reference.version
+    
+    @property
+    def position_matrix(self) -> PositionMatrix:
+        return self.reference.position_matrix
     
-    def classify_athlete(self, athlete_data: Dict) -> Dict:
+    def swap_reference_data(
+        self,
+        legends: Optional[Sequence[Dict]] = None,
+        position_templates: Optional[Mapping[str, Dict]] = None,
+        training_catalog: Optional[TrainingCatalog] = None
+    ) -> ReferenceData:
+        """
+        Compila os novos dados de referência e os publica de uma vez
+
+        A troca é uma única atribuição: chamadas em andamento terminam com a versão
+        que leram no início, as seguintes já usam a nova
+        """
+        with self._swap_lock:
+            reference = self.reference.replace(legends, position_templates, training_catalog)
+            self.reference = reference
+        return reference
+    
+    def sync_legends(self) -> bool:
+        """
+        Publica as lendas do snapshot atual, se ele for mais novo que o compilado
+        """
+        snapshot = LEGEND_STORE.snapshot
+        if snapshot is None or snapshot.version == self.legends_version:
+            return False
+        with self._swap_lock:
+            # Relido dentro do lock: trocas concorrentes nunca voltam a uma versão anterior
+            snapshot = LEGEND_STORE.snapshot
+            if snapshot.version == self.legends_version:
+                return False
+            self.reference = self.reference.replace(legends=snapshot.legends)
+            self.legends_version = snapshot.version
+        return True
+    
+    def refresh_legends(self) -> bool:
+        """
+        Lê do banco as lendas alteradas e recompila matriz e índice de busca
+        """
+        LEGEND_STORE.refresh()
+        return self.sync_legends()
+    
+    def classify_athlete(self, athlete_data: Dict, reference: Optional[ReferenceData] = None) -> Dict:
         """
         Classifica atleta comparando com referências históricas
         """
+        reference = reference or self.reference
+        
         # 1. Análise de Posição Baseada em Atributos
-        position_scores = self.calculate_position_suitability(athlete_data)
+        position_scores = self.calculate_position_suitability(athlete_data, reference)
         
         # 2. Comparação com Jogadores Históricos
-        legend_comparison = self.find_closest_legends(athlete_data)
+        legend_comparison = self.find_closest_legends(
+            athlete_data, top_k=SIMILAR_LEGENDS_LIMIT, reference=reference
+        )
         
+        return self._build_classification(reference, athlete_data, position_scores, legend_comparison)
+    
+    def classification_key(self, athlete_data: Dict, reference: Optional[ReferenceData] = None) -> str:
+        """
+        Identifica as entradas da classificação: dados do atleta + versão dos dados de referência
+        """
+        return stable_hash([athlete_fingerprint(athlete_data), (reference or self.reference).version])
+    
+    def classify_athlete_cached(
+        self,
+        athlete_data: Dict,
+        athlete_id: Optional[int] = None,
+        reference: Optional[ReferenceData] = None
+    ) -> Dict:
+        """
+        Classifica atleta reaproveitando o resultado de entradas idênticas
+
+        O resultado é compartilhado com o cache e não deve ser alterado
+        """
+        # Chave e classificação calculadas sobre a mesma versão dos dados
+        reference = reference or self.reference
+        key = self.classification_key(athlete_data, reference)
+        classification = self.cache.get(key)
+        if classification is None:
+            classification = self.classify_athlete(athlete_data, reference)
+            self.cache.put(key, classification, athlete_id)
+        return classification
+    
+    def classify_many(self, athletes: List[Dict]) -> List[Dict]:
+        """
+        Classifica vários atletas de uma vez, mantendo a ordem de entrada
+        """
+        return list(self.iter_classify_many(athletes))
+    
+    def iter_classify_many(
+        self,
+        athletes: List[Dict],
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        reference: Optional[ReferenceData] = None
+    ) -> Iterator[Dict]:
+        """
+        Gera classificações em ordem, processando os atletas em blocos
+
+        Posições e lendas são avaliadas para o bloco inteiro com operações
+        vetorizadas (busca exata, sem o índice de lendas); cada resultado é
+        emitido assim que o bloco termina. Todo o lote usa a mesma versão dos dados,
+        e cada resultado é idêntico ao de classify_athlete
+        """
+        reference = reference or self.reference
+        position_matrix, legend_matrix = reference.position_matrix, reference.legend_matrix
+        for start in range(0, len(athletes), chunk_size):
+            chunk = athletes[start:start + chunk_size]
+            
+            position_scores_matrix = position_matrix.score_many(chunk)
+            similarity, valid = legend_matrix.score_many(chunk)
+            
+            for row, athlete_data in enumerate(chunk):
+                position_scores = dict(zip(position_matrix.positions, position_scores_matrix[row]))
+                legend_comparison = self._rank_legends(
+                    similarity[row], valid[row], top_k=SIMILAR_LEGENDS_LIMIT,
+                    legend_matrix=legend_matrix
+                )
+                yield self._build_classification(reference, athlete_data, position_scores, legend_comparison)
+    
+    def _build_classification(
+        self,
+        reference: ReferenceData,
+        athlete_data: Dict,
+        position_scores: Dict[str, float],
+        legend_comparison: List[Dict]
+    ) -> Dict:
         # 3. Identificação de Forças e Fraquezas
         strengths = self.identify_strengths(athlete_data)
         development_areas = self.identify_development_areas(athlete_data)
         
         # 4. Recomendações de Treinamento
         training_recommendations = self.generate_training_recommendations(
-            athlete_data, development_areas
+            athlete_data, development_areas, reference
         )
         
         return {
             "recommended_position": max(position_scores, key=position_scores.get),
             "position_scores": position_scores,
-            "similar_legends": legend_comparison[:5],
+            "similar_legends": legend_comparison,
             "strengths": strengths,
             "development_areas": development_areas,
             "training_recommendations": training_recommendations,
             "compatibility_score": max(position_scores.values()) if position_scores else 0
         }
     
-    def calculate_position_suitability(self, athlete_data: Dict) -> Dict[str, float]:
+    def calculate_position_suitability(
+        self, athlete_data: Dict, reference: Optional[ReferenceData] = None
+    ) -> Dict[str, float]:
         """
         Calcula adequação do atleta para cada posição
         """
-        position_scores = {}
-        technical_skills = athlete_data.get("technical_skills", {})
-        
-        for position, template in self.position_templates.items():
-            score = 0.0
-            factors = []
-            
-            # 1. Análise de altura (se disponível)
-            if athlete_data.get("height"):
-                ideal_min, ideal_max = template["ideal_height"]
-                height = athlete_data["height"]
-                if ideal_min <= height <= ideal_max:
-                    height_score = 1.0
-                elif height < ideal_min:
-                    height_score = max(0.3, 1 - (ideal_min - height) / 20)
-                else:
-                    height_score = max(0.3, 1 - (height - ideal_max) / 20)
-                score += height_score * 0.15
-                factors.append(f"Altura: {height_score:.2f}")
-            
-            # 2. Análise de habilidades-chave
-            key_skills = template["key_skills"]
-            skill_scores = []
-            for skill in key_skills:
-                skill_value = technical_skills.get(skill, 5)
-                skill_scores.append(skill_value / 10.0)
-            
-            if skill_scores:
-                avg_skill_score = np.mean(skill_scores)
-                score += avg_skill_score * 0.70
-                factors.append(f"Habilidades-chave: {avg_skill_score:.2f}")
-            
-            # 3. Análise de biotipo (se disponível)
-            if athlete_data.get("body_type"):
-                body_type = athlete_data["body_type"]
-                preferred_types = template["preferred_body_types"]
-                if body_type in preferred_types:
-                    score += 0.15
-                    factors.append(f"Biotipo: 1.0")
-                else:
-                    score += 0.05
-                    factors.append(f"Biotipo: 0.33")
-            
-            position_scores[position] = min(1.0, score)
-        
-        return position_scores
+        # Mesmo cálculo matricial usado na classificação em lote
+        position_matrix = (reference or self.reference).position_matrix
+        scores = position_matrix.score_many([athlete_data])[0]
+        return dict(zip(position_matrix.positions, scores))
+    
+    def explain_position_suitability(self, athlete_data: Dict) -> Dict[str, List[str]]:
+        """
+        Detalha os fatores (altura, habilidades-chave, biotipo) de cada posição
+        """
+        return self.position_matrix.explain(athlete_data)
     
-    def find_closest_legends(self, athlete_data: Dict) -> List[Dict]:
+    def find_closest_legends(
+        self,
+        athlete_data: Dict,
+        top_k: Optional[int] = None,
+        min_similarity: Optional[float] = None,
+        reference: Optional[ReferenceData] = None
+    ) -> List[Dict]:
         """
         Encontra jogadores históricos mais similares
+
+        top_k limita o resultado às k lendas mais similares; min_similarity
+        (em %, mesma escala do campo "similarity") descarta lendas abaixo do corte
         """
-        athlete_skills = athlete_data.get("technical_skills", {})
-        similarities = []
+        if top_k is not None and top_k <= 0:
+            return []
+        reference = reference or self.reference
+        legend_matrix, legend_index = reference.legend_matrix, reference.legend_index
         
-        for legend in self.legend_database:
-            legend_skills = legend["technical_profile"]
-            
-            # Calcula similaridade usando distância euclidiana normalizada
-            common_skills = set(athlete_skills.keys()) & set(legend_skills.keys())
-            
-            if not common_skills:
-                continue
-            
-            # Normaliza valores para comparação
-            athlete_vector = np.array([athlete_skills[skill] for skill in common_skills])
-            legend_vector = np.array([legend_skills[skill] for skill in common_skills])
-            
-            # Distância euclidiana normalizada (menor = mais similar)
-            distance = np.linalg.norm(athlete_vector - legend_vector) / len(common_skills)
-            similarity = 1 / (1 + distance)  # Converte distância em similaridade
-            
-            # Bônus por posição similar
-            if athlete_data.get("primary_position") == legend["position"]:
-                similarity *= 1.2
-            
-            # Bônus por características físicas similares
-            if athlete_data.get("height") and legend.get("height"):
-                height_diff = abs(athlete_data["height"] - legend["height"])
-                if height_diff < 10:
-                    similarity *= 1.1
-            
-            similarities.append({
-                "legend": legend,
-                "similarity": similarity,
-                "distance": distance
-            })
+        # O índice restringe as lendas avaliadas (None = todas); a similaridade
+        # dos candidatos é calculada em uma única operação vetorizada
+        rows = legend_index.candidates(athlete_data, top_k)
+        similarity, distance, valid = legend_matrix.score(athlete_data, rows)
+        return self._rank_legends(similarity, valid, top_k, min_similarity, rows, legend_matrix)
+    
+    def _rank_legends(
+        self,
+        similarity: np.ndarray,
+        valid: np.ndarray,
+        top_k: Optional[int] = None,
+        min_similarity: Optional[float] = None,
+        rows: Optional[np.ndarray] = None,
+        legend_matrix: Optional[LegendMatrix] = None
+    ) -> List[Dict]:
+        legend_matrix = legend_matrix or self.reference.legend_matrix
+        candidates = np.flatnonzero(valid)
+        if min_similarity is not None:
+            candidates = candidates[similarity[candidates] * 100 >= min_similarity]
+        
+        if top_k is not None and 0 < top_k < len(candidates):
+            # Seleção parcial: O(n) em vez de ordenar todas as lendas.
+            # Mantém empates no limite para preservar a ordem estável abaixo
+            scores = similarity[candidates]
+            winners = np.argpartition(-scores, top_k - 1)[:top_k]
+            candidates = candidates[scores >= scores[winners].min()]
         
-        # Ordena por similaridade (maior primeiro)
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
+        # Ordena por similaridade (maior primeiro), mantendo a ordem original em empates
+        ranking = candidates[np.argsort(-similarity[candidates], kind="stable")][:top_k]
         
-        return [
-            {
-                "name": item["legend"]["name"],
-                "position": item["legend"]["position"],
-                "similarity": round(item["similarity"] * 100, 2),
-                "playing_style": item["legend"]["playing_style"],
-                "distinctive_traits": item["legend"]["distinctive_traits"],
-                "era": item["legend"]["era"]
-            }
-            for item in similarities
-        ]
+        # Converte posições do subconjunto avaliado em linhas da matriz
+        legends = legend_matrix.legends
+        if rows is not None:
+            return [self._legend_result(legends[rows[i]], similarity[i]) for i in ranking]
+        return [self._legend_result(legends[i], similarity[i]) for i in ranking]
+    
+    @staticmethod
+    def _legend_result(legend: Dict, similarity: float) -> Dict:
+        return {
+            "name": legend["name"],
+            "position": legend["position"],
+            "similarity": round(float(similarity) * 100, 2),
+            "playing_style": legend["playing_style"],
+            "distinctive_traits": legend["distinctive_traits"],
+            "era": legend["era"]
+        }
     
     def identify_strengths(self, athlete_data: Dict) -> List[str]:
         """
@@ -183,179 +361,43 @@ class AthleteClassifier:
         return list(set(development_areas))  # Remove duplicatas
     
     def generate_training_recommendations(
-        self, athlete_data: Dict, development_areas: List[str]
+        self,
+        athlete_data: Dict,
+        development_areas: List[str],
+        reference: Optional[ReferenceData] = None
     ) -> List[Dict]:
         """
         Gera recomendações de treinamento baseadas nas áreas de desenvolvimento
         """
-        recommendations = []
-        
-        training_map = {
-            "Jogo Aéreo": {
-                "exercises": [
-                    "Cabeceio com salto em diferentes alturas",
-                    "Posicionamento em cruzamentos",
-                    "Força de impulsão com exercícios pliométricos",
-                    "Trabalho de timing em bolas aéreas"
-                ],
-                "drills": [
-                    "2x2 em áreas pré-definidas com foco em jogo aéreo",
-                    "Cruzamentos com marcação",
-                    "Jogos aéreos 1x1",
-                    "Treino de finalização de cabeça"
-                ],
-                "reference_players": ["Cristiano Ronaldo", "Marco van Basten", "Alessandro Nesta"]
-            },
-            "Jogo Com Os Pés": {
-                "exercises": [
-                    "Saída de bola curta sob pressão",
-                    "Lançamentos longos precisos",
-                    "Controle sob pressão",
-                    "Passe com ambos os pés"
-                ],
-                "drills": [
-                    "Posse de bola com numeração inferior",
-                    "Transição rápida defesa-ataque",
-                    "Jogo posicional com goleiro",
-                    "Construção de jogo desde o gol"
-                ],
-                "reference_players": ["Manuel Neuer", "Ederson", "Alisson"]
-            },
-            "Disciplina Tática": {
-                "exercises": [
-                    "Estudos táticos com vídeos",
-                    "Posicionamento em simulações de jogo",
-                    "Tomada de decisão em situações táticas",
-                    "Comunicação e organização"
-                ],
-                "drills": [
-                    "Jogo com regras condicionantes",
-                    "Transições defensivas organizadas",
-                    "Marcação zonal vs individual",
-                    "Sistemas de jogo variados"
-                ],
-                "reference_players": ["Philipp Lahm", "Cafu", "Franz Beckenbauer"]
-            },
-            "Finalização": {
-                "exercises": [
-                    "Chute em diferentes ângulos",
-                    "Finalização sob pressão",
-                    "Conclusão em velocidade",
-                    "Chute de primeira"
-                ],
-                "drills": [
-                    "1x1 com goleiro",
-                    "Finalização em segunda jogada",
-                    "Finalização após drible",
-                    "Finalização em velocidade"
-                ],
-                "reference_players": ["Pelé", "Romário", "Ronaldo Fenômeno"]
-            },
-            "Drible": {
-                "exercises": [
-                    "Drible em espaços reduzidos",
-                    "Mudanças de direção",
-                    "Drible em velocidade",
-                    "Proteção de bola"
-                ],
-                "drills": [
-                    "1x1 em diferentes áreas",
-                    "Drible em circuito",
-                    "Drible em situações de jogo",
-                    "Drible com finalização"
-                ],
-                "reference_players": ["Lionel Messi", "Diego Maradona", "Andrés Iniesta"]
-            },
-            "Passe": {
-                "exercises": [
-                    "Passe curto de precisão",
-                    "Passe longo",
-                    "Passe em movimento",
-                    "Passe de primeira"
-                ],
-                "drills": [
-                    "Rondos com diferentes números",
-                    "Passe em triangulações",
-                    "Transições rápidas",
-                    "Construção de jogadas"
-                ],
-                "reference_players": ["Xavi Hernández", "Andrea Pirlo", "Zinedine Zidane"]
-            },
-            "Marcação": {
-                "exercises": [
-                    "Marcação individual",
-                    "Marcação zonal",
-                    "Antecipação",
-                    "Combate físico"
-                ],
-                "drills": [
-                    "1x1 defensivo",
-                    "Marcação em diferentes zonas",
-                    "Transições defensivas",
-                    "Jogo posicional defensivo"
-                ],
-                "reference_players": ["Franco Baresi", "Lothar Matthäus", "Frank Rijkaard"]
-            },
-            "Velocidade": {
-                "exercises": [
-                    "Sprints de diferentes distâncias",
-                    "Aceleração",
-                    "Velocidade com mudança de direção",
-                    "Velocidade com bola"
-                ],
-                "drills": [
-                    "Corridas de velocidade",
-                    "Transições rápidas",
-                    "Contra-ataques",
-                    "Jogo em velocidade"
-                ],
-                "reference_players": ["Ronaldo Fenômeno", "Cafu", "Cristiano Ronaldo"]
-            },
-            "Resistência": {
-                "exercises": [
-                    "Corrida contínua",
-                    "Intervalos de alta intensidade",
-                    "Resistência com bola",
-                    "Recuperação ativa"
-                ],
-                "drills": [
-                    "Jogos de posse prolongada",
-                    "Transições contínuas",
-                    "Pressionamento alto",
-                    "Jogo em espaços amplos"
-                ],
-                "reference_players": ["Cafu", "Xavi Hernández", "Andrés Iniesta"]
-            }
-        }
-        
-        for area in development_areas:
-            area_normalized = area.lower()
-            # Tenta encontrar correspondência
-            for key, value in training_map.items():
-                if key.lower() in area_normalized or area_normalized in key.lower():
-                    recommendations.append({
-                        "deficiency": area,
-                        "exercises": value["exercises"],
-                        "drills": value["drills"],
-                        "reference_players": value["reference_players"]
-                    })
-                    break
-            else:
-                # Recomendação genérica se não encontrar correspondência específica
-                recommendations.append({
-                    "deficiency": area,
-                    "exercises": [
-                        f"Trabalho específico em {area.lower()}",
-                        "Exercícios técnicos direcionados",
-                        "Drills de jogo real"
-                    ],
-                    "drills": [
-                        "Aplicação em situações de jogo",
-                        "Treino posicional",
-                        "Jogos condicionados"
-                    ],
-                    "reference_players": ["Estudar jogadores de referência na posição"]
-                })
-        
-        return recommendations
+        # Catálogo pré-compilado: busca indexada e listas compartilhadas
+        training_catalog = (reference or self.reference).training_catalog
+        return [training_catalog.recommendation(area) for area in development_areas]
+
+
+_classifier: Optional[AthleteClassifier] = None
+_classifier_lock = threading.Lock()
+
+def get_classifier() -> AthleteClassifier:
+    """
+    Classificador compartilhado por todo o processo (dependência das rotas)
+
+    Criado no primeiro uso; uma única cópia dos dados compilados, trocada
+    atomicamente quando a tabela de lendas é alterada (neste processo, de
+    imediato; em outros, na verificação periódica de LEGEND_REFRESH_SECONDS)
+    """
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                classifier = AthleteClassifier()
+                on_legends_changed(classifier.refresh_legends)
+                _classifier = classifier
+    LEGEND_STORE.refresh_due()
+    _classifier.sync_legends()
+    return _classifier
 
+def loaded_classifier() -> Optional[AthleteClassifier]:
+    """
+    Classificador compartilhado, se já criado; não acessa o banco (usado pelo /health)
+    """
+    return _classifier
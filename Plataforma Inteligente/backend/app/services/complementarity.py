@@ -0,0 +1,43 @@
+"""
+Complementaridade entre atletas calculada de forma vetorizada
+Compara um atleta com uma matriz de candidatos (candidatos x habilidades) de uma só vez
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Pesos por faixa de diferença entre as habilidades, em décimos
+# (inteiros tornam a soma exata e independente da ordem das habilidades)
+IDEAL_DIFF_MIN = 2
+IDEAL_DIFF_MAX = 4
+IDEAL_WEIGHT = 10        # Diferença moderada: se complementam
+SIMILAR_WEIGHT = 5       # Muito similares
+DISTANT_WEIGHT = 2       # Muito diferentes
+WEIGHT_SCALE = 10
+
+
+def complementarity_scores(
+    target_values: np.ndarray,
+    target_mask: np.ndarray,
+    values: np.ndarray,
+    mask: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score de complementaridade (0-1) de cada candidato em relação ao atleta alvo
+
+    Retorna (scores, válidos); candidatos sem habilidades em comum não são válidos
+    """
+    common = mask & target_mask
+    diff = np.abs(values - target_values)
+    weights = np.where(
+        diff < IDEAL_DIFF_MIN,
+        SIMILAR_WEIGHT,
+        np.where(diff <= IDEAL_DIFF_MAX, IDEAL_WEIGHT, DISTANT_WEIGHT)
+    )
+    counts = common.sum(axis=1)
+    totals = np.where(common, weights, 0).sum(axis=1)
+    valid = counts > 0
+    scores = np.divide(
+        totals, counts * WEIGHT_SCALE, out=np.zeros(len(counts)), where=valid
+    )
+    return scores, valid
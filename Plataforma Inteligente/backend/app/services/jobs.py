@@ -0,0 +1,366 @@
+"""
+Fila de tarefas em segundo plano (reclassificações e relatórios pesados)
+Executa funções em um pool de processos, com faixas de prioridade e fila persistente opcional
+"""
+
+import heapq
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from app.services.classification_cache import stable_hash
+
+# Faixas de prioridade (menor = mais prioritária)
+JOB_LANES = {"interactive": 0, "default": 1, "bulk": 2}
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", str(min(4, os.cpu_count() or 1))))
+JOB_EXECUTOR = os.getenv("JOB_EXECUTOR", "process")  # process ou thread
+JOB_START_METHOD = os.getenv("JOB_START_METHOD", "spawn")
+JOB_QUEUE_DB = os.getenv("JOB_QUEUE_DB")  # Arquivo SQLite da fila persistente (opcional)
+JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", "1000"))  # Tarefas concluídas mantidas em memória
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def function_name(function: Callable) -> str:
+    return f"{function.__module__}:{function.__qualname__}"
+
+
+def _resolve(name: str) -> Callable:
+    module, qualname = name.split(":")
+    target = importlib.import_module(module)
+    for attribute in qualname.split("."):
+        target = getattr(target, attribute)
+    return target
+
+
+def _init_worker() -> None:
+    # Processos criados por fork não podem reutilizar as conexões do processo pai
+    from app.database import engine
+    engine.dispose(close=False)
+
+
+def _run_job(name: str, kwargs: Dict):
+    # Executado no processo do pool: resolve a função pelo nome (importável após reinício)
+    return _resolve(name)(**kwargs)
+
+
+class Job:
+    def __init__(self, job_id: str, name: str, kwargs: Dict, lane: str, dedup_key: str,
+                 created_at: Optional[float] = None):
+        self.id = job_id
+        self.name = name
+        self.kwargs = kwargs
+        self.lane = lane
+        self.dedup_key = dedup_key
+        self.status = QUEUED
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = created_at or time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def info(self) -> Dict:
+        return {
+            "id": self.id,
+            "function": self.name,
+            "lane": self.lane,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobStore:
+    """
+    Persistência das tarefas em SQLite: tarefas pendentes sobrevivem a reinícios
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, name TEXT NOT NULL, kwargs TEXT NOT NULL, lane TEXT NOT NULL, "
+            "dedup_key TEXT NOT NULL, status TEXT NOT NULL, result TEXT, error TEXT, "
+            "created_at REAL, started_at REAL, finished_at REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status)")
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.name, json.dumps(job.kwargs), job.lane, job.dedup_key, job.status,
+                    json.dumps(job.result) if job.status == DONE else None, job.error,
+                    job.created_at, job.started_at, job.finished_at
+                )
+            )
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def pending(self) -> List[Job]:
+        """
+        Tarefas não concluídas (as que estavam em execução voltam para a fila)
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        jobs = [self._job(row) for row in rows]
+        for job in jobs:
+            job.status, job.started_at = QUEUED, None
+        return jobs
+
+    @staticmethod
+    def _job(row) -> Job:
+        job = Job(row[0], row[1], json.loads(row[2]), row[3], row[4], created_at=row[8])
+        job.status = row[5]
+        job.result = json.loads(row[6]) if row[6] is not None else None
+        job.error, job.started_at, job.finished_at = row[7], row[9], row[10]
+        return job
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class JobQueue:
+    """
+    Fila com prioridade por faixa; tarefas idênticas ainda na fila são deduplicadas
+
+    A faixa "bulk" nunca ocupa todos os workers, de modo que tarefas interativas
+    não esperam o fim de recálculos em massa. O pool e o despachante só são
+    criados na primeira submissão
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        executor: str = JOB_EXECUTOR,
+        persist_path: Optional[str] = JOB_QUEUE_DB,
+        history_size: int = JOB_HISTORY_SIZE
+    ):
+        self.workers = max(1, workers)
+        self.executor_kind = executor
+        self.persist_path = persist_path
+        self.history_size = history_size
+        self._condition = threading.Condition()
+        self._heap: List = []
+        self._sequence = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queued_by_key: Dict[str, str] = {}
+        self._running = {lane: 0 for lane in JOB_LANES}
+        self._executor: Optional[Executor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._store: Optional[JobStore] = None
+        self._stopped = False
+        self.deduplicated = 0
+
+    def submit(self, function: Callable, lane: str = "default", **kwargs) -> Job:
+        """
+        Enfileira function(**kwargs); kwargs e resultado devem ser serializáveis em JSON
+
+        Se uma tarefa idêntica (mesma função e argumentos) ainda estiver na fila,
+        retorna a tarefa existente
+        """
+        if lane not in JOB_LANES:
+            raise ValueError(f"Faixa inválida: {lane}. Use: {', '.join(JOB_LANES)}")
+        name = function_name(function)
+        dedup_key = stable_hash([name, kwargs])
+        with self._condition:
+            self._start()
+            existing = self._queued_by_key.get(dedup_key)
+            if existing is not None:
+                self.deduplicated += 1
+                job = self._jobs[existing]
+                # Uma submissão mais urgente promove a tarefa que já está na fila
+                if JOB_LANES[lane] < JOB_LANES[job.lane]:
+                    job.lane = lane
+                    self._push(job)
+                return job
+            job = Job(uuid.uuid4().hex, name, kwargs, lane, dedup_key)
+            self._enqueue(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None and self.persist_path:
+                self._start()
+                job = self._store.load(job_id)
+        return job
+
+    def stats(self) -> Dict:
+        with self._condition:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {
+                "started": self._executor is not None,
+                "workers": self.workers,
+                "executor": self.executor_kind,
+                "persistent": bool(self.persist_path),
+                "jobs": counts,
+                "running_by_lane": dict(self._running),
+                "deduplicated": self.deduplicated
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            executor, dispatcher, store = self._executor, self._dispatcher, self._store
+        if dispatcher is not None:
+            dispatcher.join()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        if store is not None:
+            store.close()
+
+    def _start(self) -> None:
+        # Chamado com o lock adquirido
+        if self._executor is not None or self._stopped:
+            return
+        self._executor = self._create_executor()
+        if self.persist_path:
+            self._store = JobStore(self.persist_path)
+            for job in self._store.pending():
+                self._enqueue(job)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def _create_executor(self) -> Executor:
+        if self.executor_kind == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(JOB_START_METHOD),
+            initializer=_init_worker
+        )
+
+    def _replace_broken_executor(self, executor: Executor) -> None:
+        # Chamado com o lock adquirido. Um worker que morre (falta de memória, crash em
+        # extensão nativa) quebra o pool inteiro: sem um pool novo, toda submissão seguinte falharia
+        if executor is not self._executor or self._stopped:
+            return  # Já substituído por outra tarefa afetada, ou fila encerrada
+        self._executor = self._create_executor()
+        executor.shutdown(wait=False)
+
+    def _enqueue(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        self._queued_by_key[job.dedup_key] = job.id
+        self._push(job)
+        self._save(job)
+        self._trim_history()
+
+    def _push(self, job: Job) -> None:
+        # Entradas de uma tarefa promovida ficam obsoletas e são ignoradas ao sair da fila
+        heapq.heappush(self._heap, (JOB_LANES[job.lane], next(self._sequence), job.id, job.lane))
+        self._condition.notify_all()
+
+    def _lane_limit(self, lane: str) -> int:
+        if lane == "bulk" and self.workers > 1:
+            return self.workers - 1
+        return self.workers
+
+    def _next_job(self) -> Optional[Job]:
+        # Primeira tarefa (por prioridade) cuja faixa ainda tem worker livre
+        if sum(self._running.values()) >= self.workers:
+            return None
+        skipped = []
+        job = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            candidate = self._jobs.get(entry[2])
+            if candidate is None or candidate.status != QUEUED or candidate.lane != entry[3]:
+                continue
+            if self._running[candidate.lane] >= self._lane_limit(candidate.lane):
+                skipped.append(entry)
+                continue
+            job = candidate
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return job
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._condition:
+                job = None
+                while not self._stopped:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                self._queued_by_key.pop(job.dedup_key, None)
+                job.status, job.started_at = RUNNING, time.time()
+                self._running[job.lane] += 1
+                self._save(job)
+                executor = self._executor
+                try:
+                    future = executor.submit(_run_job, job.name, job.kwargs)
+                except Exception as e:
+                    # Pool quebrado (ou já encerrado): a tarefa falha sem ocupar o worker
+                    self._complete(job, error=e)
+                    if isinstance(e, BrokenExecutor):
+                        self._replace_broken_executor(executor)
+                    continue
+            future.add_done_callback(lambda future, job=job: self._finish(job, executor, future))
+
+    def _finish(self, job: Job, executor: Executor, future) -> None:
+        with self._condition:
+            try:
+                result = future.result()
+            except Exception as e:
+                self._complete(job, error=e)
+                if isinstance(e, BrokenExecutor):
+                    self._replace_broken_executor(executor)
+            else:
+                self._complete(job, result=result)
+
+    def _complete(self, job: Job, result=None, error: Optional[BaseException] = None) -> None:
+        # Chamado com o lock adquirido; libera o worker da faixa da tarefa
+        if error is None:
+            job.result, job.status = result, DONE
+        else:
+            job.error, job.status = "".join(traceback.format_exception_only(type(error), error)).strip(), FAILED
+        job.finished_at = time.time()
+        self._running[job.lane] -= 1
+        self._save(job)
+        self._trim_history()
+        self._condition.notify_all()
+
+    def _save(self, job: Job) -> None:
+        if self._store is not None:
+            self._store.save(job)
+
+    def _trim_history(self) -> None:
+        # Descarta da memória as tarefas concluídas mais antigas (continuam no SQLite, se houver)
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.status in (DONE, FAILED)
+        ]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
+
+
+# Fila compartilhada por todo o processo
+JOB_QUEUE = JobQueue()
@@ -0,0 +1,46 @@
+"""
+Notificação de alterações na tabela de jogadores históricos (Legend)
+Serviços que mantêm estruturas derivadas das lendas se registram aqui para reconstruí-las
+"""
+
+from typing import Callable, List
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.legend import Legend
+
+_listeners: List[Callable[[], None]] = []
+
+
+def on_legends_changed(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Registra uma função chamada após cada commit que altere lendas
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def notify_legends_changed() -> None:
+    """
+    Dispara manualmente os ouvintes (ex.: após atualizações em massa via SQL)
+    """
+    for callback in list(_listeners):
+        callback()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_legend_changes(session, flush_context):
+    # Durante after_flush as coleções new/dirty/deleted ainda refletem o flush
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, Legend) for obj in changed):
+        session.info["legends_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session):
+    if session.info.pop("legends_changed", False):
+        notify_legends_changed()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("legends_changed", None)
@@ -0,0 +1,225 @@
+"""
+Índices de busca de lendas similares
+Reduzem o conjunto de lendas avaliadas em find_closest_legends para catálogos grandes
+
+- brute: avalia todas as lendas (exato, padrão)
+- kdtree: KD-tree sobre o espaço de habilidades (requer scipy)
+- ivf: índice invertido com k-means em NumPy puro (aproximado, ajustável via n_probe)
+
+Os índices apenas selecionam candidatos; a similaridade final (com máscaras e
+bônus de posição/altura) é sempre recalculada de forma exata sobre eles.
+"""
+
+import os
+import warnings
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from app.services.legend_matrix import LegendMatrix
+from app.services.skill_vectors import skills_to_vector
+
+# Tipo de índice e parâmetros padrão (configuráveis por variável de ambiente)
+LEGEND_INDEX = os.getenv("LEGEND_INDEX", "brute")
+LEGEND_INDEX_NPROBE = int(os.getenv("LEGEND_INDEX_NPROBE", "16"))
+
+# Candidatos buscados por resultado pedido, compensando os bônus de
+# posição/altura que a busca por distância não enxerga
+OVERSAMPLE = 10
+
+# Aviso de scipy ausente emitido uma única vez por processo
+_kdtree_fallback_warned = False
+
+
+def _kdtree_class():
+    # Import tardio: scipy é opcional e pesado, só carregado se o índice kdtree for usado
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree
+
+
+class BruteForceIndex:
+    name = "brute"
+
+    def __init__(self, matrix: LegendMatrix):
+        self.matrix = matrix
+
+    def candidates(self, athlete_data: Dict, k: Optional[int]) -> Optional[np.ndarray]:
+        """
+        Linhas da matriz a avaliar (ordenadas) ou None para todas
+        """
+        return None
+
+
+class _EmbeddedIndex(BruteForceIndex, ABC):
+    """
+    Base dos índices aproximados: habilidades ausentes são preenchidas com a
+    média da coluna para que todas as lendas fiquem no mesmo espaço denso.
+
+    O bônus de posição domina o ranking, então além da estrutura global há uma
+    por posição; a busca une os candidatos das duas
+    """
+
+    def __init__(self, matrix: LegendMatrix):
+        super().__init__(matrix)
+        counts = matrix.mask.sum(axis=0)
+        self.fill = np.where(
+            counts > 0, matrix.values.sum(axis=0) / np.maximum(counts, 1), 5.0
+        )
+        self.points = np.where(matrix.mask, matrix.values, self.fill).astype(np.float32)
+
+        self.partitions = {None: np.arange(len(self.points))}
+        for position in set(matrix.positions):
+            if position is not None:
+                self.partitions[position] = np.flatnonzero(matrix.positions == position)
+        self.structures = {
+            key: self._build(self.points[rows]) for key, rows in self.partitions.items()
+        }
+
+    def embed(self, athlete_data: Dict) -> np.ndarray:
+        values, mask = skills_to_vector(
+            athlete_data.get("technical_skills", {}), self.matrix.skill_index
+        )
+        return np.where(mask, values, self.fill).astype(np.float32)
+
+    @abstractmethod
+    def _build(self, points: np.ndarray):
+        """
+        Estrutura de busca sobre os pontos de uma partição
+        """
+
+    @abstractmethod
+    def _search(self, structure, query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        """
+        Linhas locais da partição mais próximas da consulta, ou None para todas
+        """
+
+    def candidates(self, athlete_data: Dict, k: Optional[int]) -> Optional[np.ndarray]:
+        if k is None:
+            return None
+        query = self.embed(athlete_data)
+        position = athlete_data.get("primary_position")
+        keys = [None] + ([position] if position is not None and position in self.structures else [])
+        found = []
+        for key in keys:
+            local = self._search(self.structures[key], query, k)
+            if local is None:
+                if key is None:
+                    return None
+                found.append(self.partitions[key])
+            else:
+                found.append(self.partitions[key][local])
+        return np.unique(np.concatenate(found))
+
+
+class KDTreeIndex(_EmbeddedIndex):
+    name = "kdtree"
+
+    def __init__(self, matrix: LegendMatrix, oversample: int = OVERSAMPLE):
+        self.oversample = oversample
+        super().__init__(matrix)
+
+    def _build(self, points: np.ndarray):
+        return _kdtree_class()(points)
+
+    def _search(self, tree, query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        n_candidates = k * self.oversample
+        if n_candidates >= tree.n:
+            return None
+        _, rows = tree.query(query, k=n_candidates)
+        return np.atleast_1d(rows)
+
+
+class _InvertedLists:
+    """
+    Clusters k-means de uma partição: centróides e linhas de cada cluster
+    """
+
+    def __init__(self, points: np.ndarray, n_lists: int, iterations: int, rng: np.random.Generator):
+        self.n_lists = max(1, min(len(points), n_lists))
+        self.centroids = self._kmeans(points, iterations, rng)
+        assignment = self._assign(points)
+        self.lists = [np.flatnonzero(assignment == c) for c in range(self.n_lists)]
+
+    def _assign(self, points: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        # Cluster mais próximo de cada ponto, em blocos para limitar memória
+        centroid_norms = (self.centroids ** 2).sum(axis=1)
+        assignment = np.empty(len(points), dtype=np.int64)
+        for start in range(0, len(points), chunk_size):
+            chunk = points[start:start + chunk_size]
+            distances = centroid_norms - 2 * (chunk @ self.centroids.T)
+            assignment[start:start + chunk_size] = distances.argmin(axis=1)
+        return assignment
+
+    def _kmeans(self, points: np.ndarray, iterations: int, rng: np.random.Generator) -> np.ndarray:
+        if len(points) == 0:
+            return np.zeros((1, points.shape[1]), dtype=np.float32)
+        self.centroids = points[rng.choice(len(points), self.n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = self._assign(points)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignment, points)
+            counts = np.bincount(assignment, minlength=self.n_lists)[:, None]
+            # Clusters vazios mantêm o centróide anterior
+            self.centroids = np.where(counts > 0, sums / np.maximum(counts, 1), self.centroids)
+        return self.centroids
+
+
+class IVFIndex(_EmbeddedIndex):
+    """
+    Agrupa as lendas em clusters (k-means, ~raiz do tamanho da partição); cada
+    busca avalia apenas os n_probe clusters mais próximos. Mais clusters
+    sondados = mais recall e mais latência
+    """
+    name = "ivf"
+
+    def __init__(
+        self,
+        matrix: LegendMatrix,
+        n_probe: int = LEGEND_INDEX_NPROBE,
+        iterations: int = 10,
+        seed: int = 0
+    ):
+        self.n_probe = n_probe
+        self.iterations = iterations
+        self.rng = np.random.default_rng(seed)
+        super().__init__(matrix)
+
+    def _build(self, points: np.ndarray):
+        return _InvertedLists(points, int(np.sqrt(len(points))), self.iterations, self.rng)
+
+    def _search(self, ivf: _InvertedLists, query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        if self.n_probe >= ivf.n_lists:
+            return None
+        distances = ((ivf.centroids - query) ** 2).sum(axis=1)
+        probe = np.argpartition(distances, self.n_probe - 1)[:self.n_probe]
+        rows = np.concatenate([ivf.lists[c] for c in probe])
+        # Clusters sondados pequenos demais: avalia a partição inteira
+        return rows if len(rows) >= k else None
+
+
+INDEX_TYPES = {
+    BruteForceIndex.name: BruteForceIndex,
+    KDTreeIndex.name: KDTreeIndex,
+    IVFIndex.name: IVFIndex,
+}
+
+
+def build_legend_index(matrix: LegendMatrix, kind: Optional[str] = None, **options):
+    """
+    Constrói o índice configurado para a matriz de lendas
+    """
+    global _kdtree_fallback_warned
+    kind = kind or LEGEND_INDEX
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Índice de lendas desconhecido: {kind}")
+    if kind == KDTreeIndex.name and _kdtree_class() is None:
+        if not _kdtree_fallback_warned:
+            _kdtree_fallback_warned = True
+            warnings.warn(
+                "scipy não instalado, usando busca exata (brute) para lendas",
+                RuntimeWarning, stacklevel=2
+            )
+        kind = BruteForceIndex.name
+    return INDEX_TYPES[kind](matrix, **options)
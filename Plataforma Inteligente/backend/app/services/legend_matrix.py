@@ -0,0 +1,129 @@
+"""
+Matriz pré-computada de jogadores históricos
+Permite comparar um atleta com todas as lendas em uma única operação NumPy
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from app.services.skill_vectors import build_skill_order, skills_to_vector, skills_to_matrix
+
+# Bônus multiplicativos aplicados à similaridade
+POSITION_BONUS = 1.2
+HEIGHT_BONUS = 1.1
+HEIGHT_BONUS_TOLERANCE = 10  # cm
+
+# Elementos (atletas x lendas x habilidades) avaliados por bloco no cálculo das distâncias
+DISTANCE_BLOCK_ELEMENTS = 1 << 22
+
+
+class LegendMatrix:
+    def __init__(self, legends: List[Dict]):
+        self.legends = list(legends)
+        profiles = [legend.get("technical_profile") or {} for legend in self.legends]
+
+        # Colunas fixas: habilidades do schema + extras presentes nas lendas
+        self.skill_order = build_skill_order(profiles)
+        self.skill_index = {skill: i for i, skill in enumerate(self.skill_order)}
+
+        # Valores (lendas x habilidades) e máscara de presença
+        self.values, self.mask = skills_to_matrix(profiles, self.skill_index)
+
+        # Atributos usados nos bônus, alinhados às linhas da matriz
+        self.positions = np.array([legend.get("position") for legend in self.legends], dtype=object)
+        self.heights = np.array(
+            [legend.get("height") or np.nan for legend in self.legends], dtype=float
+        )
+
+    def __len__(self) -> int:
+        return len(self.legends)
+
+    def score(
+        self, athlete_data: Dict, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula similaridade e distância do atleta para todas as lendas
+        (ou apenas para as linhas informadas em rows)
+
+        Retorna (similaridade, distância, válido); lendas sem nenhuma
+        habilidade em comum com o atleta ficam marcadas como inválidas
+        """
+        athlete_values, athlete_mask = skills_to_vector(
+            athlete_data.get("technical_skills", {}), self.skill_index
+        )
+        distance, n_common = self.distances(athlete_values[None, :], athlete_mask[None, :], rows)
+        distance, valid = distance[0], n_common[0] > 0
+
+        similarity = 1 / (1 + distance)
+        bonus = self.bonus(athlete_data)
+        similarity *= bonus if rows is None else bonus[rows]
+        return similarity, distance, valid
+
+    def distances(
+        self, athlete_values: np.ndarray, athlete_mask: np.ndarray, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distância euclidiana (atletas x lendas) sobre as habilidades em comum e o
+        número de habilidades em comum de cada par
+
+        Núcleo único das buscas individual e em lote: cada par é calculado a partir
+        da diferença mascarada, com a mesma ordem de soma, de modo que o resultado
+        não depende de quantos atletas são avaliados juntos
+        """
+        values, mask = self.values, self.mask
+        if rows is not None:
+            values, mask = values[rows], mask[rows]
+
+        n_athletes = len(athlete_values)
+        distance = np.empty((n_athletes, len(values)))
+        n_common = np.empty((n_athletes, len(values)), dtype=np.int64)
+        block = max(1, DISTANCE_BLOCK_ELEMENTS // max(1, values.size))
+        for start in range(0, n_athletes, block):
+            stop = start + block
+            common = mask & athlete_mask[start:stop, None, :]
+            diff = np.where(common, values - athlete_values[start:stop, None, :], 0.0)
+            n_common[start:stop] = common.sum(axis=2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                distance[start:stop] = np.sqrt((diff * diff).sum(axis=2)) / n_common[start:stop]
+        return distance, n_common
+
+    def score_many(self, athletes: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula a similaridade (atletas x lendas) de vários atletas de uma vez,
+        com o mesmo resultado de score() para cada atleta
+        """
+        values, mask = skills_to_matrix(
+            [a.get("technical_skills", {}) for a in athletes], self.skill_index
+        )
+        distance, n_common = self.distances(values, mask)
+
+        similarity = 1 / (1 + distance)
+        similarity *= self.bonus_many(athletes)
+        return similarity, n_common > 0
+
+    def bonus_many(self, athletes: List[Dict]) -> np.ndarray:
+        """
+        Multiplicadores de posição e altura (atletas x lendas)
+        """
+        positions = np.array([a.get("primary_position") for a in athletes], dtype=object)
+        heights = np.array([a.get("height") or np.nan for a in athletes], dtype=float)
+        multiplier = np.where(positions[:, None] == self.positions[None, :], POSITION_BONUS, 1.0)
+        multiplier *= np.where(
+            np.abs(heights[:, None] - self.heights[None, :]) < HEIGHT_BONUS_TOLERANCE,
+            HEIGHT_BONUS, 1.0
+        )
+        return multiplier
+
+    def bonus(self, athlete_data: Dict) -> np.ndarray:
+        """
+        Multiplicadores de posição e altura para todas as lendas
+        """
+        multiplier = np.where(
+            self.positions == athlete_data.get("primary_position"), POSITION_BONUS, 1.0
+        )
+        height = athlete_data.get("height")
+        if height:
+            # Lendas sem altura (NaN) nunca recebem o bônus
+            multiplier = multiplier * np.where(
+                np.abs(self.heights - height) < HEIGHT_BONUS_TOLERANCE, HEIGHT_BONUS, 1.0
+            )
+        return multiplier
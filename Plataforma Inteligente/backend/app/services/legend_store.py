@@ -0,0 +1,152 @@
+"""
+Jogadores históricos carregados da tabela Legend e mantidos em memória
+Snapshot imutável e versionado; recargas leem do banco apenas as linhas alteradas
+"""
+
+import os
+import threading
+import time
+import numpy as np
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.legend import Legend
+from app.services.legend_database import LEGEND_DATABASE
+
+# Intervalo (s) entre verificações de alterações feitas por outros processos; 0 desativa
+LEGEND_REFRESH_SECONDS = float(os.getenv("LEGEND_REFRESH_SECONDS", "60"))
+
+# Campos de cada lenda usados pelo classificador (os mesmos de LEGEND_DATABASE)
+LEGEND_FIELDS = (
+    "name", "nationality", "position", "height", "weight", "body_type", "dominant_foot",
+    "technical_profile", "distinctive_traits", "playing_style", "era"
+)
+
+
+def legend_dict(legend: Legend) -> Dict:
+    return {field: getattr(legend, field) for field in LEGEND_FIELDS}
+
+
+class LegendSnapshot(NamedTuple):
+    """
+    Lendas em ordem de id; ids[i] e stamps[i] correspondem a legends[i]
+    """
+    ids: np.ndarray
+    legends: Tuple[Dict, ...]
+    stamps: Tuple[Optional[datetime], ...]
+    version: int
+    source: str  # "database" ou "builtin" (tabela vazia)
+
+
+class LegendStore:
+    """
+    Carregado no primeiro uso; cada alteração publica um snapshot novo com a
+    versão incrementada, de modo que leitores nunca veem uma lista parcial
+    """
+
+    def __init__(self, refresh_seconds: float = LEGEND_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[LegendSnapshot] = None
+        self._version = 0
+        self._checked_at = 0.0
+
+    @property
+    def snapshot(self) -> Optional[LegendSnapshot]:
+        return self._snapshot
+
+    def read(self, db: Optional[Session] = None) -> LegendSnapshot:
+        """
+        Snapshot atual, carregando do banco na primeira leitura
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh(db)
+            snapshot = self._snapshot
+        return snapshot
+
+    def refresh(self, db: Optional[Session] = None) -> bool:
+        """
+        Aplica as alterações da tabela desde a última leitura; retorna True se houve alguma
+
+        Compara (id, updated_at) de todas as linhas e busca por completo apenas as
+        novas ou alteradas; ids ausentes são removidos
+        """
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                return self._refresh(db)
+        finally:
+            if own_session:
+                db.close()
+
+    def refresh_due(self) -> bool:
+        """
+        Verifica alterações se o intervalo configurado já passou (sem esperar por outra verificação)
+        """
+        if not self.refresh_seconds or self._snapshot is None:
+            return False
+        if time.monotonic() - self._checked_at < self.refresh_seconds or self._lock.locked():
+            return False
+        return self.refresh()
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "legends": len(snapshot.legends),
+            "version": snapshot.version,
+            "source": snapshot.source
+        }
+
+    def _refresh(self, db: Session) -> bool:
+        snapshot = self._snapshot
+        stamps = dict(db.query(Legend.id, Legend.updated_at).order_by(Legend.id).all())
+        if not stamps:
+            # Tabela vazia (dados de referência ainda não inseridos): usa a lista embutida
+            if snapshot is not None and snapshot.source == "builtin":
+                return False
+            self._publish([], [dict(legend) for legend in LEGEND_DATABASE], [], "builtin")
+            return True
+
+        current: Dict[int, Tuple[Dict, Optional[datetime]]] = {}
+        if snapshot is not None and snapshot.source == "database":
+            current = {
+                legend_id: (legend, stamp)
+                for legend_id, legend, stamp in zip(snapshot.ids.tolist(), snapshot.legends, snapshot.stamps)
+            }
+        changed = [
+            legend_id for legend_id, stamp in stamps.items()
+            if legend_id not in current or current[legend_id][1] != stamp
+        ]
+        if not changed and len(current) == len(stamps):
+            return False
+
+        if changed:
+            for legend in db.query(Legend).filter(Legend.id.in_(changed)).all():
+                current[legend.id] = (legend_dict(legend), legend.updated_at)
+        ids = [legend_id for legend_id in stamps if legend_id in current]
+        self._publish(
+            ids, [current[legend_id][0] for legend_id in ids],
+            [current[legend_id][1] for legend_id in ids], "database"
+        )
+        return True
+
+    def _publish(self, ids, legends, stamps, source: str) -> None:
+        self._version += 1
+        self._snapshot = LegendSnapshot(
+            ids=np.array(ids, dtype=np.int64),
+            legends=tuple(legends),
+            stamps=tuple(stamps),
+            version=self._version,
+            source=source
+        )
+
+
+# Lendas compartilhadas por todo o processo
+LEGEND_STORE = LegendStore()
@@ -0,0 +1,166 @@
+"""
+Otimização de escalações: distribui um elenco nas vagas de uma formação
+Maximiza a soma das adequações por posição (algoritmo húngaro) e lista alternativas (Murty)
+"""
+
+import heapq
+import numpy as np
+from typing import Dict, FrozenSet, List, NamedTuple, Sequence, Tuple, Union
+
+# Vagas por posição das formações mais comuns
+FORMATIONS: Dict[str, Dict[str, int]] = {
+    "4-3-3": {"Goleiro": 1, "Zagueiro": 2, "Lateral": 2, "Volante": 1, "Meia": 2, "Atacante": 3},
+    "4-4-2": {"Goleiro": 1, "Zagueiro": 2, "Lateral": 2, "Volante": 2, "Meia": 2, "Atacante": 2},
+    "4-2-3-1": {"Goleiro": 1, "Zagueiro": 2, "Lateral": 2, "Volante": 2, "Meia": 3, "Atacante": 1},
+    "3-5-2": {"Goleiro": 1, "Zagueiro": 3, "Lateral": 2, "Volante": 2, "Meia": 1, "Atacante": 2},
+    "5-3-2": {"Goleiro": 1, "Zagueiro": 3, "Lateral": 2, "Volante": 1, "Meia": 2, "Atacante": 2}
+}
+
+MAX_ALTERNATIVES = 10
+
+# Custo de pares proibidos (finito para não gerar NaN nos potenciais)
+FORBIDDEN_COST = 1e9
+
+
+class Lineup(NamedTuple):
+    total: float
+    assignment: Tuple[Tuple[int, int], ...]  # (índice do atleta, índice da posição)
+
+
+def formation_slots(formation: Union[str, Dict[str, int]], positions: Sequence[str]) -> Dict[str, int]:
+    """
+    Vagas por posição de uma formação nomeada ou explícita; ValueError se inválida
+    """
+    if isinstance(formation, str):
+        if formation not in FORMATIONS:
+            raise ValueError(f"Formação desconhecida: {formation}. Disponíveis: {', '.join(FORMATIONS)}")
+        formation = FORMATIONS[formation]
+    unknown = [position for position in formation if position not in positions]
+    if unknown:
+        raise ValueError(f"Posições desconhecidas: {', '.join(unknown)}")
+    if any(count < 0 for count in formation.values()):
+        raise ValueError("O número de vagas por posição não pode ser negativo")
+    slots = {position: count for position, count in formation.items() if count > 0}
+    if not slots:
+        raise ValueError("A formação precisa de ao menos uma vaga")
+    return slots
+
+
+def hungarian(cost: np.ndarray) -> np.ndarray:
+    """
+    Atribuição de custo mínimo para uma matriz n x m com n <= m
+    Retorna a coluna atribuída a cada linha (potenciais de Kuhn-Munkres, O(n²m))
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)  # Linha (base 1) dona de cada coluna; 0 = livre
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            free = ~used[1:]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = column
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            used_columns = np.flatnonzero(used)
+            u[owner[used_columns]] += delta
+            v[used_columns] -= delta
+            min_slack[1:][free] -= delta
+
+            column = next_column
+            if owner[column] == 0:
+                break
+
+        # Inverte o caminho aumentante
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    assignment = np.zeros(n, dtype=np.int64)
+    for column in range(1, m + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    return assignment
+
+
+def _solve(
+    suitability: np.ndarray,
+    slot_positions: np.ndarray,
+    forced: Tuple[Tuple[int, int], ...],
+    forbidden: FrozenSet[Tuple[int, int]]
+) -> Union[Lineup, None]:
+    # Vagas e atletas ainda livres depois das escolhas forçadas
+    slots = list(slot_positions)
+    for _, position in forced:
+        slots.remove(position)
+    forced_athletes = {athlete for athlete, _ in forced}
+    athletes = np.array([a for a in range(suitability.shape[0]) if a not in forced_athletes], dtype=np.int64)
+    slots = np.array(slots, dtype=np.int64)
+
+    total = float(sum(suitability[athlete, position] for athlete, position in forced))
+    assignment = list(forced)
+    if len(slots):
+        if len(athletes) < len(slots):
+            return None
+        cost = -suitability[np.ix_(athletes, slots)].T  # vagas x atletas
+        for athlete, position in forbidden:
+            column = np.flatnonzero(athletes == athlete)
+            if len(column):
+                cost[slots == position, column[0]] = FORBIDDEN_COST
+        chosen = hungarian(cost)
+        if (cost[np.arange(len(slots)), chosen] >= FORBIDDEN_COST).any():
+            return None
+        for slot, column in enumerate(chosen):
+            assignment.append((int(athletes[column]), int(slots[slot])))
+            total += float(suitability[athletes[column], slots[slot]])
+    return Lineup(total=total, assignment=tuple(sorted(assignment)))
+
+
+def best_lineups(
+    suitability: np.ndarray,
+    slot_counts: Sequence[int],
+    count: int = 1
+) -> List[Lineup]:
+    """
+    As melhores escalações distintas (pares atleta-posição) em ordem decrescente de adequação
+
+    suitability: atletas x posições; slot_counts: vagas de cada posição (mesma ordem)
+    """
+    slot_positions = np.repeat(np.arange(len(slot_counts)), slot_counts)
+    best = _solve(suitability, slot_positions, (), frozenset())
+    if best is None:
+        return []
+
+    # Murty: cada nó particiona o espaço restante fixando os primeiros pares da
+    # solução e proibindo o seguinte (vagas da mesma posição são equivalentes)
+    results: List[Lineup] = []
+    tie_breaker = 0
+    queue = [(-best.total, tie_breaker, best, (), frozenset())]
+    while queue and len(results) < count:
+        _, _, lineup, forced, forbidden = heapq.heappop(queue)
+        results.append(lineup)
+        if len(results) == count:
+            break
+        free_pairs = [pair for pair in lineup.assignment if pair not in forced]
+        for index, pair in enumerate(free_pairs):
+            child_forced = forced + tuple(free_pairs[:index])
+            child_forbidden = forbidden | {pair}
+            child = _solve(suitability, slot_positions, child_forced, child_forbidden)
+            if child is not None:
+                tie_breaker += 1
+                heapq.heappush(queue, (-child.total, tie_breaker, child, child_forced, child_forbidden))
+    return results
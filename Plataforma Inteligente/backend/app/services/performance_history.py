@@ -0,0 +1,199 @@
+"""
+Consultas paginadas e séries agregadas do histórico de desempenho
+Evita carregar todos os registros de um atleta para gráficos e relatórios
+"""
+
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+from app.models.athlete import SKILL_COLUMNS, PerformanceRecord
+from app.services.classification_cache import ClassificationCache
+
+# Pontos da série de evolução enviada ao dashboard
+MONITORING_HISTORY_POINTS = 60
+
+# Granularidades dos relatórios de evolução e duração (dias) usada na tendência
+PERIOD_DAYS = {"daily": 1.0, "weekly": 7.0, "monthly": 30.44}
+
+# Séries por (atleta, período); também invalidadas a cada novo registro
+EVOLUTION_CACHE = ClassificationCache(
+    maxsize=int(os.getenv("EVOLUTION_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("EVOLUTION_CACHE_TTL", "3600"))
+)
+
+
+def _athlete_records(db: Session, athlete_id: int):
+    return db.query(PerformanceRecord).filter(PerformanceRecord.athlete_id == athlete_id)
+
+
+def count_records(db: Session, athlete_id: int) -> int:
+    return db.query(func.count(PerformanceRecord.id)).filter(
+        PerformanceRecord.athlete_id == athlete_id
+    ).scalar()
+
+
+def history_page(db: Session, athlete_id: int, skip: int, limit: int) -> List[PerformanceRecord]:
+    """
+    Página do histórico, do mais recente para o mais antigo
+    """
+    return _athlete_records(db, athlete_id).order_by(
+        PerformanceRecord.record_date.desc(), PerformanceRecord.id.desc()
+    ).offset(skip).limit(limit).all()
+
+
+def downsampled_history(
+    db: Session, athlete_id: int, max_points: int, total: Optional[int] = None
+) -> Tuple[List[Dict], int]:
+    """
+    Série cronológica com no máximo max_points pontos; retorna (série, total de registros)
+
+    Com mais registros que pontos, agrupa registros consecutivos em blocos de
+    tamanho igual e calcula a média de cada habilidade no próprio banco. As
+    médias usam só as habilidades do schema (colunas skill_*); chaves fora do
+    schema no JSON só aparecem nos registros brutos (history_page)
+    """
+    total = count_records(db, athlete_id) if total is None else total
+    if total <= max_points:
+        rows = db.query(PerformanceRecord.record_date, PerformanceRecord.technical_skills).filter(
+            PerformanceRecord.athlete_id == athlete_id
+        ).order_by(PerformanceRecord.record_date.asc(), PerformanceRecord.id.asc()).all()
+        return [{"date": date.isoformat(), "skills": skills} for date, skills in rows], total
+
+    numbered = db.query(
+        PerformanceRecord.record_date.label("record_date"),
+        *[getattr(PerformanceRecord, column).label(skill) for skill, column in SKILL_COLUMNS.items()],
+        func.row_number().over(
+            order_by=(PerformanceRecord.record_date, PerformanceRecord.id)
+        ).label("position")
+    ).filter(PerformanceRecord.athlete_id == athlete_id).subquery()
+
+    # Divisão inteira: posições 1..total distribuídas em max_points blocos
+    bucket = ((numbered.c.position - 1) * max_points // total).label("bucket")
+    rows = db.query(
+        bucket,
+        func.max(numbered.c.record_date),
+        *[func.avg(numbered.c[skill]) for skill in SKILL_COLUMNS]
+    ).group_by(bucket).order_by(bucket).all()
+
+    series = []
+    for row in rows:
+        series.append({
+            "date": row[1].isoformat(),
+            "skills": {
+                skill: round(value, 2)
+                for skill, value in zip(SKILL_COLUMNS, row[2:])
+                if value is not None
+            }
+        })
+    return series, total
+
+
+def _bucket_start(dialect: str, period: str, column):
+    # Início do período de cada registro (semanas começam na segunda-feira)
+    if dialect == "sqlite":
+        if period == "daily":
+            return func.date(column)
+        if period == "weekly":
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m-01", column)
+    # Unidade literal: o GROUP BY precisa repetir exatamente a mesma expressão
+    unit = {"daily": "day", "weekly": "week", "monthly": "month"}[period]
+    return func.date_trunc(literal_column(f"'{unit}'"), column)
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def bucketed_series(db: Session, athlete_id: int, period: str) -> List[Dict]:
+    """
+    Série por período (diário, semanal ou mensal) com média/mínimo/máximo de cada
+    habilidade, agregada no banco
+    """
+    dialect = db.get_bind().dialect.name
+    bucket = _bucket_start(dialect, period, PerformanceRecord.record_date).label("bucket")
+    columns = [getattr(PerformanceRecord, column) for column in SKILL_COLUMNS.values()]
+    aggregates = []
+    for column in columns:
+        aggregates += [func.avg(column), func.min(column), func.max(column)]
+
+    rows = db.query(bucket, func.count(PerformanceRecord.id), *aggregates).filter(
+        PerformanceRecord.athlete_id == athlete_id
+    ).group_by(bucket).order_by(bucket).all()
+
+    series = []
+    for row in rows:
+        skills = {}
+        for i, skill in enumerate(SKILL_COLUMNS):
+            mean, low, high = row[2 + 3 * i:5 + 3 * i]
+            if mean is not None:
+                skills[skill] = {
+                    "mean": round(float(mean), 2),
+                    "min": round(float(low), 2),
+                    "max": round(float(high), 2)
+                }
+        series.append({"start": _as_date(row[0]).isoformat(), "records": row[1], "skills": skills})
+    return series
+
+
+def trend_slopes(series: List[Dict], period: str) -> Dict[str, float]:
+    """
+    Inclinação da regressão linear das médias de cada habilidade, em pontos por período
+    """
+    if len(series) < 2:
+        return {}
+    skills = list(SKILL_COLUMNS)
+    start = date.fromisoformat(series[0]["start"])
+    x = np.array([(date.fromisoformat(point["start"]) - start).days for point in series], dtype=float)
+    y = np.array([
+        [point["skills"][skill]["mean"] if skill in point["skills"] else np.nan for skill in skills]
+        for point in series
+    ])
+
+    # Mínimos quadrados por coluna, ignorando períodos sem a habilidade
+    valid = ~np.isnan(y)
+    n = valid.sum(axis=0)
+    xs = np.where(valid, x[:, None], 0.0)
+    ys = np.where(valid, y, 0.0)
+    sx, sy = xs.sum(axis=0), ys.sum(axis=0)
+    denominator = n * (xs ** 2).sum(axis=0) - sx ** 2
+    numerator = n * (xs * ys).sum(axis=0) - sx * sy
+    fitted = (n >= 2) & (denominator > 0)
+    slopes = np.divide(numerator, denominator, out=np.zeros(len(skills)), where=fitted)
+    return {
+        skill: round(float(slope) * PERIOD_DAYS[period], 3)
+        for skill, slope, ok in zip(skills, slopes, fitted)
+        if ok
+    }
+
+
+def evolution_series(db: Session, athlete_id: int, period: str, version: Tuple) -> Dict:
+    """
+    Série por período e tendências, em cache por (atleta, período, versão do histórico)
+    """
+    key = (athlete_id, period, version)
+    cached = EVOLUTION_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    series = bucketed_series(db, athlete_id, period)
+    slopes = trend_slopes(series, period)
+    result = {
+        "series": series,
+        "trends": {
+            skill: {
+                "slope": slope,
+                "direction": "up" if slope > 0 else "down" if slope < 0 else "stable"
+            }
+            for skill, slope in slopes.items()
+        }
+    }
+    EVOLUTION_CACHE.put(key, result, athlete_id)
+    return result
@@ -0,0 +1,251 @@
+"""
+Importação em massa de registros de desempenho (NDJSON ou CSV)
+Valida cada linha, grava em lotes com executemany e reporta erros por linha
+"""
+
+import csv
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, NamedTuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import SessionLocal
+from app.models.athlete import SKILL_COLUMNS, Athlete, PerformanceRecord
+from app.schemas.athlete import TechnicalSkills
+from app.services.athlete_store import AthleteEntry, athlete_entry
+from app.services.skill_summary import load_summary, update_summary_bulk
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+MAX_REPORTED_ERRORS = 1000
+
+# Colunas do CSV que não são habilidades nem métricas físicas
+CSV_RESERVED_COLUMNS = ("athlete_id", "record_date")
+
+
+class IngestRow(NamedTuple):
+    line: int
+    athlete_id: int
+    record_date: datetime
+    technical_skills: Dict
+    physical_metrics: Dict
+
+
+def _parse_date(value) -> datetime:
+    if not value:
+        return datetime.utcnow()  # Mesmo relógio (UTC) do server_default do banco
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def record_values(athlete_id: int, record_date: datetime, technical_skills: Dict, physical_metrics: Dict) -> Dict:
+    """
+    Valores de um PerformanceRecord para inserção em lote; as colunas skill_* são
+    preenchidas aqui porque o insert em massa não passa pelos validadores do modelo
+    """
+    return {
+        "athlete_id": athlete_id,
+        "record_date": record_date,
+        "technical_skills": technical_skills,
+        "physical_metrics": physical_metrics,
+        **{
+            column: float(technical_skills[skill]) if skill in technical_skills else None
+            for skill, column in SKILL_COLUMNS.items()
+        }
+    }
+
+
+def _number(value: str):
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Linhas de um corpo recebido em partes (sem carregar o corpo inteiro)
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+def parse_ndjson(line: str) -> Dict:
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("Cada linha deve ser um objeto JSON")
+    return data
+
+
+def parse_csv_header(line: str) -> List[str]:
+    return [column.strip() for column in next(csv.reader([line]))]
+
+
+def parse_csv(header: List[str], line: str) -> Dict:
+    """
+    Linha CSV -> registro: colunas de habilidades viram technical_skills, as demais physical_metrics
+    """
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"Esperadas {len(header)} colunas, encontradas {len(values)}")
+    row = dict(zip(header, values))
+    return {
+        "athlete_id": row.get("athlete_id"),
+        "record_date": row.get("record_date"),
+        "technical_skills": {
+            name: _number(value) for name, value in row.items()
+            if name in TechnicalSkills.model_fields and value != ""
+        },
+        "physical_metrics": {
+            name: _number(value) for name, value in row.items()
+            if name not in TechnicalSkills.model_fields
+            and name not in CSV_RESERVED_COLUMNS and value != ""
+        }
+    }
+
+
+def validate_row(line: int, data: Dict) -> IngestRow:
+    """
+    Valida um registro bruto; ValueError com a mensagem do problema
+    """
+    try:
+        athlete_id = int(data.get("athlete_id"))
+    except (TypeError, ValueError):
+        raise ValueError("athlete_id ausente ou inválido")
+
+    skills = data.get("technical_skills") or {}
+    if not isinstance(skills, dict) or not skills:
+        raise ValueError("technical_skills ausente")
+    unknown = set(skills) - set(TechnicalSkills.model_fields)
+    if unknown:
+        raise ValueError(f"Habilidades desconhecidas: {', '.join(sorted(unknown))}")
+    try:
+        # Apenas as habilidades informadas (sem preencher as demais com o padrão)
+        skills = TechnicalSkills(**skills).dict(exclude_unset=True)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        ))
+
+    metrics = data.get("physical_metrics") or {}
+    if not isinstance(metrics, dict):
+        raise ValueError("physical_metrics deve ser um objeto")
+    try:
+        record_date = _parse_date(data.get("record_date"))
+    except ValueError:
+        raise ValueError(f"record_date inválida: {data.get('record_date')}")
+    return IngestRow(line, athlete_id, record_date, skills, metrics)
+
+
+class PerformanceIngestor:
+    """
+    Acumula linhas válidas e grava um lote por transação
+
+    Cada lote usa uma sessão própria, aberta e fechada na thread que o grava
+    (o endpoint é assíncrono e chama write_batch em threads do pool)
+    """
+
+    def __init__(self, batch_size: int = INGEST_BATCH_SIZE, session_factory: sessionmaker = SessionLocal):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pending: List[IngestRow] = []
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.touched_athletes = set()
+        self.updated_athletes: Dict[int, AthleteEntry] = {}
+
+    def error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def add(self, row: IngestRow) -> bool:
+        """
+        Enfileira uma linha; retorna True quando o lote está cheio
+        """
+        self.pending.append(row)
+        return len(self.pending) >= self.batch_size
+
+    def write_batch(self) -> None:
+        rows, self.pending = self.pending, []
+        if not rows:
+            return
+        with self.session_factory() as db:
+            self._write(db, rows)
+
+    def _write(self, db: Session, rows: List[IngestRow]) -> None:
+        athletes = {
+            athlete.id: athlete
+            for athlete in db.query(Athlete).filter(
+                Athlete.id.in_({row.athlete_id for row in rows})
+            ).all()
+        }
+        valid = []
+        for row in rows:
+            if row.athlete_id in athletes:
+                valid.append(row)
+            else:
+                self.error(row.line, f"Atleta {row.athlete_id} não encontrado")
+        if not valid:
+            return
+
+        try:
+            # Inserção em lote (executemany)
+            db.execute(insert(PerformanceRecord), [
+                record_values(row.athlete_id, row.record_date, row.technical_skills, row.physical_metrics)
+                for row in valid
+            ])
+
+            by_athlete: Dict[int, List[IngestRow]] = defaultdict(list)
+            for row in valid:
+                by_athlete[row.athlete_id].append(row)
+            updated = []
+            for athlete_id, athlete_rows in by_athlete.items():
+                if self._apply_latest(db, athletes[athlete_id], athlete_rows):
+                    # Capturado antes do commit, que expira os atributos carregados
+                    updated.append(athlete_entry(athletes[athlete_id]))
+                update_summary_bulk(
+                    db, athlete_id, [(row.record_date, row.technical_skills) for row in athlete_rows]
+                )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            for row in valid:
+                self.error(row.line, f"Falha ao gravar o lote: {e.__class__.__name__}")
+            return
+
+        self.inserted += len(valid)
+        self.touched_athletes.update(by_athlete)
+        self.updated_athletes.update((entry.id, entry) for entry in updated)
+
+    def _apply_latest(self, db: Session, athlete: Athlete, rows: List[IngestRow]) -> bool:
+        # Uma atualização por atleta e lote, só se o lote trouxer o registro mais recente.
+        # Como em POST /athletes/{id}/performance, o registro mais recente substitui as habilidades
+        latest = max(rows, key=lambda row: row.record_date)
+        last_record_date = load_summary(db, athlete.id).last_record_date
+        if last_record_date is not None and latest.record_date < last_record_date:
+            return False
+        athlete.technical_skills = dict(latest.technical_skills)
+        return True
+
+    def result(self) -> Dict:
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "athletes_updated": len(self.updated_athletes),
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
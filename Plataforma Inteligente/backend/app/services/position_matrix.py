@@ -0,0 +1,135 @@
+"""
+Templates de posição compilados em matrizes
+Permite calcular a adequação de vários atletas a todas as posições de uma vez
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+from app.services.skill_vectors import build_skill_order
+
+# Pesos de cada componente do score de posição
+HEIGHT_WEIGHT = 0.15
+SKILL_WEIGHT = 0.70
+BODY_TYPE_MATCH = 0.15
+BODY_TYPE_MISMATCH = 0.05
+
+# Valor assumido para habilidades não informadas
+DEFAULT_SKILL_VALUE = 5
+
+
+class PositionMatrix:
+    def __init__(self, position_templates: Dict[str, Dict]):
+        self.positions: List[str] = list(position_templates)
+        templates = [position_templates[position] for position in self.positions]
+
+        # Colunas: habilidades do schema + habilidades-chave extras dos templates
+        self.skill_order = build_skill_order(
+            {skill: None for skill in template["key_skills"]} for template in templates
+        )
+        self.skill_index = {skill: i for i, skill in enumerate(self.skill_order)}
+
+        # Indicadores (posições x habilidades) das habilidades-chave; soma e divisão
+        # são elementares, para que o resultado não dependa do tamanho do lote
+        # (empates entre posições continuam empates)
+        self.key_skills = np.zeros((len(self.positions), len(self.skill_order)))
+        for row, template in enumerate(templates):
+            for skill in template["key_skills"]:
+                self.key_skills[row, self.skill_index[skill]] += 1.0
+        self.key_skill_counts = self.key_skills.sum(axis=1)
+        self.has_key_skills = self.key_skill_counts > 0
+
+        # Faixas de altura ideal por posição
+        self.height_min = np.array([t["ideal_height"][0] for t in templates], dtype=float)
+        self.height_max = np.array([t["ideal_height"][1] for t in templates], dtype=float)
+
+        # Biotipos: tabela (biotipos x posições) com a contribuição de cada um;
+        # duas linhas finais para biotipo fora dos preferidos e biotipo não informado
+        body_types = sorted({bt for t in templates for bt in t["preferred_body_types"]})
+        self.body_type_index = {body_type: i for i, body_type in enumerate(body_types)}
+        self.unknown_body_type = len(body_types)
+        self.missing_body_type = len(body_types) + 1
+        self.body_type_scores = np.array(
+            [
+                [BODY_TYPE_MATCH if bt in t["preferred_body_types"] else BODY_TYPE_MISMATCH
+                 for t in templates]
+                for bt in body_types
+            ]
+            + [[BODY_TYPE_MISMATCH] * len(templates), [0.0] * len(templates)]
+        )
+
+    def skill_matrix(self, athletes: List[Dict]) -> np.ndarray:
+        """
+        Matriz (atletas x habilidades) com valor padrão para habilidades ausentes
+        """
+        values = np.full((len(athletes), len(self.skill_order)), float(DEFAULT_SKILL_VALUE))
+        for row, athlete_data in enumerate(athletes):
+            for skill, value in athlete_data.get("technical_skills", {}).items():
+                column = self.skill_index.get(skill)
+                if column is not None:
+                    values[row, column] = value
+        return values
+
+    def body_type_rows(self, athletes: List[Dict]) -> np.ndarray:
+        """
+        Linha de body_type_scores correspondente a cada atleta
+        """
+        return np.array(
+            [
+                self.body_type_index.get(a["body_type"], self.unknown_body_type)
+                if a.get("body_type") else self.missing_body_type
+                for a in athletes
+            ],
+            dtype=np.intp
+        )
+
+    def components(self, athletes: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Componentes do score (atletas x posições): altura (NaN se não informada),
+        média das habilidades-chave e contribuição do biotipo
+        """
+        # 1. Altura: penalidade linear fora da faixa ideal, mínimo de 0.3
+        heights = np.array([a.get("height") or np.nan for a in athletes], dtype=float)[:, None]
+        below = np.maximum(0.3, 1 - (self.height_min - heights) / 20)
+        above = np.maximum(0.3, 1 - (heights - self.height_max) / 20)
+        height_scores = np.where(
+            heights < self.height_min, below, np.where(heights > self.height_max, above, 1.0)
+        )
+        height_scores[np.isnan(heights[:, 0])] = np.nan
+
+        # 2. Habilidades-chave: soma elementar por atleta e posição (sem BLAS, cuja ordem
+        # de soma varia com o tamanho do lote), para o mesmo resultado individual e em lote
+        skill_sums = (self.skill_matrix(athletes)[:, None, :] * self.key_skills).sum(axis=2)
+        skill_scores = skill_sums / 10.0 / np.maximum(self.key_skill_counts, 1)
+
+        # 3. Biotipo: consulta direta na tabela pré-computada
+        body_scores = self.body_type_scores[self.body_type_rows(athletes)]
+
+        return height_scores, skill_scores, body_scores
+
+    def score_many(self, athletes: List[Dict]) -> np.ndarray:
+        """
+        Adequação (atletas x posições) calculada para todos os atletas de uma vez
+        """
+        height_scores, skill_scores, body_scores = self.components(athletes)
+        scores = np.where(np.isnan(height_scores), 0.0, height_scores * HEIGHT_WEIGHT)
+        scores += np.where(self.has_key_skills, skill_scores * SKILL_WEIGHT, 0.0)
+        scores += body_scores
+        return np.minimum(1.0, scores)
+
+    def explain(self, athlete_data: Dict) -> Dict[str, List[str]]:
+        """
+        Fatores que compõem o score de cada posição (gerados apenas sob demanda)
+        """
+        height_scores, skill_scores, body_scores = self.components([athlete_data])
+        explanations = {}
+        for col, position in enumerate(self.positions):
+            factors = []
+            if not np.isnan(height_scores[0, col]):
+                factors.append(f"Altura: {height_scores[0, col]:.2f}")
+            if self.has_key_skills[col]:
+                factors.append(f"Habilidades-chave: {skill_scores[0, col]:.2f}")
+            if athlete_data.get("body_type"):
+                body_fit = 1.0 if body_scores[0, col] == BODY_TYPE_MATCH else 0.33
+                factors.append(f"Biotipo: {body_fit}")
+            explanations[position] = factors
+        return explanations
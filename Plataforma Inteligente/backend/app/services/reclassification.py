@@ -0,0 +1,86 @@
+"""
+Reclassificação em massa dos atletas cadastrados (ex.: após mudanças nas lendas)
+Roda na fila de tarefas; só reclassifica atletas cuja impressão digital mudou
+"""
+
+import os
+from typing import Dict, List, Optional
+from sqlalchemy import update
+from app.database import SessionLocal
+from app.models.athlete import Athlete
+from app.services.classifier import get_classifier
+from app.services.jobs import JOB_QUEUE, Job
+
+RECLASSIFY_BATCH_SIZE = int(os.getenv("RECLASSIFY_BATCH_SIZE", "500"))
+
+
+def _athlete_data(athlete: Athlete) -> Dict:
+    return {
+        "name": athlete.name,
+        "age": athlete.age,
+        "height": athlete.height,
+        "weight": athlete.weight,
+        "body_type": athlete.body_type,
+        "dominant_foot": athlete.dominant_foot,
+        "primary_position": athlete.primary_position,
+        "technical_skills": athlete.technical_skills or {},
+        "deficiencies": athlete.deficiencies or []
+    }
+
+
+def reclassify_athletes(
+    athlete_ids: Optional[List[int]] = None, batch_size: int = RECLASSIFY_BATCH_SIZE
+) -> Dict:
+    """
+    Reclassifica (em lotes vetorizados) os atletas com classificação desatualizada
+    """
+    # Processo do pool: garante as lendas mais recentes antes de comparar as impressões digitais
+    classifier = get_classifier()
+    classifier.refresh_legends()
+    db = SessionLocal()
+    checked = reclassified = 0
+    last_id = 0
+    try:
+        while True:
+            # Paginação por id: cada lote é uma consulta barata, sem offset
+            query = db.query(Athlete).filter(Athlete.id > last_id)
+            if athlete_ids is not None:
+                query = query.filter(Athlete.id.in_(athlete_ids))
+            athletes = query.order_by(Athlete.id).limit(batch_size).all()
+            if not athletes:
+                break
+            last_id = athletes[-1].id
+            checked += len(athletes)
+
+            # Impressões digitais e classificações do lote sobre a mesma versão dos dados
+            reference = classifier.reference
+            stale = []
+            for athlete in athletes:
+                athlete_data = _athlete_data(athlete)
+                fingerprint = classifier.classification_key(athlete_data, reference)
+                if athlete.classification_fingerprint != fingerprint or not athlete.classification_data:
+                    stale.append((athlete.id, athlete_data, fingerprint))
+            if stale:
+                classifications = classifier.iter_classify_many(
+                    [data for _, data, _ in stale], reference=reference
+                )
+                db.execute(update(Athlete), [
+                    {"id": athlete_id, "classification_data": classification,
+                     "classification_fingerprint": fingerprint}
+                    for (athlete_id, _, fingerprint), classification in zip(stale, classifications)
+                ])
+                reclassified += len(stale)
+            db.commit()
+            db.expunge_all()
+    finally:
+        db.close()
+    return {"checked": checked, "reclassified": reclassified}
+
+
+def submit_reclassification(athlete_ids: Optional[List[int]] = None) -> Job:
+    """
+    Agenda a reclassificação na faixa "bulk" (pedidos idênticos pendentes são unificados)
+    """
+    if athlete_ids is not None:
+        athlete_ids = sorted(set(athlete_ids))
+    return JOB_QUEUE.submit(reclassify_athletes, lane="bulk", athlete_ids=athlete_ids)
@@ -0,0 +1,49 @@
+"""
+Consultas sobre as colunas numéricas de habilidades técnicas
+Carrega matrizes de habilidades direto das colunas skill_*, sem desserializar JSON
+"""
+
+import numpy as np
+from typing import Tuple
+from sqlalchemy.orm import Session
+from app.models.athlete import SKILL_COLUMNS
+from app.services.skill_vectors import skills_to_vector
+
+# Índice das colunas na matriz (mesma ordem de SKILL_ORDER)
+SKILL_COLUMN_INDEX = {skill: i for i, skill in enumerate(SKILL_COLUMNS)}
+
+
+def skill_column(model, skill: str):
+    """
+    Coluna SQL de uma habilidade (None se a habilidade não tiver coluna própria)
+    """
+    column = SKILL_COLUMNS.get(skill)
+    return getattr(model, column) if column else None
+
+
+def load_skill_matrix(db: Session, model, *criteria) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Carrega (ids, valores, máscara de presença) das linhas de model que atendem aos critérios
+
+    Leitura dupla: linhas ainda sem colunas preenchidas (gravadas antes da
+    migração) são completadas a partir do JSON technical_skills
+    """
+    columns = [getattr(model, column) for column in SKILL_COLUMNS.values()]
+    rows = db.query(model.id, *columns).filter(*criteria).order_by(model.id).all()
+
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    values = np.array([row[1:] for row in rows], dtype=float).reshape(len(rows), len(columns))
+    mask = ~np.isnan(values)
+    values[~mask] = 0.0
+
+    legacy = np.flatnonzero(~mask.any(axis=1))
+    if len(legacy):
+        legacy_rows = db.query(model.id, model.technical_skills).filter(
+            model.id.in_(ids[legacy].tolist())
+        ).all()
+        position = {row_id: i for i, row_id in enumerate(ids.tolist())}
+        for row_id, technical_skills in legacy_rows:
+            row = position[row_id]
+            values[row], mask[row] = skills_to_vector(technical_skills or {}, SKILL_COLUMN_INDEX)
+
+    return ids, values, mask
@@ -0,0 +1,162 @@
+"""
+Agregados incrementais da evolução de cada atleta (AthleteSkillSummary)
+Atualizados na mesma transação em que o registro de desempenho é gravado
+"""
+
+import os
+from numbers import Number
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.athlete import Athlete, AthleteSkillSummary, PerformanceRecord
+
+# Quantos registros recentes o agregado guarda (alerta de estagnação usa 3)
+RECENT_RECORDS_WINDOW = int(os.getenv("RECENT_RECORDS_WINDOW", "10"))
+
+
+def _empty_summary(summary: AthleteSkillSummary) -> AthleteSkillSummary:
+    summary.record_count = 0
+    summary.first_record_date = None
+    summary.last_record_date = None
+    summary.first_skills = None
+    summary.latest_skills = None
+    summary.skill_min = {}
+    summary.skill_max = {}
+    summary.skill_mean = {}
+    summary.skill_count = {}
+    summary.skill_changed_at = {}
+    summary.recent_records = []
+    return summary
+
+
+def apply_record(summary: AthleteSkillSummary, record_date, technical_skills: Optional[Dict]) -> None:
+    """
+    Incorpora um registro (mais recente que os anteriores) ao agregado
+    """
+    date = record_date.isoformat() if record_date else None
+    skills = technical_skills or {}
+    previous = summary.latest_skills or {}
+    first = not summary.record_count
+
+    # Dicionários novos a cada atualização: colunas JSON não rastreiam mutações
+    skill_min = dict(summary.skill_min or {})
+    skill_max = dict(summary.skill_max or {})
+    skill_mean = dict(summary.skill_mean or {})
+    skill_count = dict(summary.skill_count or {})
+    skill_changed_at = dict(summary.skill_changed_at or {})
+
+    for skill, value in skills.items():
+        if first or previous.get(skill) != value:
+            skill_changed_at[skill] = date
+        if not isinstance(value, Number) or isinstance(value, bool):
+            continue
+        count = skill_count.get(skill, 0) + 1
+        skill_count[skill] = count
+        skill_min[skill] = min(skill_min.get(skill, value), value)
+        skill_max[skill] = max(skill_max.get(skill, value), value)
+        mean = skill_mean.get(skill, 0.0)
+        skill_mean[skill] = mean + (value - mean) / count
+
+    if first:
+        summary.first_record_date = record_date
+        summary.first_skills = technical_skills
+    summary.last_record_date = record_date
+    summary.latest_skills = technical_skills
+    summary.record_count = (summary.record_count or 0) + 1
+    summary.skill_min = skill_min
+    summary.skill_max = skill_max
+    summary.skill_mean = skill_mean
+    summary.skill_count = skill_count
+    summary.skill_changed_at = skill_changed_at
+    recent = list(summary.recent_records or []) + [{"date": date, "skills": technical_skills}]
+    summary.recent_records = recent[-RECENT_RECORDS_WINDOW:]
+
+
+def new_summary(athlete_id: int, record_date, technical_skills: Optional[Dict]) -> AthleteSkillSummary:
+    """
+    Agregado de um atleta novo a partir do seu primeiro registro (sem consultar o banco)
+    """
+    summary = _empty_summary(AthleteSkillSummary(athlete_id=athlete_id))
+    apply_record(summary, record_date, technical_skills)
+    return summary
+
+
+def _fill_from_history(db: Session, summary: AthleteSkillSummary) -> AthleteSkillSummary:
+    _empty_summary(summary)
+    records = db.query(PerformanceRecord.record_date, PerformanceRecord.technical_skills).filter(
+        PerformanceRecord.athlete_id == summary.athlete_id
+    ).order_by(PerformanceRecord.record_date.asc(), PerformanceRecord.id.asc()).yield_per(1000)
+    for record_date, technical_skills in records:
+        apply_record(summary, record_date, technical_skills)
+    return summary
+
+
+def rebuild_summary(db: Session, athlete_id: int) -> AthleteSkillSummary:
+    """
+    Recalcula (e grava na sessão) o agregado do atleta a partir do histórico
+    """
+    summary = db.get(AthleteSkillSummary, athlete_id)
+    if summary is None:
+        summary = AthleteSkillSummary(athlete_id=athlete_id)
+        db.add(summary)
+    return _fill_from_history(db, summary)
+
+
+def update_summary(db: Session, record: PerformanceRecord) -> AthleteSkillSummary:
+    """
+    Atualiza o agregado com um novo registro; chamar antes do commit do registro
+    """
+    db.flush()  # Garante id e data (server_default) do registro
+    summary = db.query(AthleteSkillSummary).filter(
+        AthleteSkillSummary.athlete_id == record.athlete_id
+    ).with_for_update().first()
+
+    # Sem agregado (atleta anterior à tabela) ou registro fora de ordem: recalcula
+    if summary is None or (
+        summary.last_record_date is not None and record.record_date < summary.last_record_date
+    ):
+        return rebuild_summary(db, record.athlete_id)
+
+    apply_record(summary, record.record_date, record.technical_skills)
+    return summary
+
+
+def update_summary_bulk(db: Session, athlete_id: int, records: List[Tuple]) -> AthleteSkillSummary:
+    """
+    Atualiza o agregado com vários registros (data, habilidades) já gravados
+    """
+    records = sorted(records, key=lambda record: record[0])
+    summary = db.query(AthleteSkillSummary).filter(
+        AthleteSkillSummary.athlete_id == athlete_id
+    ).with_for_update().first()
+
+    if summary is None or (
+        summary.last_record_date is not None and records[0][0] < summary.last_record_date
+    ):
+        return rebuild_summary(db, athlete_id)
+
+    for record_date, technical_skills in records:
+        apply_record(summary, record_date, technical_skills)
+    return summary
+
+
+def load_summary(db: Session, athlete_id: int) -> AthleteSkillSummary:
+    """
+    Agregado do atleta; se ainda não existir, é calculado em memória (sem gravar)
+    """
+    summary = db.get(AthleteSkillSummary, athlete_id)
+    if summary is None:
+        summary = _fill_from_history(db, AthleteSkillSummary(athlete_id=athlete_id))
+    return summary
+
+
+def rebuild_all_summaries(db: Session, batch_size: int = 500) -> int:
+    """
+    Recalcula os agregados de todos os atletas; retorna quantos foram processados
+    """
+    athlete_ids = [athlete_id for (athlete_id,) in db.query(Athlete.id).order_by(Athlete.id)]
+    for position, athlete_id in enumerate(athlete_ids, start=1):
+        rebuild_summary(db, athlete_id)
+        if position % batch_size == 0:
+            db.commit()
+    db.commit()
+    return len(athlete_ids)
@@ -0,0 +1,59 @@
+"""
+Representação vetorial das habilidades técnicas
+Define uma ordem fixa de colunas e converte perfis (dict) em vetores NumPy
+"""
+
+import numpy as np
+from typing import Dict, Iterable, Sequence, Tuple
+from app.schemas.athlete import TechnicalSkills
+
+# Ordem canônica das colunas de habilidades (segue o schema TechnicalSkills)
+SKILL_ORDER: Tuple[str, ...] = tuple(TechnicalSkills.model_fields.keys())
+
+
+def build_skill_order(profiles: Iterable[Dict]) -> Tuple[str, ...]:
+    """
+    Ordem canônica acrescida das habilidades extras encontradas nos perfis
+    """
+    order = list(SKILL_ORDER)
+    known = set(order)
+    for profile in profiles:
+        for skill in profile:
+            if skill not in known:
+                known.add(skill)
+                order.append(skill)
+    return tuple(order)
+
+
+def skills_to_vector(
+    skills: Dict, skill_index: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte um dict de habilidades em (valores, máscara de presença)
+    Habilidades fora do índice são ignoradas
+    """
+    values = np.zeros(len(skill_index))
+    mask = np.zeros(len(skill_index), dtype=bool)
+    for skill, value in skills.items():
+        column = skill_index.get(skill)
+        if column is not None:
+            values[column] = value
+            mask[column] = True
+    return values, mask
+
+
+def skills_to_matrix(
+    profiles: Sequence[Dict], skill_index: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Empilha vários perfis em uma matriz (perfis x habilidades) com máscara de presença
+    """
+    values = np.zeros((len(profiles), len(skill_index)))
+    mask = np.zeros((len(profiles), len(skill_index)), dtype=bool)
+    for row, skills in enumerate(profiles):
+        for skill, value in skills.items():
+            column = skill_index.get(skill)
+            if column is not None:
+                values[row, column] = value
+                mask[row, column] = True
+    return values, mask
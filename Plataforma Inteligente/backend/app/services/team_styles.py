@@ -0,0 +1,67 @@
+"""
+Estilos de jogo compilados em uma matriz (estilos x habilidades)
+A compatibilidade de muitos atletas com todos os estilos sai de um único produto matricial
+"""
+
+import numpy as np
+from typing import Dict, List
+from app.services.skill_vectors import SKILL_ORDER
+
+# Estilos de jogo e suas características
+TEAM_STYLES: Dict[str, Dict] = {
+    "posse_bola": {
+        "required_skills": ["passe", "visao_de_jogo", "disciplina_tatica", "resistencia"],
+        "description": "Time que prioriza posse de bola e construção de jogadas"
+    },
+    "contra_ataque": {
+        "required_skills": ["velocidade", "finalizacao", "drible", "agilidade"],
+        "description": "Time que joga em transições rápidas"
+    },
+    "pressionamento_alto": {
+        "required_skills": ["resistencia", "velocidade", "marcacao", "disciplina_tatica"],
+        "description": "Time que pressiona alto e busca recuperação rápida"
+    },
+    "defensivo": {
+        "required_skills": ["marcacao", "posicionamento", "disciplina_tatica", "interceptacao"],
+        "description": "Time que prioriza organização defensiva"
+    },
+    "ofensivo": {
+        "required_skills": ["finalizacao", "drible", "velocidade", "jogo_aereo"],
+        "description": "Time que prioriza criação de chances e finalização"
+    }
+}
+
+# Valor assumido para habilidades não informadas
+DEFAULT_SKILL_VALUE = 5
+
+
+class StyleMatrix:
+    def __init__(self, team_styles: Dict[str, Dict]):
+        self.styles: List[str] = list(team_styles)
+        self.style_index = {style: i for i, style in enumerate(self.styles)}
+        self.skill_index = {skill: i for i, skill in enumerate(SKILL_ORDER)}
+
+        # Pesos (estilos x habilidades): média das habilidades exigidas, na escala 0-1
+        self.weights = np.zeros((len(self.styles), len(SKILL_ORDER)))
+        for row, style in enumerate(self.styles):
+            required = team_styles[style]["required_skills"]
+            for skill in required:
+                self.weights[row, self.skill_index[skill]] += 1.0 / (10.0 * len(required))
+
+    def score_many(self, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """
+        Compatibilidade (0-1) de cada atleta com cada estilo: atletas x estilos
+        """
+        filled = np.where(mask, values, DEFAULT_SKILL_VALUE)
+        return filled @ self.weights.T
+
+    def score_style(self, style: str, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """
+        Compatibilidade de cada atleta com um único estilo
+        """
+        filled = np.where(mask, values, DEFAULT_SKILL_VALUE)
+        return filled @ self.weights[self.style_index[style]]
+
+
+# Estilos compilados uma única vez por processo
+STYLE_MATRIX = StyleMatrix(TEAM_STYLES)
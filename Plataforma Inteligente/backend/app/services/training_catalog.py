@@ -0,0 +1,132 @@
+"""
+Catálogo imutável de recomendações de treinamento com índice de busca
+Compilado uma única vez; as listas de exercícios são compartilhadas entre respostas
+"""
+
+import json
+import os
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+from app.services.training_database import TRAINING_MAP
+
+# Arquivo JSON opcional que substitui o catálogo embutido (mesmo formato de TRAINING_MAP)
+TRAINING_CATALOG_PATH = os.getenv("TRAINING_CATALOG_PATH")
+
+# Recomendação genérica para áreas sem correspondência no catálogo
+GENERIC_EXERCISES = ("Exercícios técnicos direcionados", "Drills de jogo real")
+GENERIC_DRILLS = ("Aplicação em situações de jogo", "Treino posicional", "Jogos condicionados")
+GENERIC_REFERENCE_PLAYERS = ("Estudar jogadores de referência na posição",)
+
+NGRAM = 3
+
+
+class TrainingEntry(NamedTuple):
+    key: str
+    exercises: Tuple[str, ...]
+    drills: Tuple[str, ...]
+    reference_players: Tuple[str, ...]
+
+
+def _ngrams(text: str) -> FrozenSet[str]:
+    return frozenset(text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1))
+
+
+class TrainingCatalog:
+    """
+    Uma área corresponde à primeira entrada (na ordem do catálogo) cuja chave
+    está contida na área ou contém a área, ignorando maiúsculas/minúsculas
+    """
+
+    def __init__(self, mapping: Mapping[str, Dict]):
+        self.entries: Tuple[TrainingEntry, ...] = tuple(
+            TrainingEntry(
+                key=key,
+                exercises=tuple(value["exercises"]),
+                drills=tuple(value["drills"]),
+                reference_players=tuple(value["reference_players"])
+            )
+            for key, value in mapping.items()
+        )
+        self._keys = tuple(entry.key.lower() for entry in self.entries)
+
+        # Índice de n-gramas: n-grama -> posições das chaves que o contêm
+        self._key_ngrams = [_ngrams(key) for key in self._keys]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for position, grams in enumerate(self._key_ngrams):
+            for gram in grams:
+                self._postings[gram].append(position)
+        # Chaves curtas demais para o índice são sempre verificadas
+        self._short_keys = [i for i, key in enumerate(self._keys) if len(key) < NGRAM]
+
+        # Hash exato: chave normalizada -> resultado da busca completa
+        self._exact = {key: self._scan(key, range(len(self._keys))) for key in self._keys}
+
+    @classmethod
+    def from_file(cls, path: str) -> "TrainingCatalog":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _scan(self, normalized: str, positions) -> Optional[TrainingEntry]:
+        for position in sorted(positions):
+            key = self._keys[position]
+            if key in normalized or normalized in key:
+                return self.entries[position]
+        return None
+
+    def match(self, area: str) -> Optional[TrainingEntry]:
+        """
+        Entrada do catálogo correspondente à área de desenvolvimento (ou None)
+        """
+        normalized = area.lower()
+        if normalized in self._exact:
+            return self._exact[normalized]
+        if len(normalized) < NGRAM:
+            return self._scan(normalized, range(len(self._keys)))
+
+        area_ngrams = _ngrams(normalized)
+        hits: Dict[int, int] = defaultdict(int)
+        for gram in area_ngrams:
+            for position in self._postings.get(gram, ()):
+                hits[position] += 1
+
+        # Candidatas: todos os n-gramas da chave aparecem na área (chave contida
+        # na área) ou todos os n-gramas da área aparecem na chave (área contida
+        # na chave); a verificação final de substring é feita em _scan
+        candidates = set(self._short_keys)
+        for position, count in hits.items():
+            if count == len(self._key_ngrams[position]) or count == len(area_ngrams):
+                candidates.add(position)
+        return self._scan(normalized, candidates)
+
+    def recommendation(self, area: str) -> Dict:
+        """
+        Recomendação para a área; as tuplas do catálogo são compartilhadas, não copiadas
+        """
+        entry = self.match(area)
+        if entry is None:
+            return {
+                "deficiency": area,
+                "exercises": (f"Trabalho específico em {area.lower()}",) + GENERIC_EXERCISES,
+                "drills": GENERIC_DRILLS,
+                "reference_players": GENERIC_REFERENCE_PLAYERS
+            }
+        return {
+            "deficiency": area,
+            "exercises": entry.exercises,
+            "drills": entry.drills,
+            "reference_players": entry.reference_players
+        }
+
+
+def load_training_catalog(path: Optional[str] = None) -> TrainingCatalog:
+    """
+    Carrega o catálogo do arquivo configurado ou, na falta dele, do embutido
+    """
+    path = path or TRAINING_CATALOG_PATH
+    if path:
+        return TrainingCatalog.from_file(path)
+    return TrainingCatalog(TRAINING_MAP)
+
+
+# Catálogo compartilhado por todo o processo
+TRAINING_CATALOG = load_training_catalog()
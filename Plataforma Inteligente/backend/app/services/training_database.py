@@ -0,0 +1,142 @@
+"""
+Catálogo de treinamentos por área de desenvolvimento
+Exercícios, drills e jogadores de referência usados nas recomendações
+"""
+
+TRAINING_MAP = {
+    "Jogo Aéreo": {
+        "exercises": [
+            "Cabeceio com salto em diferentes alturas",
+            "Posicionamento em cruzamentos",
+            "Força de impulsão com exercícios pliométricos",
+            "Trabalho de timing em bolas aéreas"
+        ],
+        "drills": [
+            "2x2 em áreas pré-definidas com foco em jogo aéreo",
+            "Cruzamentos com marcação",
+            "Jogos aéreos 1x1",
+            "Treino de finalização de cabeça"
+        ],
+        "reference_players": ["Cristiano Ronaldo", "Marco van Basten", "Alessandro Nesta"]
+    },
+    "Jogo Com Os Pés": {
+        "exercises": [
+            "Saída de bola curta sob pressão",
+            "Lançamentos longos precisos",
+            "Controle sob pressão",
+            "Passe com ambos os pés"
+        ],
+        "drills": [
+            "Posse de bola com numeração inferior",
+            "Transição rápida defesa-ataque",
+            "Jogo posicional com goleiro",
+            "Construção de jogo desde o gol"
+        ],
+        "reference_players": ["Manuel Neuer", "Ederson", "Alisson"]
+    },
+    "Disciplina Tática": {
+        "exercises": [
+            "Estudos táticos com vídeos",
+            "Posicionamento em simulações de jogo",
+            "Tomada de decisão em situações táticas",
+            "Comunicação e organização"
+        ],
+        "drills": [
+            "Jogo com regras condicionantes",
+            "Transições defensivas organizadas",
+            "Marcação zonal vs individual",
+            "Sistemas de jogo variados"
+        ],
+        "reference_players": ["Philipp Lahm", "Cafu", "Franz Beckenbauer"]
+    },
+    "Finalização": {
+        "exercises": [
+            "Chute em diferentes ângulos",
+            "Finalização sob pressão",
+            "Conclusão em velocidade",
+            "Chute de primeira"
+        ],
+        "drills": [
+            "1x1 com goleiro",
+            "Finalização em segunda jogada",
+            "Finalização após drible",
+            "Finalização em velocidade"
+        ],
+        "reference_players": ["Pelé", "Romário", "Ronaldo Fenômeno"]
+    },
+    "Drible": {
+        "exercises": [
+            "Drible em espaços reduzidos",
+            "Mudanças de direção",
+            "Drible em velocidade",
+            "Proteção de bola"
+        ],
+        "drills": [
+            "1x1 em diferentes áreas",
+            "Drible em circuito",
+            "Drible em situações de jogo",
+            "Drible com finalização"
+        ],
+        "reference_players": ["Lionel Messi", "Diego Maradona", "Andrés Iniesta"]
+    },
+    "Passe": {
+        "exercises": [
+            "Passe curto de precisão",
+            "Passe longo",
+            "Passe em movimento",
+            "Passe de primeira"
+        ],
+        "drills": [
+            "Rondos com diferentes números",
+            "Passe em triangulações",
+            "Transições rápidas",
+            "Construção de jogadas"
+        ],
+        "reference_players": ["Xavi Hernández", "Andrea Pirlo", "Zinedine Zidane"]
+    },
+    "Marcação": {
+        "exercises": [
+            "Marcação individual",
+            "Marcação zonal",
+            "Antecipação",
+            "Combate físico"
+        ],
+        "drills": [
+            "1x1 defensivo",
+            "Marcação em diferentes zonas",
+            "Transições defensivas",
+            "Jogo posicional defensivo"
+        ],
+        "reference_players": ["Franco Baresi", "Lothar Matthäus", "Frank Rijkaard"]
+    },
+    "Velocidade": {
+        "exercises": [
+            "Sprints de diferentes distâncias",
+            "Aceleração",
+            "Velocidade com mudança de direção",
+            "Velocidade com bola"
+        ],
+        "drills": [
+            "Corridas de velocidade",
+            "Transições rápidas",
+            "Contra-ataques",
+            "Jogo em velocidade"
+        ],
+        "reference_players": ["Ronaldo Fenômeno", "Cafu", "Cristiano Ronaldo"]
+    },
+    "Resistência": {
+        "exercises": [
+            "Corrida contínua",
+            "Intervalos de alta intensidade",
+            "Resistência com bola",
+            "Recuperação ativa"
+        ],
+        "drills": [
+            "Jogos de posse prolongada",
+            "Transições contínuas",
+            "Pressionamento alto",
+            "Jogo em espaços amplos"
+        ],
+        "reference_players": ["Cafu", "Xavi Hernández", "Andrés Iniesta"]
+    }
+}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark dos índices de lendas: latência por busca e recall@5 contra a busca exata
+
+Gera um catálogo sintético a partir de LEGEND_DATABASE (perfis com ruído) e
+consulta com atletas aleatórios.
+
+Uso: python benchmark_legend_index.py --legends 50000 --queries 200 --nprobe 4 8 16
+"""
+
+import argparse
+import copy
+import random
+import time
+import numpy as np
+from app.services.classifier import AthleteClassifier, ReferenceData
+from app.services.legend_database import LEGEND_DATABASE, POSITION_TEMPLATES
+from app.services.legend_index import build_legend_index
+from app.services.skill_vectors import SKILL_ORDER
+from app.services.training_catalog import TRAINING_CATALOG
+
+K = 5
+
+
+def synthetic_catalogue(size: int, rng: random.Random):
+    """Lendas sintéticas: cópias de perfis reais com ruído nas habilidades"""
+    catalogue = []
+    for i in range(size):
+        base = LEGEND_DATABASE[i % len(LEGEND_DATABASE)]
+        profile = {
+            skill: min(10, max(1, value + rng.gauss(0, 1.5)))
+            for skill, value in base["technical_profile"].items()
+        }
+        catalogue.append({
+            **base,
+            "name": f"{base['name']} #{i}",
+            "height": base["height"] + rng.gauss(0, 5),
+            "technical_profile": profile
+        })
+    return catalogue
+
+
+def random_athletes(count: int, rng: random.Random):
+    positions = sorted({legend["position"] for legend in LEGEND_DATABASE})
+    return [
+        {
+            "technical_skills": {skill: rng.randint(1, 10) for skill in SKILL_ORDER},
+            "height": rng.uniform(160, 200),
+            "primary_position": rng.choice(positions)
+        }
+        for _ in range(count)
+    ]
+
+
+def run(classifier: AthleteClassifier, athletes):
+    start = time.perf_counter()
+    results = [classifier.find_closest_legends(a, top_k=K) for a in athletes]
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(athletes)
+    return [[r["name"] for r in result] for result in results], elapsed_ms
+
+
+def build(reference: ReferenceData, kind, **options):
+    """
+    Classificador com o índice pedido sobre a matriz já compilada da referência;
+    retorna também o tempo de build do índice
+    """
+    start = time.perf_counter()
+    legend_index = build_legend_index(reference.legend_matrix, kind, **options)
+    build_s = time.perf_counter() - start
+    # Cópia rasa: mesma matriz, lendas e versão; só o índice muda
+    reference = copy.copy(reference)
+    reference.legend_index, reference.legend_index_kind = legend_index, kind
+    return AthleteClassifier(reference=reference), build_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--legends", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    catalogue = synthetic_catalogue(args.legends, rng)
+    athletes = random_athletes(args.queries, rng)
+    print(f"Catálogo: {len(catalogue)} lendas | Consultas: {len(athletes)}")
+
+    # Matriz de lendas compilada uma única vez e compartilhada por todos os índices
+    start = time.perf_counter()
+    reference = ReferenceData(catalogue, POSITION_TEMPLATES, TRAINING_CATALOG)
+    print(f"Compilação da referência: {time.perf_counter() - start:.2f}s\n")
+
+    exact, _ = build(reference, "brute")
+    expected, exact_ms = run(exact, athletes)
+
+    configs = [("brute", {}), ("kdtree", {})]
+    configs += [("ivf", {"n_probe": n_probe}) for n_probe in args.nprobe]
+
+    print(f"{'índice':<18}{'build (s)':>10}{'busca (ms)':>12}{'recall@5':>10}")
+    for kind, options in configs:
+        classifier, build_s = build(reference, kind, **options)
+        if kind == "brute":
+            found, query_ms = expected, exact_ms
+        else:
+            found, query_ms = run(classifier, athletes)
+        recall = np.mean([
+            len(set(got) & set(want)) / max(1, len(want))
+            for got, want in zip(found, expected)
+        ])
+        label = classifier.reference.legend_index.name + "".join(f" {k}={v}" for k, v in options.items())
+        print(f"{label:<18}{build_s:>10.2f}{query_ms:>12.2f}{recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
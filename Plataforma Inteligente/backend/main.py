@@ -1,32 +1,51 @@
+import time
+
+# Início da importação: o tempo até a aplicação ficar pronta é comparado ao orçamento
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.api import athletes, training, match, reports
+from sqlalchemy.exc import SQLAlchemyError
+from app.api import athletes, training, match, reports, jobs, legends
+from app.services.athlete_store import ATHLETE_STORE
+from app.services.classification_cache import CLASSIFICATION_CACHE
+from app.services.classifier import get_classifier, loaded_classifier
+from app.services.jobs import JOB_QUEUE
+from app.services.legend_store import LEGEND_STORE
 import os
 
-# Cria tabelas no banco de dados
-Base.metadata.create_all(bind=engine)
+# Orçamento (s) para importar e iniciar a aplicação em um worker novo
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
 
-# Inicializa banco de dados com dados de referência (apenas se necessário)
-try:
-    from app.models.legend import Legend
-    from app.database import SessionLocal
-    db = SessionLocal()
-    legend_count = db.query(Legend).count()
-    db.close()
-    
-    if legend_count == 0:
-        # Se não há jogadores históricos, inicializa o banco
-        from init_db import init_database
-        init_database()
-except Exception as e:
-    # Se houver erro, continua mesmo assim (banco pode já estar inicializado)
-    print(f"Nota: {e}")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Migrações e dados de referência são aplicados uma vez por `python migrate.py`.
+    # Aqui só se carregam as lendas e se compilam os dados de referência, para que nem
+    # a primeira requisição nem o /health paguem por isso; a matriz de atletas continua
+    # sendo carregada na primeira consulta que a usa
+    try:
+        await run_in_threadpool(get_classifier)
+    except SQLAlchemyError as e:
+        # Banco ainda sem migrações: o classificador é criado no primeiro uso
+        print(f"Aviso: dados de referência não carregados na inicialização ({e.__class__.__name__})")
+    # Importação + carga dos dados de referência
+    app.state.startup_seconds = time.perf_counter() - _import_started
+    if app.state.startup_seconds > STARTUP_BUDGET_SECONDS:
+        print(
+            f"Aviso: inicialização levou {app.state.startup_seconds:.2f}s "
+            f"(orçamento: {STARTUP_BUDGET_SECONDS:.2f}s)"
+        )
+    yield
+    # Aguarda as tarefas em execução e encerra o pool de processos
+    JOB_QUEUE.shutdown()
 
 app = FastAPI(
     title="Plataforma Inteligente de Classificação de Atletas",
     description="Sistema completo para classificação, monitoramento e desenvolvimento de atletas de futebol",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configuração do CORS
@@ -52,6 +71,8 @@ app.include_router(athletes.router)
 app.include_router(training.router)
 app.include_router(match.router)
 app.include_router(reports.router)
+app.include_router(jobs.router)
+app.include_router(legends.router)
 
 @app.get("/")
 def root():
@@ -62,16 +83,32 @@ def root():
             "athletes": "/athletes",
             "training": "/training",
             "match": "/match",
-            "reports": "/reports"
+            "reports": "/reports",
+            "jobs": "/jobs",
+            "legends": "/legends"
         }
     }
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    # Sem acesso ao banco: só reporta o que já está em memória
+    classifier = loaded_classifier()
+    return {
+        "status": "healthy",
+        "startup_seconds": getattr(app.state, "startup_seconds", None),
+        "reference_data": classifier.reference.info() if classifier is not None else None,
+        "legend_store": LEGEND_STORE.stats(),
+        "classification_cache": CLASSIFICATION_CACHE.stats(),
+        "athlete_store": ATHLETE_STORE.stats(),
+        "jobs": JOB_QUEUE.stats()
+    }
 
 if __name__ == "__main__":
     import uvicorn
+    from migrate import run_migrations, seed_reference_data
+    # Execução direta (Docker/Railway): prepara o banco uma única vez, antes de subir o servidor
+    run_migrations()
+    seed_reference_data()
     # Railway fornece a porta via variável de ambiente PORT
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
@@ -0,0 +1,33 @@
+"""
+Aplica as migrações do banco de dados (Alembic) até a versão mais recente
+e insere os dados de referência (jogadores históricos) se ainda não existirem
+
+Execute uma vez por deploy, antes de iniciar os workers da API: python migrate.py
+"""
+import os
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def run_migrations():
+    """Atualiza o esquema do banco; seguro para executar repetidas vezes"""
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    # Mantém a configuração de logging da aplicação quando chamado pela API
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+def seed_reference_data():
+    """Insere os jogadores históricos se a tabela estiver vazia; seguro para executar repetidas vezes"""
+    from init_db import init_database
+    init_database()
+
+
+if __name__ == "__main__":
+    print("Aplicando migrações...")
+    run_migrations()
+    seed_reference_data()
+    print("✅ Banco de dados atualizado!")
@@ -0,0 +1,99 @@
+"""Esquema inicial (tabelas criadas antes do Alembic via create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Bancos existentes já possuem estas tabelas; elas só são criadas quando ausentes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "athletes" not in existing:
+        op.create_table(
+            "athletes",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("age", sa.Integer(), nullable=False),
+            sa.Column("nationality", sa.String()),
+            sa.Column("height", sa.Float()),
+            sa.Column("weight", sa.Float()),
+            sa.Column("body_type", sa.String()),
+            sa.Column("dominant_foot", sa.String()),
+            sa.Column("primary_position", sa.String()),
+            sa.Column("secondary_position", sa.String()),
+            sa.Column("technical_skills", sa.JSON()),
+            sa.Column("deficiencies", sa.JSON()),
+            sa.Column("classification_data", sa.JSON()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_athletes_id", "athletes", ["id"])
+
+    if "performance_records" not in existing:
+        op.create_table(
+            "performance_records",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("athlete_id", sa.Integer(), sa.ForeignKey("athletes.id")),
+            sa.Column("record_date", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("technical_skills", sa.JSON()),
+            sa.Column("physical_metrics", sa.JSON()),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_performance_records_id", "performance_records", ["id"])
+
+    if "training_recommendations" not in existing:
+        op.create_table(
+            "training_recommendations",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("athlete_id", sa.Integer(), sa.ForeignKey("athletes.id")),
+            sa.Column("deficiency", sa.String()),
+            sa.Column("exercises", sa.JSON()),
+            sa.Column("drills", sa.JSON()),
+            sa.Column("reference_players", sa.JSON()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_training_recommendations_id", "training_recommendations", ["id"])
+
+    if "legends" not in existing:
+        op.create_table(
+            "legends",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("nationality", sa.String()),
+            sa.Column("position", sa.String()),
+            sa.Column("height", sa.Float()),
+            sa.Column("weight", sa.Float()),
+            sa.Column("body_type", sa.String()),
+            sa.Column("dominant_foot", sa.String()),
+            sa.Column("technical_profile", sa.JSON()),
+            sa.Column("distinctive_traits", sa.JSON()),
+            sa.Column("playing_style", sa.String()),
+            sa.Column("era", sa.String()),
+            sa.Column("description", sa.String()),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("name"),
+        )
+        op.create_index("ix_legends_id", "legends", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("training_recommendations")
+    op.drop_table("performance_records")
+    op.drop_table("legends")
+    op.drop_table("athletes")
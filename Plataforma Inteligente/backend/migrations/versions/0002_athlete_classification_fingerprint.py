@@ -0,0 +1,30 @@
+"""Impressão digital das entradas da classificação armazenada do atleta
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("athletes")}
+    if "classification_fingerprint" not in columns:
+        with op.batch_alter_table("athletes") as batch_op:
+            batch_op.add_column(sa.Column("classification_fingerprint", sa.String()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("athletes") as batch_op:
+        batch_op.drop_column("classification_fingerprint")
@@ -0,0 +1,78 @@
+"""Colunas numéricas por habilidade técnica em athletes e performance_records
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+Adiciona uma coluna skill_<habilidade> por campo de TechnicalSkills e preenche
+a partir do JSON technical_skills existente. O JSON é mantido (leitura dupla).
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ordem declarada das habilidades (congelada nesta revisão)
+SKILLS = (
+    "velocidade", "resistencia", "forca", "agilidade", "passe", "drible",
+    "finalizacao", "chute", "jogo_aereo", "visao_de_jogo", "posicionamento",
+    "marcacao", "interceptacao", "reflexos", "jogo_com_os_pes", "disciplina_tatica",
+)
+TABLES = ("athletes", "performance_records")
+BATCH_SIZE = 1000
+
+
+def _backfill(bind, table_name: str) -> None:
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("technical_skills", sa.JSON),
+        *[sa.column(f"skill_{skill}", sa.Float) for skill in SKILLS],
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam("row_id"))
+        .values({f"skill_{skill}": sa.bindparam(f"value_{skill}") for skill in SKILLS})
+    )
+    rows = bind.execute(sa.select(table.c.id, table.c.technical_skills)).fetchall()
+    for start in range(0, len(rows), BATCH_SIZE):
+        params = []
+        for row_id, technical_skills in rows[start:start + BATCH_SIZE]:
+            if isinstance(technical_skills, str):
+                technical_skills = json.loads(technical_skills)
+            technical_skills = technical_skills or {}
+            values = {}
+            for skill in SKILLS:
+                value = technical_skills.get(skill)
+                values[f"value_{skill}"] = float(value) if isinstance(value, (int, float)) else None
+            params.append({"row_id": row_id, **values})
+        if params:
+            bind.execute(update, params)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table_name in TABLES:
+        columns = {c["name"] for c in sa.inspect(bind).get_columns(table_name)}
+        missing = [skill for skill in SKILLS if f"skill_{skill}" not in columns]
+        if not missing:
+            continue
+        with op.batch_alter_table(table_name) as batch_op:
+            for skill in missing:
+                batch_op.add_column(sa.Column(f"skill_{skill}", sa.Float()))
+        _backfill(bind, table_name)
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            for skill in SKILLS:
+                batch_op.drop_column(f"skill_{skill}")
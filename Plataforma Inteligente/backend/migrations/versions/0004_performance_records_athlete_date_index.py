@@ -0,0 +1,30 @@
+"""Índice (atleta, data) para consultas de histórico de desempenho
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_performance_records_athlete_date"
+
+
+def upgrade() -> None:
+    indexes = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("performance_records")}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, "performance_records", ["athlete_id", "record_date"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="performance_records")
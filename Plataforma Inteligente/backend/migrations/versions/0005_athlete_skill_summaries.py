@@ -0,0 +1,46 @@
+"""Tabela de agregados de evolução por atleta (athlete_skill_summaries)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+Os dados são preenchidos por `python rebuild_summaries.py`; enquanto um atleta
+não tiver agregado, os relatórios o calculam a partir do histórico.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "athlete_skill_summaries" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "athlete_skill_summaries",
+        sa.Column("athlete_id", sa.Integer(), sa.ForeignKey("athletes.id"), nullable=False),
+        sa.Column("record_count", sa.Integer(), nullable=False),
+        sa.Column("first_record_date", sa.DateTime(timezone=True)),
+        sa.Column("last_record_date", sa.DateTime(timezone=True)),
+        sa.Column("first_skills", sa.JSON()),
+        sa.Column("latest_skills", sa.JSON()),
+        sa.Column("skill_min", sa.JSON()),
+        sa.Column("skill_max", sa.JSON()),
+        sa.Column("skill_mean", sa.JSON()),
+        sa.Column("skill_count", sa.JSON()),
+        sa.Column("skill_changed_at", sa.JSON()),
+        sa.Column("recent_records", sa.JSON()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("athlete_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("athlete_skill_summaries")
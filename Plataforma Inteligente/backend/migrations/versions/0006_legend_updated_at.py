@@ -0,0 +1,40 @@
+"""Carimbo de alteração das lendas (legends.updated_at)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+Usado pela recarga incremental das lendas em memória; linhas existentes
+recebem o horário da migração.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("legends")}
+    if "updated_at" not in columns:
+        with op.batch_alter_table("legends") as batch_op:
+            batch_op.add_column(sa.Column("updated_at", sa.DateTime()))
+
+    # Sem carimbo, lendas existentes não seriam distinguidas de uma linha que perdeu a data
+    legends = sa.table("legends", sa.column("updated_at", sa.DateTime))
+    op.execute(
+        legends.update()
+        .where(legends.c.updated_at.is_(None))
+        .values(updated_at=sa.func.current_timestamp())
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("legends") as batch_op:
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,20 @@
+"""
+Reconstrói os agregados de evolução (AthleteSkillSummary) a partir do histórico de desempenho
+"""
+from app.database import SessionLocal
+from app.services.skill_summary import rebuild_all_summaries
+
+
+def rebuild_summaries():
+    """Recalcula os agregados de todos os atletas"""
+    db = SessionLocal()
+    try:
+        return rebuild_all_summaries(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("Reconstruindo agregados de evolução...")
+    count = rebuild_summaries()
+    print(f"✅ {count} atletas processados!")
@@ -0,0 +1,10 @@
+"""
+Configuração comum dos testes: banco SQLite temporário, nunca o athlete_platform.db
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
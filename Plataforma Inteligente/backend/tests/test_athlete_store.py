@@ -0,0 +1,128 @@
+import time
+import numpy as np
+import pytest
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete
+from app.services.athlete_store import AthleteSkillStore, athlete_entry
+from app.services.complementarity import complementarity_scores
+from app.services.skill_queries import SKILL_COLUMN_INDEX, load_skill_matrix
+from app.services.skill_vectors import SKILL_ORDER
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+def add_athletes(db, skills_list, position="Meia"):
+    athletes = [
+        Athlete(name=f"Atleta {i}", age=20, primary_position=position, technical_skills=skills)
+        for i, skills in enumerate(skills_list)
+    ]
+    db.add_all(athletes)
+    db.commit()
+    return [athlete.id for athlete in athletes]
+
+
+def row_skills(snapshot, athlete_id):
+    row = snapshot.row_of(athlete_id)
+    return {
+        skill: float(snapshot.values[row, column])
+        for skill, column in SKILL_COLUMN_INDEX.items() if snapshot.mask[row, column]
+    }
+
+
+def test_refresh_applies_writes_from_other_processes(db):
+    kept, updated, removed = add_athletes(db, [{"passe": 5}, {"passe": 6}, {"passe": 7}])
+    store = AthleteSkillStore(refresh_seconds=0)
+    store.load(db)
+    version = store.snapshot.version
+    assert not store.refresh(db)
+    assert store.snapshot.version == version
+
+    # Gravações que não passam por este armazenamento (outro worker, fila de tarefas)
+    db.get(Athlete, updated).technical_skills = {"passe": 9, "drible": 4}
+    db.delete(db.get(Athlete, removed))
+    (inserted,) = add_athletes(db, [{"chute": 8}], position="Atacante")
+    assert store.refresh(db)
+
+    snapshot = store.snapshot
+    assert snapshot.version > version
+    assert row_skills(snapshot, kept) == {"passe": 5.0}
+    assert row_skills(snapshot, updated) == {"passe": 9.0, "drible": 4.0}
+    assert snapshot.row_of(removed) is None
+    assert row_skills(snapshot, inserted) == {"chute": 8.0}
+    assert inserted in snapshot.ids[snapshot.candidates(position="Atacante")].tolist()
+
+    # Segunda alteração no mesmo segundo (mesmo updated_at): ainda detectada
+    db.get(Athlete, updated).technical_skills = {"passe": 3}
+    db.commit()
+    assert store.refresh(db)
+    assert row_skills(store.snapshot, updated) == {"passe": 3.0}
+
+
+def test_local_writes_do_not_publish_again_on_refresh(db):
+    (athlete_id,) = add_athletes(db, [{"passe": 5}])
+    store = AthleteSkillStore(refresh_seconds=0)
+    store.load(db)
+    athlete = db.get(Athlete, athlete_id)
+    athlete.technical_skills = {"passe": 8}
+    db.commit()
+    store.upsert(athlete)
+    version = store.snapshot.version
+    store.refresh(db)
+    assert store.snapshot.version == version
+    assert row_skills(store.snapshot, athlete_id) == {"passe": 8.0}
+
+
+def test_read_refreshes_after_interval(db):
+    store = AthleteSkillStore(refresh_seconds=0.05)
+    store.read(db)
+    (athlete_id,) = add_athletes(db, [{"passe": 5}])
+    assert store.read(db).row_of(athlete_id) is None
+    time.sleep(0.06)
+    assert store.read(db).row_of(athlete_id) is not None
+
+
+def test_store_teammate_scores_match_database(db):
+    # Valores com uma casa decimal: diferenças como 3.1 - 1.1 caem exatamente no limite das faixas
+    rng = np.random.default_rng(0)
+    skills_list = [
+        {skill: round(float(value), 1) for skill, value in zip(SKILL_ORDER, rng.uniform(1, 10, len(SKILL_ORDER)))}
+        for _ in range(200)
+    ]
+    skills_list[:2] = [{"passe": 3.1, "drible": 1.1}, {"passe": 1.1, "drible": 3.1}]
+    ids = add_athletes(db, skills_list)
+
+    store = AthleteSkillStore(refresh_seconds=0)
+    store.load(db)
+    snapshot = store.snapshot
+    rows = np.array([snapshot.row_of(athlete_id) for athlete_id in ids])
+    db_ids, db_values, db_mask = load_skill_matrix(db, Athlete, Athlete.id.in_(ids))
+    assert db_ids.tolist() == ids
+
+    for target in range(len(ids)):
+        store_scores, store_valid = complementarity_scores(
+            snapshot.values[rows[target]], snapshot.mask[rows[target]],
+            snapshot.values[rows], snapshot.mask[rows]
+        )
+        db_scores, db_valid = complementarity_scores(db_values[target], db_mask[target], db_values, db_mask)
+        np.testing.assert_array_equal(store_scores, db_scores)
+        np.testing.assert_array_equal(store_valid, db_valid)
+
+    # Diferença de exatamente 2 em ambas as habilidades: faixa ideal (peso máximo)
+    scores, _ = complementarity_scores(
+        snapshot.values[rows[0]], snapshot.mask[rows[0]], snapshot.values[rows[1:2]], snapshot.mask[rows[1:2]]
+    )
+    assert scores[0] == 1.0
+
+
+def test_upsert_entry_matches_loaded_row(db):
+    (athlete_id,) = add_athletes(db, [{"passe": 3.1, "finalizacao": 7.3}])
+    store = AthleteSkillStore(refresh_seconds=0)
+    store.load(db)
+    loaded = row_skills(store.snapshot, athlete_id)
+    store.upsert_many([athlete_entry(db.get(Athlete, athlete_id))])
+    assert row_skills(store.snapshot, athlete_id) == loaded == {"passe": 3.1, "finalizacao": 7.3}
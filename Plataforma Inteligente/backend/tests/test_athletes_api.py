@@ -0,0 +1,67 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete
+from app.services.classifier import loaded_classifier
+from main import app
+
+
+@pytest.fixture
+def client():
+    Base.metadata.create_all(engine)
+    return TestClient(app)
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_bulk_import_streams_ids_in_order(client):
+    payload = [
+        {"name": f"Atleta {i}", "age": 18 + i, "primary_position": "Meia", "technical_skills": {"passe": 5 + i}}
+        for i in range(5)
+    ]
+    payload[2]["technical_skills"]["passe"] = 11  # Inválido: o corpo inteiro é rejeitado
+    assert client.post("/athletes/bulk", json=payload).status_code == 422
+
+    payload[2]["technical_skills"]["passe"] = 7
+    response = client.post("/athletes/bulk?batch_size=2", json=payload)
+    assert response.status_code == 200
+    results = ndjson(response)
+    assert [result["index"] for result in results] == list(range(5))
+
+    with SessionLocal() as db:
+        athletes = {athlete.id: athlete for athlete in db.query(Athlete).filter(
+            Athlete.id.in_([result["id"] for result in results])
+        )}
+        assert [athletes[result["id"]].name for result in results] == [athlete["name"] for athlete in payload]
+        assert all(athlete.classification_data for athlete in athletes.values())
+
+
+def test_export_streams_all_athletes(client):
+    with SessionLocal() as db:
+        db.add_all([Athlete(name=f"Export {i}", age=20, technical_skills={"passe": 5}) for i in range(3)])
+        db.commit()
+        expected = [(athlete.id, athlete.name) for athlete in db.query(Athlete).order_by(Athlete.id)]
+
+    response = client.get("/athletes/export?fields=id,name")
+    assert response.status_code == 200
+    assert [(row["id"], row["name"]) for row in ndjson(response)] == expected
+    assert client.get("/athletes/export?fields=senha").status_code == 400
+
+
+def test_startup_loads_reference_data_and_health_skips_database(monkeypatch):
+    Base.metadata.create_all(engine)
+    with TestClient(app) as started:
+        assert app.state.startup_seconds > 0
+        assert loaded_classifier() is not None
+
+        def no_database(*args, **kwargs):
+            raise AssertionError("/health acessou o banco")
+
+        monkeypatch.setattr("main.get_classifier", no_database)
+        monkeypatch.setattr("app.services.legend_store.SessionLocal", no_database)
+        health = started.get("/health").json()
+        assert health["reference_data"]["legends"] > 0
+        assert health["startup_seconds"] == app.state.startup_seconds
@@ -0,0 +1,102 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete
+from app.services.classification_cache import ClassificationCache
+from app.services.classifier import AthleteClassifier, ReferenceData, get_classifier
+from app.services.legend_database import LEGEND_DATABASE, POSITION_TEMPLATES
+from app.services.training_catalog import TRAINING_CATALOG
+from main import app
+
+ATHLETE = {
+    "name": "Cache",
+    "age": 22,
+    "height": 180,
+    "body_type": "Mesomorfo",
+    "primary_position": "Meia",
+    "technical_skills": {"passe": 9, "visao_de_jogo": 8, "drible": 7, "finalizacao": 5},
+    "deficiencies": [],
+}
+
+
+@pytest.fixture
+def classifier():
+    classifier = AthleteClassifier(
+        reference=ReferenceData(LEGEND_DATABASE, POSITION_TEMPLATES, TRAINING_CATALOG)
+    )
+    classifier.cache = ClassificationCache()
+    return classifier
+
+
+def closest_legend(classification):
+    return classification["similar_legends"][0]["name"]
+
+
+def swap_out_closest(classifier, classification):
+    # Remove a lenda mais próxima: o resultado só pode mudar se o cache for ignorado
+    name = closest_legend(classification)
+    classifier.swap_reference_data(legends=[legend for legend in LEGEND_DATABASE if legend["name"] != name])
+    return name
+
+
+def test_cache_hit_for_identical_inputs(classifier):
+    first = classifier.classify_athlete_cached(dict(ATHLETE), athlete_id=1)
+    # Campos fora da impressão digital (nome, idade) não invalidam o cache
+    again = classifier.classify_athlete_cached({**ATHLETE, "name": "Outro", "age": 30}, athlete_id=1)
+    assert again is first
+    assert classifier.cache.hits == 1
+
+
+def test_reference_swap_invalidates_cache(classifier):
+    cached = classifier.classify_athlete_cached(dict(ATHLETE), athlete_id=1)
+    version = classifier.data_version
+    removed = swap_out_closest(classifier, cached)
+    assert classifier.data_version != version
+
+    result = classifier.classify_athlete_cached(dict(ATHLETE), athlete_id=1)
+    assert result is not cached
+    assert closest_legend(result) != removed
+    assert result == classifier.classify_athlete(dict(ATHLETE))
+
+
+def test_athlete_input_change_invalidates_cache(classifier):
+    cached = classifier.classify_athlete_cached(dict(ATHLETE), athlete_id=1)
+    changed = {**ATHLETE, "technical_skills": {**ATHLETE["technical_skills"], "finalizacao": 10}}
+    result = classifier.classify_athlete_cached(changed, athlete_id=1)
+    assert result is not cached
+    assert result == classifier.classify_athlete(changed)
+
+
+def test_stored_classification_follows_reference_and_inputs(classifier):
+    Base.metadata.create_all(engine)
+    app.dependency_overrides[get_classifier] = lambda: classifier
+    try:
+        client = TestClient(app)
+        athlete_id = client.post("/athletes/", json=ATHLETE).json()["id"]
+        with SessionLocal() as db:
+            stored_fingerprint = db.get(Athlete, athlete_id).classification_fingerprint
+
+        # Entradas e referência iguais: devolve a classificação gravada
+        stored = client.get(f"/athletes/{athlete_id}/classification").json()
+        assert classifier.cache.misses == 0
+
+        # Dados de referência trocados: reclassifica e grava a nova impressão digital
+        removed = swap_out_closest(classifier, stored)
+        reclassified = client.get(f"/athletes/{athlete_id}/classification").json()
+        assert closest_legend(reclassified) != removed
+        with SessionLocal() as db:
+            athlete = db.get(Athlete, athlete_id)
+            assert athlete.classification_fingerprint != stored_fingerprint
+            assert closest_legend(athlete.classification_data) == closest_legend(reclassified)
+            fingerprint = athlete.classification_fingerprint
+
+        # Habilidades alteradas pelo registro de desempenho: reclassifica de novo
+        skills = {**ATHLETE["technical_skills"], "finalizacao": 10, "chute": 10}
+        response = client.post(f"/athletes/{athlete_id}/performance", json={"technical_skills": skills})
+        assert response.status_code == 200
+        updated = client.get(f"/athletes/{athlete_id}/classification").json()
+        with SessionLocal() as db:
+            assert db.get(Athlete, athlete_id).classification_fingerprint != fingerprint
+        assert updated == classifier.classify_athlete({**ATHLETE, "technical_skills": skills})
+    finally:
+        app.dependency_overrides.pop(get_classifier, None)
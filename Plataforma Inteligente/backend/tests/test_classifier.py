@@ -0,0 +1,58 @@
+import random
+import pytest
+from app.schemas.athlete import TechnicalSkills
+from app.services.classifier import AthleteClassifier, ReferenceData
+from app.services.legend_database import LEGEND_DATABASE, POSITION_TEMPLATES
+from app.services.training_catalog import TRAINING_CATALOG
+
+SKILLS = list(TechnicalSkills.model_fields)
+BODY_TYPES = [None, "Ectomorfo", "Mesomorfo", "Endomorfo"]
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    # Dados embutidos: não depende da tabela de lendas
+    return AthleteClassifier(
+        reference=ReferenceData(LEGEND_DATABASE, POSITION_TEMPLATES, TRAINING_CATALOG)
+    )
+
+
+def random_athletes(count: int, seed: int):
+    rng = random.Random(seed)
+    positions = list(POSITION_TEMPLATES) + ["Meia-Atacante", None]
+    return [
+        {
+            "height": rng.choice([None, rng.uniform(160, 200)]),
+            "body_type": rng.choice(BODY_TYPES),
+            "primary_position": rng.choice(positions),
+            "technical_skills": {
+                skill: round(rng.uniform(1, 10), rng.choice([0, 1, 2]))
+                for skill in rng.sample(SKILLS, rng.randint(1, len(SKILLS)))
+            },
+            "deficiencies": []
+        }
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_classify_many_matches_classify_athlete(classifier, seed):
+    athletes = random_athletes(700, seed)
+    assert classifier.classify_many(athletes) == [classifier.classify_athlete(a) for a in athletes]
+
+
+def test_batch_result_does_not_depend_on_chunk_size(classifier):
+    athletes = random_athletes(300, 3)
+    expected = classifier.classify_many(athletes)
+    assert list(classifier.iter_classify_many(athletes, chunk_size=7)) == expected
+    assert list(classifier.iter_classify_many(athletes, chunk_size=1)) == expected
+
+
+def test_legend_scores_match_between_paths(classifier):
+    athletes = random_athletes(200, 4)
+    legend_matrix = classifier.reference.legend_matrix
+    similarity, valid = legend_matrix.score_many(athletes)
+    for row, athlete in enumerate(athletes):
+        single_similarity, _, single_valid = legend_matrix.score(athlete)
+        assert (single_valid == valid[row]).all()
+        assert (single_similarity[single_valid] == similarity[row][valid[row]]).all()
@@ -0,0 +1,62 @@
+import os
+import time
+import pytest
+from app.services.jobs import DONE, FAILED, JobQueue
+
+
+def add(a, b):
+    return a + b
+
+
+def crash():
+    # Simula um worker que morre sem exceção Python (falta de memória, crash em extensão nativa)
+    os._exit(1)
+
+
+def wait(queue, job, timeout=60):
+    deadline = time.monotonic() + timeout
+    while job.status not in (DONE, FAILED):
+        assert time.monotonic() < deadline, f"Tarefa {job.id} não terminou"
+        time.sleep(0.01)
+    return job
+
+
+@pytest.fixture
+def queue_factory():
+    queues = []
+
+    def create(**options):
+        queue = JobQueue(workers=1, persist_path=None, **options)
+        queues.append(queue)
+        return queue
+
+    yield create
+    for queue in queues:
+        queue.shutdown()
+
+
+def test_process_pool_recovers_after_worker_crash(queue_factory):
+    queue = queue_factory(executor="process")
+    crashed = wait(queue, queue.submit(crash))
+    assert crashed.status == FAILED
+    assert "BrokenProcessPool" in crashed.error
+
+    job = wait(queue, queue.submit(add, a=1, b=2))
+    assert (job.status, job.result) == (DONE, 3)
+    assert queue.stats()["running_by_lane"] == {"interactive": 0, "default": 0, "bulk": 0}
+
+
+def test_submit_failure_releases_worker_and_rebuilds_pool(queue_factory):
+    queue = queue_factory(executor="thread")
+    assert wait(queue, queue.submit(add, a=1, b=1)).status == DONE
+    broken = queue._executor
+    broken._broken = "worker encerrado"  # Próximo submit levanta BrokenThreadPool
+
+    failed = wait(queue, queue.submit(add, a=2, b=2))
+    assert failed.status == FAILED
+    assert "BrokenThreadPool" in failed.error
+    assert queue._executor is not broken
+
+    job = wait(queue, queue.submit(add, a=3, b=3))
+    assert (job.status, job.result) == (DONE, 6)
+    assert queue.stats()["running_by_lane"]["default"] == 0
@@ -0,0 +1,27 @@
+import warnings
+import pytest
+from app.services import legend_index
+from app.services.legend_database import LEGEND_DATABASE
+from app.services.legend_index import BruteForceIndex, IVFIndex, build_legend_index
+from app.services.legend_matrix import LegendMatrix
+
+
+@pytest.fixture
+def matrix():
+    return LegendMatrix(LEGEND_DATABASE)
+
+
+def test_kdtree_without_scipy_warns_once(matrix, monkeypatch):
+    monkeypatch.setattr(legend_index, "_kdtree_class", lambda: None)
+    monkeypatch.setattr(legend_index, "_kdtree_fallback_warned", False)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        indexes = [build_legend_index(matrix, "kdtree") for _ in range(3)]
+    assert all(isinstance(index, BruteForceIndex) and index.name == "brute" for index in indexes)
+    assert [warning.category for warning in caught] == [RuntimeWarning]
+
+
+def test_embedded_index_base_is_abstract(matrix):
+    with pytest.raises(TypeError):
+        legend_index._EmbeddedIndex(matrix)
+    assert isinstance(IVFIndex(matrix), legend_index._EmbeddedIndex)
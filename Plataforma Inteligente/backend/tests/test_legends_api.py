@@ -0,0 +1,107 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, SessionLocal, engine
+from app.models import Legend
+from app.services.classifier import get_classifier
+from app.services.legend_store import LEGEND_STORE, LegendStore
+from main import app
+
+
+def legend_payload(name, **changes):
+    return {
+        "name": name,
+        "position": "Meia",
+        "body_type": "Mesomorfo",
+        "technical_profile": {"passe": 9, "visao_de_jogo": 9, "drible": 8},
+        **changes,
+    }
+
+
+@pytest.fixture
+def client():
+    Base.metadata.create_all(engine)
+    yield TestClient(app)
+    # Tabela vazia de novo: os demais testes usam as lendas embutidas
+    with SessionLocal() as db:
+        db.query(Legend).delete()
+        db.commit()
+    LEGEND_STORE.refresh()
+
+
+def test_create_update_delete(client):
+    created = client.post("/legends/", json=legend_payload("Lenda A"))
+    assert created.status_code == 201
+    legend_id = created.json()["id"]
+    assert client.get(f"/legends/{legend_id}").json()["name"] == "Lenda A"
+
+    updated = client.put(f"/legends/{legend_id}", json={"era": "1990s"})
+    assert updated.status_code == 200
+    assert updated.json()["era"] == "1990s"
+    assert updated.json()["technical_profile"] == {"passe": 9, "visao_de_jogo": 9, "drible": 8}
+
+    deleted = client.delete(f"/legends/{legend_id}")
+    assert deleted.status_code == 200
+    assert client.get(f"/legends/{legend_id}").status_code == 404
+    assert client.put(f"/legends/{legend_id}", json={"era": "2000s"}).status_code == 404
+    assert client.delete(f"/legends/{legend_id}").status_code == 404
+
+
+def test_duplicate_names_conflict(client):
+    first = client.post("/legends/", json=legend_payload("Lenda A")).json()
+    assert client.post("/legends/", json=legend_payload("Lenda A")).status_code == 409
+    second = client.post("/legends/", json=legend_payload("Lenda B")).json()
+    assert client.put(f"/legends/{second['id']}", json={"name": "Lenda A"}).status_code == 409
+    # Manter o próprio nome não é conflito
+    assert client.put(f"/legends/{first['id']}", json={"name": "Lenda A"}).status_code == 200
+
+
+@pytest.mark.parametrize("field", ["name", "technical_profile"])
+def test_update_rejects_null_required_fields(client, field):
+    legend_id = client.post("/legends/", json=legend_payload("Lenda A")).json()["id"]
+    response = client.put(f"/legends/{legend_id}", json={field: None})
+    assert response.status_code == 422
+    assert client.get(f"/legends/{legend_id}").json()["name"] == "Lenda A"
+
+
+def test_writes_reload_classifier_legends(client):
+    classifier = get_classifier()  # Registra a recarga em on_legends_changed
+    legend_id = client.post("/legends/", json=legend_payload("Lenda A")).json()["id"]
+    version = LEGEND_STORE.snapshot.version
+    assert LEGEND_STORE.snapshot.source == "database"
+    assert [legend["name"] for legend in classifier.reference.legends] == ["Lenda A"]
+
+    client.put(f"/legends/{legend_id}", json={"name": "Lenda B"})
+    assert LEGEND_STORE.snapshot.version == version + 1
+    assert [legend["name"] for legend in classifier.reference.legends] == ["Lenda B"]
+
+    client.delete(f"/legends/{legend_id}")
+    assert LEGEND_STORE.snapshot.source == "builtin"
+    assert classifier.legends_version == LEGEND_STORE.snapshot.version
+
+
+def test_incremental_refresh_reads_only_changed_rows(client):
+    with SessionLocal() as db:
+        legends = [Legend(**legend_payload(f"Lenda {i}")) for i in range(3)]
+        db.add_all(legends)
+        db.commit()
+        kept, changed, removed = [legend.id for legend in legends]
+
+    store = LegendStore(refresh_seconds=0)
+    before = store.read()
+    assert not store.refresh()
+
+    with SessionLocal() as db:
+        db.get(Legend, changed).era = "1970s"
+        db.delete(db.get(Legend, removed))
+        db.add(Legend(**legend_payload("Lenda nova")))
+        db.commit()
+    assert store.refresh()
+
+    after = store.snapshot
+    assert after.version == before.version + 1
+    legends = dict(zip(after.ids.tolist(), after.legends))
+    assert removed not in legends
+    assert legends[changed]["era"] == "1970s"
+    assert [legend["name"] for legend in after.legends][-1] == "Lenda nova"
+    # Linha sem alteração não é relida: o mesmo dicionário do snapshot anterior
+    assert legends[kept] is dict(zip(before.ids.tolist(), before.legends))[kept]
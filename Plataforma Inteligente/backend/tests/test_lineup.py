@@ -0,0 +1,97 @@
+import itertools
+import numpy as np
+import pytest
+from app.services.lineup import FORBIDDEN_COST, best_lineups, formation_slots, hungarian
+
+linear_sum_assignment = pytest.importorskip("scipy.optimize").linear_sum_assignment
+
+
+def brute_force_min(cost: np.ndarray) -> float:
+    n, m = cost.shape
+    return min(
+        sum(cost[row, column] for row, column in enumerate(columns))
+        for columns in itertools.permutations(range(m), n)
+    )
+
+
+def all_lineups(suitability: np.ndarray, slot_counts):
+    """Todas as escalações distintas (conjuntos de pares atleta-posição), da melhor para a pior"""
+    slot_positions = np.repeat(np.arange(len(slot_counts)), slot_counts)
+    lineups = {
+        tuple(sorted(zip(athletes, slot_positions.tolist())))
+        for athletes in itertools.permutations(range(suitability.shape[0]), len(slot_positions))
+    }
+    return sorted(
+        (sum(suitability[pair] for pair in lineup), lineup) for lineup in lineups
+    )[::-1]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_hungarian_matches_scipy(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 8))
+    m = int(rng.integers(n, 10))
+    cost = rng.random((n, m))
+    assignment = hungarian(cost)
+
+    assert len(set(assignment.tolist())) == n
+    rows, columns = linear_sum_assignment(cost)
+    assert cost[np.arange(n), assignment].sum() == pytest.approx(cost[rows, columns].sum())
+    if m <= 7:
+        assert cost[np.arange(n), assignment].sum() == pytest.approx(brute_force_min(cost))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_hungarian_avoids_forbidden_cells(seed):
+    rng = np.random.default_rng(100 + seed)
+    n, m = 5, 7
+    cost = rng.random((n, m))
+    # Diagonal sempre permitida: há ao menos uma atribuição viável
+    forbidden = rng.random((n, m)) < 0.4
+    forbidden[np.arange(n), np.arange(n)] = False
+    cost[forbidden] = FORBIDDEN_COST
+
+    assignment = hungarian(cost)
+    assert not forbidden[np.arange(n), assignment].any()
+    rows, columns = linear_sum_assignment(np.where(forbidden, np.inf, cost))
+    assert cost[np.arange(n), assignment].sum() == pytest.approx(cost[rows, columns].sum())
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_best_lineups_are_the_k_best_in_order(seed):
+    rng = np.random.default_rng(200 + seed)
+    suitability = rng.random((6, 3))
+    slot_counts = [1, 2, 1]
+    expected = all_lineups(suitability, slot_counts)
+
+    lineups = best_lineups(suitability, slot_counts, count=8)
+    totals = [lineup.total for lineup in lineups]
+    assert totals == sorted(totals, reverse=True)
+    assert totals == pytest.approx([total for total, _ in expected[:8]])
+    assert len({lineup.assignment for lineup in lineups}) == len(lineups)
+    for lineup in lineups:
+        assert lineup.total == pytest.approx(sum(suitability[pair] for pair in lineup.assignment))
+
+
+def test_best_lineups_enumerates_every_distinct_lineup():
+    rng = np.random.default_rng(7)
+    suitability = rng.random((4, 2))
+    slot_counts = [1, 2]
+    expected = all_lineups(suitability, slot_counts)
+
+    lineups = best_lineups(suitability, slot_counts, count=100)
+    assert sorted(lineup.assignment for lineup in lineups) == sorted(lineup for _, lineup in expected)
+    assert [lineup.total for lineup in lineups] == pytest.approx([total for total, _ in expected])
+
+
+def test_best_lineups_without_enough_athletes():
+    assert best_lineups(np.ones((2, 2)), [2, 1]) == []
+
+
+def test_formation_slots_validation():
+    positions = ["Goleiro", "Zagueiro", "Lateral", "Volante", "Meia", "Atacante"]
+    assert sum(formation_slots("4-3-3", positions).values()) == 11
+    assert formation_slots({"Meia": 2, "Atacante": 0}, positions) == {"Meia": 2}
+    for formation in ("9-9-9", {"Ponta": 1}, {"Meia": -1}, {"Meia": 0}):
+        with pytest.raises(ValueError):
+            formation_slots(formation, positions)
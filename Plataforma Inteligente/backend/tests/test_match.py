@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete
+from app.services.athlete_store import ATHLETE_STORE
+from app.services.skill_vectors import SKILL_ORDER
+from app.services.team_styles import TEAM_STYLES
+from main import app
+
+# Posições exclusivas destes testes: outros atletas do banco de testes não entram nas buscas
+POSITIONS = ("Teste Meia", "Teste Atacante")
+
+
+def legacy_style_scores(skills):
+    """Loop por estilo anterior à matriz de estilos"""
+    return {
+        style: round(np.mean([skills.get(skill, 5) / 10.0 for skill in data["required_skills"]]) * 100, 2)
+        for style, data in TEAM_STYLES.items()
+    }
+
+
+def legacy_teammates(athlete, others):
+    """Loop por atleta anterior ao filtro em SQL e ao cálculo vetorizado"""
+    athlete_skills = athlete["technical_skills"]
+    compatibility_list = []
+    for other in others:
+        other_skills = other["technical_skills"]
+        common_skills = set(athlete_skills) & set(other_skills)
+        if not common_skills:
+            continue
+        complementarity = 0
+        for skill in common_skills:
+            diff = abs(athlete_skills[skill] - other_skills[skill])
+            if 2 <= diff <= 4:
+                complementarity += 1
+            elif diff < 2:
+                complementarity += 0.5
+            else:
+                complementarity += 0.2
+        compatibility_list.append({
+            "athlete_id": other["id"],
+            "complementarity_score": round(complementarity / len(common_skills) * 100, 2),
+        })
+    compatibility_list.sort(key=lambda x: x["complementarity_score"], reverse=True)
+    return compatibility_list[:10]
+
+
+@pytest.fixture(scope="module")
+def athletes():
+    Base.metadata.create_all(engine)
+    rng = np.random.default_rng(13)
+    created = []
+    with SessionLocal() as db:
+        for i in range(40):
+            # Subconjuntos de habilidades com uma casa decimal (e alguns inteiros)
+            chosen = rng.choice(SKILL_ORDER, size=int(rng.integers(1, 8)), replace=False)
+            skills = {
+                str(skill): (int(value) if i % 5 == 0 else round(float(value), 1))
+                for skill, value in zip(chosen, rng.uniform(1, 10, len(chosen)))
+            }
+            athlete = Athlete(
+                name=f"Match {i}", age=20, primary_position=POSITIONS[i % 2],
+                secondary_position=POSITIONS[0] if i % 7 == 0 else None, technical_skills=skills
+            )
+            db.add(athlete)
+            db.flush()
+            created.append({
+                "id": athlete.id, "primary_position": athlete.primary_position,
+                "secondary_position": athlete.secondary_position, "technical_skills": skills
+            })
+        db.commit()
+        ATHLETE_STORE.load(db)
+    return created
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+def in_position(athletes, position):
+    return [a for a in athletes if position in (a["primary_position"], a["secondary_position"])]
+
+
+def test_team_styles_match_per_style_loop(client, athletes):
+    for athlete in athletes:
+        result = client.get(f"/match/{athlete['id']}/teams").json()
+        expected = legacy_style_scores(athlete["technical_skills"])
+        assert {style: data["score"] for style, data in result["compatibility"].items()} == expected
+        assert result["recommended_style"] == max(expected, key=expected.get)
+
+
+@pytest.mark.parametrize("position", POSITIONS)
+def test_style_ranking_matches_per_athlete_loop(client, athletes, position):
+    candidates = in_position(athletes, position)
+    for style in TEAM_STYLES:
+        expected = sorted(
+            ((legacy_style_scores(a["technical_skills"])[style], a["id"]) for a in candidates),
+            key=lambda pair: (-pair[0], pair[1])
+        )
+        result = client.get(f"/match/styles/{style}/athletes", params={"position": position, "limit": 100}).json()
+        assert result["total"] == len(candidates)
+        assert [(a["score"], a["athlete_id"]) for a in result["athletes"]] == expected
+
+        page = client.get(
+            f"/match/styles/{style}/athletes", params={"position": position, "skip": 5, "limit": 5}
+        ).json()
+        assert [(a["score"], a["athlete_id"]) for a in page["athletes"]] == expected[5:10]
+
+
+@pytest.mark.parametrize("position", POSITIONS)
+def test_teammates_match_per_athlete_loop(client, athletes, position):
+    for athlete in athletes:
+        others = [a for a in in_position(athletes, position) if a["id"] != athlete["id"]]
+        result = client.get(f"/match/{athlete['id']}/teammates", params={"position": position}).json()
+        got = [
+            {"athlete_id": a["athlete_id"], "complementarity_score": a["complementarity_score"]}
+            for a in result["compatible_teammates"]
+        ]
+        assert got == legacy_teammates(athlete, others)
+        by_id = {a["id"]: a for a in athletes}
+        assert all(a["skills"] == by_id[a["athlete_id"]]["technical_skills"] for a in result["compatible_teammates"])
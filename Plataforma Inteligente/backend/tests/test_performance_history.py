@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete, PerformanceRecord
+from app.services.performance_history import (
+    MONITORING_HISTORY_POINTS, PERIOD_DAYS, bucketed_series, evolution_series, trend_slopes
+)
+from main import app
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+def athlete_with_records(db, records):
+    athlete = Athlete(name="Histórico", age=20, technical_skills={"passe": 5})
+    db.add(athlete)
+    db.flush()
+    db.add_all([
+        PerformanceRecord(athlete_id=athlete.id, record_date=datetime.fromisoformat(when), technical_skills=skills)
+        for when, skills in records
+    ])
+    db.commit()
+    return athlete.id
+
+
+def hourly_records(skills_list):
+    start = datetime(2024, 1, 1)
+    return [((start + timedelta(hours=i)).isoformat(sep=" "), skills) for i, skills in enumerate(skills_list)]
+
+
+def starts(series):
+    return [point["start"] for point in series]
+
+
+def test_athlete_without_records(db):
+    athlete_id = athlete_with_records(db, [])
+    assert bucketed_series(db, athlete_id, "weekly") == []
+    assert trend_slopes([], "weekly") == {}
+    assert evolution_series(db, athlete_id, "weekly", (athlete_id, 0)) == {"series": [], "trends": {}}
+
+
+def test_single_period_has_no_trend(db):
+    athlete_id = athlete_with_records(db, [
+        ("2024-03-04 10:00:00", {"passe": 5}),
+        ("2024-03-06 10:00:00", {"passe": 7}),
+    ])
+    series = bucketed_series(db, athlete_id, "weekly")
+    assert series == [{"start": "2024-03-04", "records": 2, "skills": {"passe": {"mean": 6.0, "min": 5.0, "max": 7.0}}}]
+    # Um único ponto: inclinação indefinida, a habilidade fica fora das tendências
+    assert trend_slopes(series, "weekly") == {}
+
+
+def test_constant_series_is_stable(db):
+    athlete_id = athlete_with_records(db, [
+        ("2024-03-04 10:00:00", {"passe": 6}),
+        ("2024-03-11 10:00:00", {"passe": 6}),
+    ])
+    result = evolution_series(db, athlete_id, "weekly", (athlete_id, 2))
+    assert result["trends"] == {"passe": {"slope": 0.0, "direction": "stable"}}
+
+
+def test_week_boundaries_start_on_monday(db):
+    athlete_id = athlete_with_records(db, [
+        ("2024-01-07 23:59:59", {"passe": 5}),  # Domingo
+        ("2024-01-08 00:00:00", {"passe": 6}),  # Segunda-feira
+        ("2024-01-14 23:00:00", {"passe": 8}),  # Domingo da mesma semana
+    ])
+    series = bucketed_series(db, athlete_id, "weekly")
+    assert starts(series) == ["2024-01-01", "2024-01-08"]
+    assert [point["records"] for point in series] == [1, 2]
+    assert series[1]["skills"]["passe"]["mean"] == 7.0
+
+
+def test_month_and_day_boundaries(db):
+    athlete_id = athlete_with_records(db, [
+        ("2024-01-31 23:59:59", {"passe": 5}),
+        ("2024-02-01 00:00:00", {"passe": 6}),
+        ("2024-02-29 12:00:00", {"passe": 7}),
+    ])
+    assert starts(bucketed_series(db, athlete_id, "monthly")) == ["2024-01-01", "2024-02-01"]
+    assert starts(bucketed_series(db, athlete_id, "daily")) == ["2024-01-31", "2024-02-01", "2024-02-29"]
+
+
+def test_empty_periods_are_skipped_and_slope_uses_elapsed_time(db):
+    # Sem registros na semana de 08/01: não há ponto, mas a distância entre as semanas conta
+    athlete_id = athlete_with_records(db, [
+        ("2024-01-02 09:00:00", {"passe": 5, "drible": 4}),
+        ("2024-01-16 09:00:00", {"passe": 7}),
+        ("2024-01-23 09:00:00", {"passe": 8, "drible": 9}),
+    ])
+    series = bucketed_series(db, athlete_id, "weekly")
+    assert starts(series) == ["2024-01-01", "2024-01-15", "2024-01-22"]
+    slopes = trend_slopes(series, "weekly")
+    # Tendências arredondadas em 3 casas
+    assert slopes["passe"] == round(np.polyfit([0, 2, 3], [5, 7, 8], 1)[0], 3)
+    # Habilidade ausente em um período: ajuste só com os períodos em que aparece
+    assert slopes["drible"] == round(5 / 3, 3)
+
+
+def test_monthly_slope_matches_least_squares(db):
+    records = [
+        ("2024-01-15 12:00:00", {"passe": 4}),
+        ("2024-02-10 12:00:00", {"passe": 5.5}),
+        ("2024-04-20 12:00:00", {"passe": 6}),
+        ("2024-05-01 12:00:00", {"passe": 8}),
+    ]
+    athlete_id = athlete_with_records(db, records)
+    series = bucketed_series(db, athlete_id, "monthly")
+    assert starts(series) == ["2024-01-01", "2024-02-01", "2024-04-01", "2024-05-01"]
+    days = [0, 31, 91, 121]
+    expected = np.polyfit(days, [4, 5.5, 6, 8], 1)[0] * PERIOD_DAYS["monthly"]
+    assert trend_slopes(series, "monthly")["passe"] == pytest.approx(expected, abs=1e-3)
+
+
+def test_performance_endpoint_is_paginated(db):
+    athlete_id = athlete_with_records(db, hourly_records([{"passe": i % 10, "extra": i} for i in range(250)]))
+    client = TestClient(app)
+
+    # Padrão: 100 registros, do mais recente para o mais antigo
+    page = client.get(f"/athletes/{athlete_id}/performance").json()
+    assert len(page) == 100
+    assert [record["technical_skills"]["extra"] for record in page] == list(range(249, 149, -1))
+
+    last = client.get(f"/athletes/{athlete_id}/performance", params={"skip": 200, "limit": 100}).json()
+    assert [record["technical_skills"]["extra"] for record in last] == list(range(49, -1, -1))
+
+
+def test_downsampled_payload_is_bounded(db):
+    values = [float(i % 10) for i in range(250)]
+    athlete_id = athlete_with_records(db, hourly_records([{"passe": v, "extra": i} for i, v in enumerate(values)]))
+    client = TestClient(app)
+
+    points = client.get(f"/athletes/{athlete_id}/performance", params={"max_points": 10}).json()
+    assert len(points) == 10
+    # Blocos de 25 registros consecutivos; só habilidades do schema entram nas médias
+    assert [point["technical_skills"] for point in points] == [
+        {"passe": round(float(np.mean(values[i:i + 25])), 2)} for i in range(0, 250, 25)
+    ]
+    assert points[-1]["date"] == (datetime(2024, 1, 1) + timedelta(hours=249)).isoformat()
+
+    # Histórico menor que max_points: registros brutos, com as chaves fora do schema
+    raw = client.get(f"/athletes/{athlete_id}/performance", params={"max_points": 250}).json()
+    assert len(raw) == 250
+    assert raw[0]["technical_skills"] == {"passe": 0.0, "extra": 0}
+
+    monitoring = client.get(f"/athletes/{athlete_id}/monitoring").json()
+    assert len(monitoring["performance_history"]) <= MONITORING_HISTORY_POINTS
@@ -0,0 +1,67 @@
+import threading
+from datetime import datetime, timedelta
+import pytest
+from app.api.athletes import record_performance
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete
+from app.services.performance_ingest import PerformanceIngestor, validate_row
+
+
+@pytest.fixture
+def athlete_id():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        athlete = Athlete(name="Teste", age=20, technical_skills={"passe": 5, "drible": 6})
+        db.add(athlete)
+        db.commit()
+        return athlete.id
+
+
+def skills(athlete_id):
+    with SessionLocal() as db:
+        athlete = db.get(Athlete, athlete_id)
+        return athlete.technical_skills, athlete.skill_passe, athlete.skill_drible
+
+
+def ingest(rows):
+    ingestor = PerformanceIngestor(batch_size=len(rows))
+    for line, data in enumerate(rows, start=1):
+        ingestor.add(validate_row(line, data))
+    # Como no endpoint: o lote é gravado em outra thread, com a sessão do próprio ingestor
+    thread = threading.Thread(target=ingestor.write_batch)
+    thread.start()
+    thread.join()
+    return ingestor.result()
+
+
+def test_ingest_replaces_skills_like_record_performance(athlete_id):
+    now = datetime.utcnow()
+    result = ingest([
+        {"athlete_id": athlete_id, "record_date": (now - timedelta(days=1)).isoformat(), "technical_skills": {"drible": 9}},
+        {"athlete_id": athlete_id, "record_date": now.isoformat(), "technical_skills": {"passe": 8}},
+    ])
+    assert result["inserted"] == 2
+    ingested = skills(athlete_id)
+    assert ingested == ({"passe": 8}, 8.0, None)
+
+    with SessionLocal() as db:
+        db.get(Athlete, athlete_id).technical_skills = {"passe": 5, "drible": 6}
+        db.commit()
+        record_performance(athlete_id, {"passe": 8}, db=db)
+    assert skills(athlete_id) == ingested
+
+
+def test_ingest_keeps_skills_for_older_records(athlete_id):
+    with SessionLocal() as db:
+        record_performance(athlete_id, {"passe": 7}, db=db)
+    ingest([
+        {"athlete_id": athlete_id, "record_date": "2000-01-01T00:00:00", "technical_skills": {"drible": 9}},
+    ])
+    assert skills(athlete_id) == ({"passe": 7}, 7.0, None)
+
+
+def test_ingest_reports_unknown_athlete():
+    Base.metadata.create_all(engine)
+    result = ingest([{"athlete_id": 10 ** 9, "technical_skills": {"passe": 8}}])
+    assert result["inserted"] == 0
+    assert result["errors"][0]["line"] == 1
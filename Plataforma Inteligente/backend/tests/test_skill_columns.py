@@ -0,0 +1,61 @@
+from datetime import datetime
+import pytest
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete, PerformanceRecord
+from app.models.athlete import SKILL_COLUMNS
+from app.services.performance_ingest import record_values
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+def stored(db, model, row_id):
+    # Lido do banco (nova sessão), não dos atributos em memória
+    db.expire_all()
+    row = db.get(model, row_id)
+    return row.technical_skills, {
+        skill: getattr(row, column) for skill, column in SKILL_COLUMNS.items()
+        if getattr(row, column) is not None
+    }
+
+
+@pytest.mark.parametrize("model", [Athlete, PerformanceRecord])
+def test_columns_follow_json_on_create_and_update(db, model):
+    extra = {"name": "Colunas", "age": 20} if model is Athlete else {}
+    row = model(technical_skills={"passe": 7, "drible": 6.5, "extra": 3}, **extra)
+    db.add(row)
+    db.commit()
+    # Habilidades fora do schema ficam só no JSON
+    assert stored(db, model, row.id) == ({"passe": 7, "drible": 6.5, "extra": 3}, {"passe": 7.0, "drible": 6.5})
+
+    row.technical_skills = {"passe": 8, "chute": 9}
+    db.commit()
+    assert stored(db, model, row.id) == ({"passe": 8, "chute": 9}, {"passe": 8.0, "chute": 9.0})
+
+
+@pytest.mark.parametrize("model", [Athlete, PerformanceRecord])
+def test_missing_skills_stay_none(db, model):
+    extra = {"name": "Sem habilidades", "age": 20} if model is Athlete else {}
+    row = model(technical_skills=None, **extra)
+    db.add(row)
+    db.commit()
+    assert stored(db, model, row.id) == (None, {})
+
+    row.technical_skills = {"passe": 5}
+    db.commit()
+    row.technical_skills = None
+    db.commit()
+    assert stored(db, model, row.id) == (None, {})
+
+
+def test_bulk_insert_values_match_model_columns(db):
+    skills = {"passe": 7, "reflexos": 4.5, "extra": 2}
+    values = record_values(1, datetime(2024, 1, 1), skills, {})
+    record = PerformanceRecord(technical_skills=skills)
+    assert {column: values[column] for column in SKILL_COLUMNS.values()} == {
+        column: getattr(record, column) for column in SKILL_COLUMNS.values()
+    }
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+import pytest
+from app.api.athletes import record_performance
+from app.database import Base, SessionLocal, engine
+from app.models import Athlete, AthleteSkillSummary
+from app.services import skill_summary
+from app.services.performance_ingest import PerformanceIngestor, validate_row
+from rebuild_summaries import rebuild_summaries
+
+SUMMARY_FIELDS = (
+    "record_count", "first_record_date", "last_record_date", "first_skills", "latest_skills",
+    "skill_min", "skill_max", "skill_mean", "skill_count", "skill_changed_at", "recent_records"
+)
+
+
+@pytest.fixture
+def athlete_id(monkeypatch):
+    # Janela pequena: os testes passam do limite de registros recentes
+    monkeypatch.setattr(skill_summary, "RECENT_RECORDS_WINDOW", 3)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        athlete = Athlete(name="Evolução", age=20, technical_skills={"passe": 5})
+        db.add(athlete)
+        db.commit()
+        return athlete.id
+
+
+def summary_values(athlete_id):
+    with SessionLocal() as db:
+        summary = db.get(AthleteSkillSummary, athlete_id)
+        return {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+
+
+def ingest(rows):
+    ingestor = PerformanceIngestor(batch_size=len(rows))
+    for line, data in enumerate(rows, start=1):
+        ingestor.add(validate_row(line, data))
+    ingestor.write_batch()
+    assert ingestor.failed == 0
+
+
+def assert_matches_rebuild(athlete_id):
+    incremental = summary_values(athlete_id)
+    rebuild_summaries()
+    assert summary_values(athlete_id) == incremental
+    return incremental
+
+
+def test_recorded_performances_match_rebuild(athlete_id):
+    for skills in ({"passe": 5, "drible": 6}, {"passe": 7, "drible": 6}, {"passe": 6}, {"passe": 6, "chute": 9}):
+        with SessionLocal() as db:
+            record_performance(athlete_id, skills, db=db)
+
+    summary = assert_matches_rebuild(athlete_id)
+    assert summary["record_count"] == 4
+    assert summary["first_skills"] == {"passe": 5, "drible": 6}
+    assert summary["latest_skills"] == {"passe": 6, "chute": 9}
+    assert summary["skill_min"] == {"passe": 5, "drible": 6, "chute": 9}
+    assert summary["skill_max"] == {"passe": 7, "drible": 6, "chute": 9}
+    assert summary["skill_mean"]["passe"] == pytest.approx(6.0)
+    assert summary["skill_count"] == {"passe": 4, "drible": 2, "chute": 1}
+    assert [record["skills"] for record in summary["recent_records"]] == [
+        {"passe": 7, "drible": 6}, {"passe": 6}, {"passe": 6, "chute": 9}
+    ]
+
+
+def test_ingested_records_match_rebuild(athlete_id):
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        record_performance(athlete_id, {"passe": 5}, db=db)
+    ingest([
+        {"athlete_id": athlete_id, "record_date": (now + timedelta(days=2)).isoformat(), "technical_skills": {"passe": 8}},
+        {"athlete_id": athlete_id, "record_date": (now + timedelta(days=1)).isoformat(), "technical_skills": {"passe": 7, "drible": 4}},
+    ])
+    summary = assert_matches_rebuild(athlete_id)
+    assert summary["record_count"] == 3
+    assert summary["latest_skills"] == {"passe": 8}
+
+    # Registro anterior ao último: o agregado é recalculado pelo histórico completo
+    ingest([
+        {"athlete_id": athlete_id, "record_date": (now - timedelta(days=30)).isoformat(), "technical_skills": {"passe": 2}},
+    ])
+    summary = assert_matches_rebuild(athlete_id)
+    assert summary["record_count"] == 4
+    assert summary["first_skills"] == {"passe": 2}
+    assert summary["latest_skills"] == {"passe": 8}
+    assert summary["skill_min"]["passe"] == 2
+    with SessionLocal() as db:
+        # O atleta continua com as habilidades do registro mais recente
+        assert db.get(Athlete, athlete_id).technical_skills == {"passe": 8}
+
+
+def test_missing_summary_is_rebuilt_on_next_record(athlete_id):
+    with SessionLocal() as db:
+        record_performance(athlete_id, {"passe": 5}, db=db)
+        record_performance(athlete_id, {"passe": 6}, db=db)
+        db.delete(db.get(AthleteSkillSummary, athlete_id))
+        db.commit()
+        # Sem agregado gravado, a leitura calcula a partir do histórico
+        assert skill_summary.load_summary(db, athlete_id).record_count == 2
+        record_performance(athlete_id, {"passe": 7}, db=db)
+    summary = assert_matches_rebuild(athlete_id)
+    assert summary["record_count"] == 3
+    assert summary["skill_changed_at"]["passe"] == summary["recent_records"][-1]["date"]
@@ -42,7 +42,7 @@ Write-Host "✅ Dependências do backend instaladas!" -ForegroundColor Green
 
 # Inicializa banco de dados
 Write-Host "[4/5] Inicializando banco de dados..." -ForegroundColor Yellow
-$dbResult = & python init_db.py 2>&1
+$dbResult = & python migrate.py 2>&1
 if ($LASTEXITCODE -ne 0) {
     Write-Host "❌ ERRO: Falha ao inicializar banco de dados!" -ForegroundColor Red
     Set-Location ..